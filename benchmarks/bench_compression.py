@@ -0,0 +1,112 @@
+"""Bytes and wall time saved by gzip-compressed mail/send request bodies.
+
+Builds representative payloads with sendgrid.helpers.mail.Mail, compresses
+them the way SendGridAPIClient(compress_requests=True) does and estimates the
+end-to-end time saved at a given upload bandwidth:
+
+    python benchmarks/bench_compression.py [--mbps 50] [--json]
+"""
+import argparse
+import base64
+import json
+import random
+import timeit
+
+from sendgrid.helpers.mail import (Attachment, Content, FileContent, FileName,
+                                   FileType, From, Mail, Personalization,
+                                   Substitution, To)
+from sendgrid.transport import gzip_body
+
+WORDS = ['Blue Widget', 'Large Sprocket', 'Gift Card', 'Socks (3-pack)',
+         'Coffee Beans 1kg', 'USB-C Cable', 'Notebook', 'Desk Lamp']
+
+
+def _html(kilobytes):
+    rows = []
+    size = 0
+    i = 0
+    while size < kilobytes * 1024:
+        row = ('<tr><td style="padding:8px;font-family:Arial">Item {0}: '
+               '<a href="https://example.com/p/{1:x}">{2}</a> qty {3}</td>'
+               '</tr>\n').format(i, random.getrandbits(48),
+                                  random.choice(WORDS), random.randint(1, 9))
+        rows.append(row)
+        size += len(row)
+        i += 1
+    return '<html><body><table>' + ''.join(rows) + '</table></body></html>'
+
+
+def _mail(recipients, html_kb, with_attachment=False):
+    mail = Mail(From('sender@example.com', 'Example Sender'), 'Your order -order-')
+    mail.add_content(Content('text/plain', 'Hello -name-, order -order- shipped.'))
+    mail.add_content(Content('text/html', _html(html_kb)))
+    for i in range(recipients):
+        p = Personalization()
+        p.add_to(To('customer{}@example.com'.format(i), 'Customer {}'.format(i)))
+        p.add_substitution(Substitution('-name-', 'Customer {}'.format(i)))
+        p.add_substitution(Substitution('-order-', str(100000 + i)))
+        mail.add_personalization(p)
+    if with_attachment:
+        # already-compressed binary content, as in a real PDF or image
+        raw = bytearray(random.getrandbits(8) for _ in range(30000))
+        attachment = Attachment(
+            FileContent(base64.b64encode(bytes(raw)).decode('ascii')),
+            FileType('application/pdf'),
+            FileName('invoice.pdf'))
+        mail.add_attachment(attachment)
+    return mail
+
+
+SCENARIOS = [
+    ('single recipient, 20KB html', dict(recipients=1, html_kb=20)),
+    ('1000 personalizations, 20KB html', dict(recipients=1000, html_kb=20)),
+    ('1000 personalizations, 500KB html', dict(recipients=1000, html_kb=500)),
+    ('100 personalizations, base64 attachment',
+     dict(recipients=100, html_kb=20, with_attachment=True)),
+]
+
+
+def run(mbps):
+    random.seed(0)
+    results = []
+    bytes_per_second = mbps * 1000 * 1000 / 8.0
+    for name, kwargs in SCENARIOS:
+        body = json.dumps(_mail(**kwargs).get()).encode('utf-8')
+        headers = {}
+        number = 5
+        seconds = timeit.timeit(lambda: gzip_body(body, dict(headers)),
+                                number=number) / number
+        compressed = gzip_body(body, headers)
+        upload_raw = len(body) / bytes_per_second
+        upload_gzip = len(compressed) / bytes_per_second
+        results.append({
+            'scenario': name,
+            'raw_bytes': len(body),
+            'gzip_bytes': len(compressed),
+            'ratio': round(len(compressed) / float(len(body)), 4),
+            'compress_ms': round(seconds * 1000, 3),
+            'upload_ms_raw': round(upload_raw * 1000, 3),
+            'upload_ms_gzip': round(upload_gzip * 1000, 3),
+            'saved_ms': round((upload_raw - upload_gzip - seconds) * 1000, 3),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mbps', type=float, default=50.0,
+                        help='upload bandwidth used to estimate transfer time')
+    parser.add_argument('--json', action='store_true',
+                        help='print one JSON object per scenario')
+    args = parser.parse_args()
+    for result in run(args.mbps):
+        if args.json:
+            print(json.dumps(result, sort_keys=True))
+        else:
+            print('{scenario:45} {raw_bytes:>10} -> {gzip_bytes:>9} bytes '
+                  '({ratio:.1%}), compress {compress_ms:8.2f}ms, '
+                  'saved {saved_ms:9.2f}ms'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Time and module count of importing the library in a fresh interpreter.
+
+Each statement is run in new Python processes (so that nothing is already
+imported or cached in memory) and the median time is reported, with the
+number of modules it loaded:
+
+    import sendgrid                          the package alone
+    from sendgrid import SendGridAPIClient   the API client
+    from sendgrid.helpers.mail import Mail   the mail helpers
+
+The import of the package alone guards the cold start of short-lived
+processes such as serverless functions; --max-ms makes it fail the run:
+
+    python benchmarks/bench_import.py [--repeat 15] [--output results.json]
+        [--max-ms 20]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = (
+    'import sendgrid',
+    'from sendgrid import SendGridAPIClient',
+    'from sendgrid.helpers.mail import Mail',
+)
+
+_PROBE = """
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = set(sys.modules) - before
+print(elapsed, len(loaded), len([m for m in loaded if m.startswith('sendgrid')]))
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(statement, repeat):
+    """Median import time of `statement` over `repeat` fresh processes.
+
+    :rtype: dict
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [_ROOT, env.get('PYTHONPATH')]))
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, '-c', _PROBE.format(statement=statement)],
+            env=env)
+        seconds, modules, sendgrid_modules = output.split()
+        times.append(float(seconds))
+    return {
+        'statement': statement,
+        'repeat': repeat,
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'min_ms': round(min(times) * 1000, 3),
+        'modules': int(modules),
+        'sendgrid_modules': int(sendgrid_modules),
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=15,
+                        help='fresh processes per statement')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--max-ms', type=float,
+                        help='exit with status 1 if `import sendgrid` takes '
+                             'longer than this, in milliseconds')
+    args = parser.parse_args()
+
+    results = [measure(statement, args.repeat) for statement in STATEMENTS]
+    for result in results:
+        print('{statement:40} {median_ms:8.2f}ms median {min_ms:8.2f}ms min '
+              '{modules:>4} modules ({sendgrid_modules} sendgrid)'.format(
+                  **result))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f,
+                      indent=2, sort_keys=True)
+
+    if args.max_ms is not None and results[0]['median_ms'] > args.max_ms:
+        print('REGRESSION import sendgrid: {}ms > {}ms'.format(
+            results[0]['median_ms'], args.max_ms))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
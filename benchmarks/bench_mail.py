@@ -0,0 +1,189 @@
+"""Time and peak memory of building and serializing Mail objects at scale.
+
+For each recipient count, builds a Mail with one Personalization per
+recipient (a To address and two Substitutions each), plain and HTML content
+and an attachment, then measures:
+
+    build          constructing the Mail and its helper objects
+    get            Mail.get()
+    json           json.dumps(Mail.get())
+    to_json_bytes  Mail.to_json_bytes()
+    resend         Mail.to_json_bytes() again, on an unchanged Mail
+
+Results are written as JSON so that they can be tracked across releases, and
+compared with an earlier run to catch regressions:
+
+    python benchmarks/bench_mail.py [--sizes 1,1000,10000,100000]
+        [--output results.json] [--compare baseline.json [--tolerance 0.25]]
+"""
+import argparse
+import base64
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import sendgrid
+from sendgrid.helpers.mail import (Attachment, Content, FileContent, FileName,
+                                   FileType, From, Mail, Personalization,
+                                   Substitution, To)
+from sendgrid.helpers.mail import serializer
+
+DEFAULT_SIZES = (1, 1000, 10000, 100000)
+ATTACHMENT = base64.b64encode(bytes(bytearray(range(256)) * 40)).decode('ascii')
+
+
+def _personalization(i):
+    p = Personalization()
+    p.add_to(To('customer{}@example.com'.format(i), 'Customer {}'.format(i)))
+    p.add_substitution(Substitution('-name-', 'Customer {}'.format(i)))
+    p.add_substitution(Substitution('-order-', str(100000 + i)))
+    return p
+
+
+def build(recipients):
+    mail = Mail(From('sender@example.com', 'Example Sender'), 'Your order -order-')
+    mail.add_content(Content('text/plain', 'Hello -name-, order -order- shipped.'))
+    mail.add_content(Content('text/html',
+                             '<p>Hello -name-, order -order- shipped.</p>'))
+    mail.add_personalizations(_personalization(i) for i in range(recipients))
+    mail.add_attachment(Attachment(FileContent(ATTACHMENT),
+                                   FileType('application/pdf'),
+                                   FileName('invoice.pdf')))
+    return mail
+
+
+STAGES = [
+    ('build', lambda recipients, mail: build(recipients)),
+    ('get', lambda recipients, mail: mail.get()),
+    ('json', lambda recipients, mail: json.dumps(mail.get())),
+    ('to_json_bytes', lambda recipients, mail: _cold(mail).to_json_bytes()),
+    ('resend', lambda recipients, mail: mail.to_json_bytes()),
+]
+
+
+def _cold(mail):
+    # Forget the serialized parts kept from earlier calls.
+    mail._memo.clear()
+    return mail
+
+
+def _repeats(recipients):
+    return max(1, min(20, 20000 // recipients))
+
+
+def _time(stage, recipients, mail, repeats):
+    best = None
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        stage(recipients, mail)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _peak_memory(stage, recipients, mail):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = stage(recipients, mail)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def run(sizes):
+    results = []
+    for recipients in sizes:
+        mail = build(recipients)
+        repeats = _repeats(recipients)
+        for name, stage in STAGES:
+            seconds = _time(stage, recipients, mail, repeats)
+            peak = _peak_memory(stage, recipients, mail)
+            results.append({
+                'stage': name,
+                'recipients': recipients,
+                'repeats': repeats,
+                'seconds': round(seconds, 6),
+                'us_per_recipient': round(seconds * 1e6 / recipients, 3),
+                'peak_bytes': peak,
+                'bytes_per_recipient': round(peak / float(recipients), 1),
+            })
+        del mail
+    return results
+
+
+def environment():
+    return {
+        'sendgrid': getattr(sendgrid, '__version__', None),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'serializer': serializer.BACKEND,
+        'date': datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Results slower or larger than in `baseline` by more than `tolerance`.
+
+    :rtype: list of string
+    """
+    previous = dict(((r['stage'], r['recipients']), r)
+                    for r in baseline['results'])
+    regressions = []
+    for result in results:
+        before = previous.get((result['stage'], result['recipients']))
+        if before is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if before[metric] and (result[metric] >
+                                   before[metric] * (1 + tolerance)):
+                regressions.append(
+                    '{stage} x{recipients}: {metric} {old} -> {new}'.format(
+                        metric=metric, old=before[metric], new=result[metric],
+                        **result))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated recipient counts')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare',
+                        help='JSON file of an earlier run to compare with; '
+                             'exits with status 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown or growth tolerated by '
+                             '--compare')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    report = {'environment': environment(), 'results': run(sizes)}
+    for result in report['results']:
+        print('{stage:14} {recipients:>7} recipients {seconds:10.4f}s '
+              '{us_per_recipient:9.2f}us/recipient {peak_bytes:>12} bytes peak '
+              '({bytes_per_recipient:.0f}/recipient)'.format(**result))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report['results'], json.load(f),
+                                  args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Memory held by a Mail per recipient, and by each kind of helper.
+
+For each recipient count, builds a Mail with one personalization per
+recipient (a To address and three substitutions each), either as
+Personalization objects or as the rows of a RecipientTable, and reports the
+memory still allocated once it is built, per recipient.  Unlike the peak reported
+by bench_mail.py, this is what a queue of prepared messages costs while it
+waits to be sent.
+
+It also reports the size of a single instance of the most common helpers,
+including their attribute storage.  Results can be compared with an earlier
+run, e.g. one made before a change to the helpers:
+
+    python benchmarks/bench_memory.py [--sizes 1000,10000,100000]
+        [--output results.json] [--compare baseline.json [--tolerance 0.1]]
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from sendgrid.helpers.mail import (Content, From, Header, Mail,
+                                   Personalization, RecipientTable,
+                                   Substitution, To)
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _mail():
+    mail = Mail(From('sender@example.com'), 'Your order -order-')
+    mail.add_content(Content('text/plain', 'Hello -name-, order -order-.'))
+    return mail
+
+
+def build(recipients):
+    mail = _mail()
+    personalizations = []
+    for i in range(recipients):
+        p = Personalization()
+        p.add_to(To('customer{}@example.com'.format(i), 'Customer {}'.format(i)))
+        p.add_substitution(Substitution('-name-', 'Customer {}'.format(i)))
+        p.add_substitution(Substitution('-order-', str(100000 + i)))
+        p.add_substitution(Substitution('-city-', 'Denver'))
+        personalizations.append(p)
+    mail.add_personalizations(personalizations)
+    return mail
+
+
+def build_table(recipients):
+    mail = _mail()
+    table = RecipientTable(substitution_keys=['-name-', '-order-', '-city-'])
+    for i in range(recipients):
+        table.append('customer{}@example.com'.format(i), 'Customer {}'.format(i),
+                     ['Customer {}'.format(i), str(100000 + i), 'Denver'])
+    mail.add_recipient_table(table)
+    return mail
+
+
+STORES = [('personalizations', build), ('table', build_table)]
+
+
+def retained_bytes(build, recipients):
+    """Memory allocated by building a Mail and still held by it.
+
+    :rtype: integer
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        mail = build(recipients)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del mail
+    return retained
+
+
+def instance_size(obj):
+    """Size of a helper and of its attribute storage, without the values.
+
+    :rtype: integer
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+HELPERS = [
+    ('To', lambda: To('customer@example.com', 'Customer')),
+    ('Substitution', lambda: Substitution('-name-', 'Customer')),
+    ('Header', lambda: Header('X-Id', '1')),
+    ('Personalization', Personalization),
+    ('Content', lambda: Content('text/plain', 'Hello')),
+]
+
+
+def run(sizes):
+    results = []
+    for recipients in sizes:
+        for store, build in STORES:
+            retained = retained_bytes(build, recipients)
+            results.append({
+                'store': store,
+                'recipients': recipients,
+                'retained_bytes': retained,
+                'bytes_per_recipient': round(retained / float(recipients), 1),
+            })
+    helpers = dict((name, instance_size(factory()))
+                   for name, factory in HELPERS)
+    return {'results': results, 'helpers': helpers}
+
+
+def _key(result):
+    # Runs made before RecipientTable only measured personalizations.
+    return result.get('store', 'personalizations'), result['recipients']
+
+
+def _by_key(report):
+    return dict((_key(r), r) for r in (report or {}).get('results', []))
+
+
+def compare(report, baseline, tolerance):
+    """Measures larger than in `baseline` by more than `tolerance`.
+
+    :rtype: list of string
+    """
+    previous = _by_key(baseline)
+    regressions = []
+    for result in report['results']:
+        before = previous.get(_key(result))
+        if before and result['bytes_per_recipient'] > (
+                before['bytes_per_recipient'] * (1 + tolerance)):
+            regressions.append('{} x{}: {} -> {} bytes per recipient'.format(
+                result['store'], result['recipients'],
+                before['bytes_per_recipient'], result['bytes_per_recipient']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated recipient counts')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare',
+                        help='JSON file of an earlier run to compare with; '
+                             'exits with status 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative growth tolerated by --compare')
+    args = parser.parse_args()
+
+    report = run([int(size) for size in args.sizes.split(',')])
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    previous = _by_key(baseline)
+    for result in report['results']:
+        line = ('{store:16} {recipients:>7} recipients {retained_bytes:>12} '
+                'bytes {bytes_per_recipient:9.1f} bytes/recipient'
+                ).format(**result)
+        before = previous.get(_key(result))
+        if before:
+            line += ' (was {:.1f})'.format(before['bytes_per_recipient'])
+        print(line)
+    for name, size in sorted(report['helpers'].items()):
+        line = '{:16} {:>5} bytes per instance'.format(name, size)
+        before = (baseline or {}).get('helpers', {}).get(name)
+        if before:
+            line += ' (was {})'.format(before)
+        print(line)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Scaling of adding personalizations to a Mail, one per recipient.
+
+For each recipient count, times building the Personalizations and adding
+them with:
+
+    add_personalization   one at a time, each inserted at the front
+    add_personalizations  all at once, appended in order
+    extend_recipients     from the recipient addresses, appended in order
+    from_columns          as a RecipientTable of the address column
+
+and reports the time per recipient.  Appending is linear, so its time per
+recipient should stay flat as the count grows; --max-ratio fails the run when
+the time per recipient at the largest count exceeds that at the smallest by
+more than the given factor:
+
+    python benchmarks/bench_personalizations.py [--sizes 1000,10000,100000]
+        [--max-ratio 2.0] [--output results.json]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+
+from sendgrid.helpers.mail import (From, Mail, Personalization,
+                                   RecipientTable, To)
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _addresses(recipients):
+    return ['customer{}@example.com'.format(i) for i in range(recipients)]
+
+
+def _personalizations(addresses):
+    for address in addresses:
+        personalization = Personalization()
+        personalization.add_to(To(address))
+        yield personalization
+
+
+def add_personalization(mail, addresses):
+    for personalization in _personalizations(addresses):
+        mail.add_personalization(personalization)
+
+
+def add_personalizations(mail, addresses):
+    mail.add_personalizations(_personalizations(addresses))
+
+
+def extend_recipients(mail, addresses):
+    mail.extend_recipients(addresses)
+
+
+def from_columns(mail, addresses):
+    mail.add_recipient_table(RecipientTable.from_columns(addresses))
+
+
+METHODS = [add_personalization, add_personalizations, extend_recipients,
+           from_columns]
+BULK_METHODS = ('add_personalizations', 'extend_recipients', 'from_columns')
+
+
+def _time(method, addresses):
+    best = None
+    for _ in range(max(1, min(5, 100000 // len(addresses)))):
+        mail = Mail(From('sender@example.com'), 'subject')
+        gc.collect()
+        start = time.perf_counter()
+        method(mail, addresses)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes, methods=METHODS):
+    results = []
+    for recipients in sizes:
+        addresses = _addresses(recipients)
+        for method in methods:
+            seconds = _time(method, addresses)
+            results.append({
+                'method': method.__name__,
+                'recipients': recipients,
+                'seconds': round(seconds, 6),
+                'us_per_recipient': round(seconds * 1e6 / recipients, 3),
+            })
+    return results
+
+
+def scaling(results, method):
+    """Time per recipient at the largest count over that at the smallest.
+
+    :rtype: float
+    """
+    timings = sorted((r['recipients'], r['us_per_recipient'])
+                     for r in results if r['method'] == method)
+    return timings[-1][1] / timings[0][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated recipient counts')
+    parser.add_argument('--max-ratio', type=float,
+                        help='exit with status 1 if the time per recipient of '
+                             'the bulk methods grows by more than this factor')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(',')])
+    for result in results:
+        print('{method:21} {recipients:>7} recipients {seconds:10.4f}s '
+              '{us_per_recipient:9.2f}us/recipient'.format(**result))
+    ratios = dict((method.__name__, scaling(results, method.__name__))
+                  for method in METHODS)
+    for method, ratio in sorted(ratios.items()):
+        print('{:21} x{:.2f} time per recipient, smallest to largest'.format(
+            method, ratio))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results, 'scaling': ratios}, f, indent=2,
+                      sort_keys=True)
+
+    if args.max_ratio is not None:
+        regressions = [method for method in BULK_METHODS
+                       if ratios[method] > args.max_ratio]
+        for method in regressions:
+            print('REGRESSION {}: x{:.2f} > x{}'.format(
+                method, ratios[method], args.max_ratio))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
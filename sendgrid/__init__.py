@@ -15,12 +15,51 @@ helpers
     Modules to help with common tasks.
 """
 
+import importlib
 import os
-# v3 API
-from .sendgrid import SendGridAPIClient  # noqa
-from .helpers.mail import Email  # noqa
+import sys
 
+from .version import __version__  # noqa
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
-if os.path.isfile(os.path.join(dir_path, 'VERSION.txt')):
-    __version__ = open(os.path.join(dir_path, 'VERSION.txt')).read().strip()
+
+# Name of each public class -> module defining it, imported on first access
+# (PEP 562) to keep `import sendgrid` fast.
+_MODULES = {
+    'SendGridAPIClient': '.sendgrid',
+    'Email': '.helpers.mail',
+}
+if sys.version_info >= (3, 5):
+    _MODULES['AsyncSendGridAPIClient'] = '.async_sendgrid'
+
+__all__ = sorted(_MODULES)
+
+# Submodules that `import sendgrid` made available before imports were lazy
+# -> module imported on first access to make them available again.
+_SUBMODULES = {
+    'helpers': '.helpers.mail',
+    'sendgrid': '.sendgrid',
+}
+
+
+def _load(name):
+    value = getattr(importlib.import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            importlib.import_module(_SUBMODULES[name], __name__)
+            return globals()[name]
+        if name not in _MODULES:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
+else:
+    for _name in __all__:
+        _load(_name)
@@ -0,0 +1,567 @@
+"""
+This library allows you to quickly and easily use the SendGrid Web API v3 via
+Python.
+
+For more information on this library, see the README on Github.
+    http://github.com/sendgrid/sendgrid-python
+For more information on the SendGrid v3 API, see the v3 docs:
+    http://sendgrid.com/docs/API_Reference/api_v3.html
+For the user guide, code examples, and more, visit the main docs page:
+    http://sendgrid.com/docs/index.html
+
+This file provides the asyncio SendGrid API Client (Python 3.5+).
+"""
+
+import asyncio
+import collections
+import http.client
+import json
+import os
+import ssl
+import time
+from urllib.parse import urlsplit
+
+import python_http_client
+from python_http_client.client import Response
+
+from .bulk import SendResult, SplitResponse
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .transport import (IDEMPOTENT_METHODS, RawResponse, gzip_body,
+                        mail_body, raise_for_status)
+from .version import __version__
+
+
+class _AsyncConnection(object):
+    """A single keep-alive HTTP/1.1 connection driven by asyncio streams."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.reusable = True
+
+    @property
+    def is_closed(self):
+        # StreamWriter.is_closing() is only available from Python 3.7
+        return self.writer.transport.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+
+    async def request(self, method, target, headers, body):
+        lines = ['{} {} HTTP/1.1'.format(method, target)]
+        lines.extend('{}: {}'.format(k, v) for k, v in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if body:
+            self.writer.write(body)
+        await self.writer.drain()
+        return await self._read_response(method)
+
+    async def _read_response(self, method):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by remote host')
+        version, status, reason = (
+            status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        status = int(status)
+
+        headers = http.client.HTTPMessage()
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip()] = value.strip()
+
+        connection = (headers.get('Connection') or '').lower()
+        if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+            self.reusable = False
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in (headers.get('Transfer-Encoding') or '').lower():
+            body = await self._read_chunked()
+        elif headers.get('Content-Length') is not None:
+            body = await self.reader.readexactly(int(headers['Content-Length']))
+        else:
+            body = await self.reader.read()
+            self.reusable = False
+
+        self.last_used = time.monotonic()
+        return RawResponse(status, reason, headers, body)
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                # skip trailers
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+
+class AsyncConnectionPool(object):
+    """A bounded pool of keep-alive connections to a single host.
+
+    At most `max_connections` requests are on the wire at any time; additional
+    requests wait for a connection to be released instead of opening new
+    sockets.
+    """
+
+    def __init__(self, host, max_connections=100, idle_timeout=30.0,
+                 ssl_context=None):
+        """
+        :param host: base URL of the API, e.g. https://api.sendgrid.com
+        :type host: string
+        :param max_connections: maximum number of simultaneous connections
+        :type max_connections: integer
+        :param idle_timeout: seconds after which an unused connection is discarded
+        :type idle_timeout: float
+        :param ssl_context: SSL context used for https hosts
+        :type ssl_context: ssl.SSLContext, optional
+        """
+        parts = urlsplit(host)
+        self.scheme = parts.scheme or 'https'
+        self.hostname = parts.hostname
+        self.port = parts.port or (443 if self.scheme == 'https' else 80)
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        if self.scheme == 'https' and self.ssl_context is None:
+            self.ssl_context = ssl.create_default_context()
+        self._idle = collections.deque()
+        self._semaphore = None
+
+    @property
+    def host_header(self):
+        default_port = 443 if self.scheme == 'https' else 80
+        if self.port == default_port:
+            return self.hostname
+        return '{}:{}'.format(self.hostname, self.port)
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(
+            self.hostname, self.port,
+            ssl=self.ssl_context if self.scheme == 'https' else None)
+        return _AsyncConnection(reader, writer)
+
+    def _get_idle(self):
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.is_closed or now - conn.last_used > self.idle_timeout:
+                conn.close()
+                continue
+            return conn
+        return None
+
+    def _release(self, conn):
+        if conn.reusable and not conn.is_closed:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    async def request(self, method, target, headers, body=None):
+        """Send a request over a pooled connection.
+
+        :return: the raw response
+        :rtype: RawResponse
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        async with self._semaphore:
+            conn = self._get_idle()
+            if conn is not None:
+                try:
+                    response = await conn.request(method, target, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed an idle keep-alive connection before
+                    # we used it.  The request may have been processed
+                    # anyway, so only idempotent ones are resent, once, on a
+                    # fresh socket; the others are left to the retry policy.
+                    conn.close()
+                    if method not in IDEMPOTENT_METHODS:
+                        raise
+                except BaseException:
+                    # Timeouts and cancellation leave the connection
+                    # mid-response.
+                    conn.close()
+                    raise
+                else:
+                    self._release(conn)
+                    return response
+            conn = await self._connect()
+            try:
+                response = await conn.request(method, target, headers, body)
+            except BaseException:
+                conn.close()
+                raise
+            self._release(conn)
+            return response
+
+    async def close(self):
+        """Close every idle connection held by the pool."""
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            # StreamWriter.wait_closed() is only available from Python 3.7
+            wait_closed = getattr(conn.writer, 'wait_closed', None)
+            if wait_closed is None:
+                continue
+            try:
+                await wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class AsyncClient(python_http_client.Client):
+    """A fluent API client whose HTTP verbs are coroutines.
+
+    Works exactly like python_http_client.Client, e.g.
+        response = await client.mail.send.post(request_body=data)
+    """
+
+    def __init__(self, host, pool, request_headers=None, version=None,
+                 url_path=None, append_slash=False, timeout=None,
+                 rate_limiter=None, retry=None, compress_threshold=None):
+        super(AsyncClient, self).__init__(host,
+                                          request_headers=request_headers,
+                                          version=version,
+                                          url_path=url_path,
+                                          append_slash=append_slash,
+                                          timeout=timeout)
+        self.pool = pool
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.compress_threshold = compress_threshold
+
+    def _build_client(self, name=None):
+        url_path = self._url_path + [name] if name else self._url_path
+        return AsyncClient(host=self.host,
+                           pool=self.pool,
+                           version=self._version,
+                           request_headers=self.request_headers,
+                           url_path=url_path,
+                           append_slash=self.append_slash,
+                           timeout=self.timeout,
+                           rate_limiter=self.rate_limiter,
+                           retry=self.retry,
+                           compress_threshold=self.compress_threshold)
+
+    async def _request(self, method, request_body=None, query_params=None,
+                       request_headers=None, timeout=None):
+        if request_headers:
+            self._update_headers(request_headers)
+        headers = dict(self.request_headers)
+        if request_body is None:
+            data = None
+        elif isinstance(request_body, bytes):
+            data = request_body
+        elif 'Content-Type' in headers and headers['Content-Type'] != 'application/json':
+            data = request_body.encode('utf-8')
+        else:
+            data = json.dumps(request_body).encode('utf-8')
+        if data and 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+        if self.compress_threshold is not None:
+            data = gzip_body(data, headers, self.compress_threshold)
+
+        url = urlsplit(self._build_url(query_params))
+        target = url.path + ('?' + url.query if url.query else '')
+        headers['Host'] = self.pool.host_header
+        headers['Content-Length'] = str(len(data) if data else 0)
+        headers.setdefault('Connection', 'keep-alive')
+
+        timeout = timeout or self.timeout
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(target)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            coro = self.pool.request(method, target, headers, data)
+            try:
+                raw = await (asyncio.wait_for(coro, timeout) if timeout else coro)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                delay = self.retry and self.retry.delay_for(attempt)
+                if delay is None:
+                    raise
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(target, raw.headers, raw.status)
+                delay = None
+                if raw.status >= 400 and self.retry is not None:
+                    delay = self.retry.delay_for(attempt, raw.status, raw.headers)
+                if delay is None:
+                    raise_for_status(url.geturl(), raw)
+                    return Response(raw)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def __getattr__(self, name):
+        if name in self.methods:
+            method = name.upper()
+
+            def http_request(*_, **kwargs):
+                """Make the API call
+                :return: coroutine resolving to a python_http_client.client.Response
+                """
+                return self._request(method, **kwargs)
+            return http_request
+        return super(AsyncClient, self).__getattr__(name)
+
+
+class _SendManyIterator(object):
+    """Async iterator over the results of AsyncSendGridAPIClient.send_many().
+
+    At most `concurrency` sends are in flight; a new message is only pulled
+    from the iterable when one of them finishes.
+    """
+
+    def __init__(self, send, messages, concurrency, ordered):
+        self._send = send
+        self._messages = enumerate(messages)
+        self._concurrency = concurrency
+        self._ordered = ordered
+        self._pending = collections.deque() if ordered else set()
+        self._finished = collections.deque()
+        self._exhausted = False
+
+    async def _send_one(self, index, message):
+        try:
+            return SendResult(index, message, response=await self._send(message))
+        except Exception as error:
+            return SendResult(index, message, error=error)
+
+    def _fill(self):
+        while not self._exhausted and len(self._pending) < self._concurrency:
+            try:
+                index, message = next(self._messages)
+            except StopIteration:
+                self._exhausted = True
+                return
+            task = asyncio.ensure_future(self._send_one(index, message))
+            if self._ordered:
+                self._pending.append(task)
+            else:
+                self._pending.add(task)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._finished:
+            return self._finished.popleft()
+        self._fill()
+        if not self._pending:
+            raise StopAsyncIteration
+        if self._ordered:
+            return await self._pending.popleft()
+        done, _ = await asyncio.wait(self._pending,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        self._pending -= done
+        self._finished.extend(task.result() for task in done)
+        return self._finished.popleft()
+
+    async def aclose(self):
+        """Cancel the sends still in flight when iteration stops early."""
+        self._exhausted = True
+        pending, self._pending = list(self._pending), collections.deque()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class AsyncSendGridAPIClient(object):
+    """The asyncio SendGrid API Client.
+
+    Requests are made on non-blocking sockets taken from a bounded pool of
+    keep-alive connections, so a single event loop can have thousands of sends
+    in flight.  For example:
+        async with AsyncSendGridAPIClient(apikey=os.environ.get('SENDGRID_API_KEY')) as sg:
+            mail = Mail(from_email, subject, to_email, content)
+            response = await sg.send(mail)
+            response = await sg.client.suppression.bounces.get()
+
+    Only the options listed below are supported; the response cache,
+    pluggable transports, hooks, metrics and circuit breaker of
+    SendGridAPIClient are not available here.
+    """
+
+    def __init__(
+            self,
+            apikey=None,
+            api_key=None,
+            impersonate_subuser=None,
+            host='https://api.sendgrid.com',
+            max_connections=100,
+            idle_timeout=30.0,
+            timeout=None,
+            ssl_context=None,
+            rate_limiter=None,
+            retry=None,
+            compress_requests=False,
+            compress_threshold=1024):
+        """
+        Construct asyncio SendGrid v3 API object.
+
+        :param apikey: SendGrid API key to use. If not provided, key will be read from
+            environment variable "SENDGRID_API_KEY"
+        :type apikey: basestring
+        :param api_key: SendGrid API key to use. Provides backward compatibility
+        :type api_key: basestring
+        :param impersonate_subuser: the subuser to impersonate. Will be passed by
+            "On-Behalf-Of" header by underlying client.
+        :type impersonate_subuser: basestring
+        :param host: base URL for API calls
+        :type host: basestring
+        :param max_connections: maximum number of simultaneous connections to host
+        :type max_connections: integer
+        :param idle_timeout: seconds after which an idle connection is closed
+        :type idle_timeout: float
+        :param timeout: default per-request timeout in seconds
+        :type timeout: float
+        :param ssl_context: SSL context for https connections
+        :type ssl_context: ssl.SSLContext
+        :param rate_limiter: schedule requests from the X-RateLimit-* response
+            headers; pass True for the default RateLimiter, or a RateLimiter
+            to share a budget. Off by default
+        :type rate_limiter: bool or sendgrid.rate_limit.RateLimiter
+        :param retry: retry policy for 429/5xx responses and connection errors;
+            pass True for the default RetryPolicy
+        :type retry: bool or sendgrid.retry.RetryPolicy
+        :param compress_requests: gzip-encode request bodies of at least
+            `compress_threshold` bytes
+        :type compress_requests: bool
+        :param compress_threshold: smallest body size, in bytes, that is compressed
+        :type compress_threshold: integer
+        """
+        self.apikey = apikey or api_key or os.environ.get('SENDGRID_API_KEY')
+        self.impersonate_subuser = impersonate_subuser
+        self.host = host
+        self.useragent = 'sendgrid/{};python'.format(__version__)
+        self.version = __version__
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        if rate_limiter is True:
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter or None
+        if retry is True:
+            retry = RetryPolicy()
+        self.retry = retry or None
+        self.compress_requests = compress_requests
+        self.compress_threshold = compress_threshold
+
+        self.client = self._build_client()
+
+    def _build_client(self):
+        self.pool = AsyncConnectionPool(self.host,
+                                        max_connections=self.max_connections,
+                                        idle_timeout=self.idle_timeout,
+                                        ssl_context=self.ssl_context)
+        return AsyncClient(host=self.host,
+                           pool=self.pool,
+                           request_headers=self._default_headers,
+                           version=3,
+                           timeout=self.timeout,
+                           rate_limiter=self.rate_limiter,
+                           retry=self.retry,
+                           compress_threshold=(self.compress_threshold
+                                               if self.compress_requests else None))
+
+    @property
+    def _default_headers(self):
+        headers = {
+            "Authorization": 'Bearer {}'.format(self.apikey),
+            "User-agent": self.useragent,
+            "Accept": 'application/json'
+        }
+        if self.impersonate_subuser:
+            headers['On-Behalf-Of'] = self.impersonate_subuser
+
+        return headers
+
+    def reset_request_headers(self):
+        self.client.request_headers = self._default_headers
+
+    @property
+    def api_key(self):
+        """
+        Alias for reading API key
+        .. deprecated:: 5.3
+            Use apikey instead
+        """
+        return self.apikey
+
+    @api_key.setter
+    def api_key(self, value):
+        self.apikey = value
+
+    async def send(self, message, split=False):
+        """Send a Mail object through v3/mail/send.
+
+        With `split`, a Mail exceeding the per-request limits is sent as
+        several concurrent requests, and a SplitResponse aggregating all of
+        them is returned.
+
+        :param message: the message to send
+        :type message: Mail, object with a get() method, or dict
+        :param split: split oversized messages into several requests; only
+            supported for Mail objects
+        :type split: bool
+        :rtype: python_http_client.client.Response or sendgrid.bulk.SplitResponse
+        """
+        if not split:
+            return await self.client.mail.send.post(
+                request_body=mail_body(message))
+
+        async def post(index, body):
+            try:
+                response = await self.client.mail.send.post(request_body=body)
+            except Exception as error:
+                return SendResult(index, body, error=error)
+            return SendResult(index, body, response=response)
+
+        return SplitResponse(await asyncio.gather(
+            *[post(i, body) for i, body in enumerate(message.to_json_chunks())]))
+
+    def send_many(self, messages, concurrency=10, ordered=True):
+        """Send many Mail objects concurrently.
+
+        Messages are pulled from the iterable lazily and results are yielded
+        as a stream while the batch is in progress; a failed send is reported
+        on its result instead of stopping the batch:
+            async for result in sg.send_many(mails, concurrency=20):
+                if not result.ok:
+                    log.warning('message %d failed: %s', result.index, result.error)
+
+        :param messages: messages to send
+        :type messages: iterable of Mail
+        :param concurrency: maximum number of sends in flight
+        :type concurrency: integer
+        :param ordered: yield results in input order instead of completion order
+        :type ordered: bool
+        :rtype: async iterator of sendgrid.bulk.SendResult
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        return _SendManyIterator(self.send, messages, concurrency, ordered)
+
+    async def close(self):
+        """Close all pooled connections."""
+        await self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
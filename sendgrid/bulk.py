@@ -0,0 +1,164 @@
+"""
+Bulk sending for the SendGrid API Client.
+
+Streams messages through a bounded pool of worker threads and reports the
+outcome of each send as it finishes, without stopping on partial failures.
+"""
+
+import collections
+
+
+class SendResult(object):
+    """The outcome of sending one message in a batch."""
+
+    def __init__(self, index, message, response=None, error=None):
+        """
+        :param index: position of the message in the input iterable
+        :type index: integer
+        :param message: the message that was sent
+        :type message: Mail
+        :param response: the API response, if the send succeeded
+        :type response: python_http_client.client.Response
+        :param error: the exception raised by the send, if it failed
+        :type error: Exception
+        """
+        self.index = index
+        self.message = message
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        """Whether the message was accepted by the API.
+
+        :rtype: bool
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<SendResult #{} status={}>'.format(
+                self.index, self.response.status_code)
+        return '<SendResult #{} error={!r}>'.format(self.index, self.error)
+
+
+def _send_one(send, index, message):
+    try:
+        return SendResult(index, message, response=send(message))
+    except Exception as error:
+        return SendResult(index, message, error=error)
+
+
+def send_many(send, messages, concurrency=10, ordered=True):
+    """Send every message with `send`, at most `concurrency` at a time.
+
+    Messages are pulled from the iterable lazily, so arbitrarily large batches
+    (or generators) are processed in constant memory.  A failing send does not
+    stop the batch: its exception is reported on the corresponding result.
+
+    :param send: callable sending a single message, e.g. SendGridAPIClient.send
+    :type send: callable
+    :param messages: messages to send
+    :type messages: iterable of Mail
+    :param concurrency: maximum number of sends in flight
+    :type concurrency: integer
+    :param ordered: yield results in input order; otherwise yield each result
+        as soon as it finishes
+    :type ordered: bool
+    :return: one result per message
+    :rtype: generator of SendResult
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+    # Imported here: concurrent.futures is slow to import and only needed
+    # once messages are actually sent.
+    from concurrent import futures
+    executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+    # Keep the workers busy without queueing the whole iterable up front.
+    window = concurrency * 2
+    pending = collections.deque() if ordered else set()
+    messages = enumerate(messages)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    index, message = next(messages)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(_send_one, send, index, message)
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+            if not pending:
+                return
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = futures.wait(pending,
+                                       return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class SplitResponse(object):
+    """Aggregated outcome of a Mail sent as several API requests."""
+
+    def __init__(self, results):
+        """
+        :param results: one result per request, in order; each result's
+            message is the request body that was sent
+        :type results: list of SendResult
+        """
+        self.results = results
+
+    @property
+    def ok(self):
+        """Whether every request was accepted.
+
+        :rtype: bool
+        """
+        return all(result.ok for result in self.results)
+
+    @property
+    def responses(self):
+        """API responses of the successful requests.
+
+        :rtype: list of python_http_client.client.Response
+        """
+        return [result.response for result in self.results if result.ok]
+
+    @property
+    def errors(self):
+        """Exceptions raised by the failed requests.
+
+        :rtype: list of Exception
+        """
+        return [result.error for result in self.results if not result.ok]
+
+    @property
+    def status_code(self):
+        """The status of the first failed request, or of the last request if
+        all of them succeeded; None when no request was sent.
+
+        :rtype: integer or None
+        """
+        for error in self.errors:
+            return getattr(error, 'status_code', None)
+        if not self.results:
+            return None
+        return self.results[-1].response.status_code
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        return '<SplitResponse requests={} failed={}>'.format(
+            len(self.results), len(self.errors))
@@ -0,0 +1,178 @@
+"""
+Response cache for idempotent GET requests.
+
+Slow-changing resources (templates, categories, ASM groups, verified senders,
+IP pools...) are often read far more often than they change.  ResponseCache
+keeps recent GET responses in a bounded LRU with per-endpoint time-to-live.
+Once an entry expires, it is revalidated with If-None-Match when the API
+returned an ETag for it, so an unchanged resource costs a 304 and no body.
+"""
+
+import collections
+import threading
+import time
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+
+def _path(url):
+    return urlsplit(url).path.rstrip('/')
+
+
+def _header(headers, name):
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CacheEntry(object):
+    """A cached response and the time until which it is fresh."""
+
+    def __init__(self, response, expires, etag=None):
+        """
+        :param response: the cached response
+        :type response: sendgrid.transport.RawResponse
+        :param expires: time (as returned by the cache clock) after which the
+            response must be revalidated
+        :type expires: float
+        :param etag: ETag of the response, if the API returned one
+        :type etag: string
+        """
+        self.response = response
+        self.expires = expires
+        self.etag = etag
+
+
+class ResponseCache(object):
+    """Thread-safe LRU cache of GET responses with per-endpoint TTLs.
+
+    Entries are keyed by URL (query string included) and by the credentials
+    the request was made with, so clients with different API keys or
+    impersonated subusers may share one cache.
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0, ttls=None, clock=time.time):
+        """
+        :param max_entries: number of responses kept; the least recently used
+            one is evicted first
+        :type max_entries: integer
+        :param ttl: seconds a response stays fresh, for endpoints not listed
+            in `ttls`
+        :type ttl: float
+        :param ttls: seconds a response stays fresh per endpoint path prefix,
+            e.g. {'/v3/templates': 300, '/v3/suppression': 0}; the longest
+            matching prefix wins and a TTL of 0 disables caching
+        :type ttls: dictionary
+        :param clock: returns the current time
+        :type clock: callable
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.ttls = dict((prefix.rstrip('/'), value)
+                         for prefix, value in (ttls or {}).items())
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, url):
+        """Time-to-live of responses for `url`.
+
+        :rtype: float
+        """
+        path = _path(url)
+        best = None
+        for prefix in self.ttls:
+            if (path == prefix or path.startswith(prefix + '/')) and (
+                    best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttl if best is None else self.ttls[best]
+
+    @staticmethod
+    def key(url, headers):
+        """The cache key of a request.
+
+        :rtype: tuple
+        """
+        return (url,
+                _header(headers, 'Authorization'),
+                _header(headers, 'On-Behalf-Of'))
+
+    def lookup(self, key):
+        """The entry stored under `key`, fresh or not, marking it as recently
+        used.
+
+        :rtype: CacheEntry or None
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def is_fresh(self, entry):
+        return self.clock() < entry.expires
+
+    def record_hit(self):
+        """Count a request answered from the cache."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a request the API had to answer in full."""
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key, response):
+        """Cache a successful response to the request identified by `key`.
+
+        Nothing is stored for endpoints whose TTL is 0, unless the response
+        carries an ETag allowing it to be revalidated cheaply.
+        """
+        ttl = self.ttl_for(key[0])
+        etag = _header(response.headers, 'ETag')
+        if ttl <= 0 and etag is None:
+            return
+        entry = CacheEntry(response, self.clock() + ttl, etag)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, entry, key):
+        """Mark a revalidated entry as fresh again."""
+        expires = self.clock() + self.ttl_for(key[0])
+        with self._lock:
+            entry.expires = expires
+            self.revalidations += 1
+
+    def invalidate(self, url=None):
+        """Drop cached responses.
+
+        :param url: URL or path of a resource; the responses for it, for its
+            sub-resources and for the collections containing it are dropped.
+            All responses are dropped when not given
+        :type url: string
+        """
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                return
+            path = _path(url)
+            for key in list(self._entries):
+                cached = _path(key[0])
+                if (cached == path or cached.startswith(path + '/') or
+                        path.startswith(cached + '/')):
+                    del self._entries[key]
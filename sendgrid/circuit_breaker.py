@@ -0,0 +1,204 @@
+"""
+Circuit breaker for the v3 API.
+
+While the API is degraded, every request waits for its full timeout or for
+an error, tying up the calling threads.  CircuitBreaker counts consecutive
+failures (connection errors, timeouts and 5xx responses) per endpoint and,
+past a threshold, opens the circuit: requests then fail immediately with
+CircuitOpenError.  After `recovery_timeout`, a few probe requests are let
+through (half-open); the circuit closes again if they succeed and reopens if
+they fail.
+"""
+
+import threading
+import time
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+from .metrics import endpoint_label
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while its circuit is open."""
+
+    def __init__(self, scope, retry_at):
+        """
+        :param scope: endpoint (or '*' for the whole API) whose circuit is open
+        :type scope: string
+        :param retry_at: time at which probe requests will be let through
+        :type retry_at: float
+        """
+        super(CircuitOpenError, self).__init__(
+            'Circuit open for {}'.format(scope))
+        self.scope = scope
+        self.retry_at = retry_at
+
+
+class CircuitStateChange(object):
+    """A circuit going from one state to another, as seen by the hooks."""
+
+    def __init__(self, scope, previous, state, failures):
+        self.scope = scope
+        self.previous = previous
+        self.state = state
+        self.failures = failures
+
+    def __repr__(self):
+        return '<CircuitStateChange {} {} -> {}>'.format(
+            self.scope, self.previous, self.state)
+
+
+class _Circuit(object):
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker(object):
+    """Thread-safe circuit breaker, scoped per endpoint or for the whole API."""
+
+    def __init__(self,
+                 failure_threshold=5,
+                 recovery_timeout=30.0,
+                 half_open_max_calls=1,
+                 failure_statuses=(500, 502, 503, 504),
+                 per_endpoint=True,
+                 clock=time.time):
+        """
+        :param failure_threshold: consecutive failures that open the circuit
+        :type failure_threshold: integer
+        :param recovery_timeout: seconds the circuit stays open before probe
+            requests are let through
+        :type recovery_timeout: float
+        :param half_open_max_calls: probe requests allowed at a time while
+            half-open
+        :type half_open_max_calls: integer
+        :param failure_statuses: response statuses counted as failures;
+            connection errors and timeouts always are
+        :type failure_statuses: iterable of integers
+        :param per_endpoint: keep a circuit per endpoint (with identifiers
+            folded, see sendgrid.metrics.endpoint_label) rather than one for
+            the whole API
+        :type per_endpoint: bool
+        :param clock: returns the current time
+        :type clock: callable
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses = frozenset(failure_statuses)
+        self.per_endpoint = per_endpoint
+        self.clock = clock
+        # Called with a CircuitStateChange on every transition.
+        self.listeners = []
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def scope(self, url):
+        """The circuit a request URL belongs to.
+
+        :rtype: string
+        """
+        if not self.per_endpoint:
+            return '*'
+        return endpoint_label(urlsplit(url).path)
+
+    def state(self, url):
+        """State of the circuit of `url`: 'closed', 'open' or 'half-open'.
+
+        :rtype: string
+        """
+        circuit = self._circuits.get(self.scope(url))
+        return circuit.state if circuit is not None else CLOSED
+
+    def _transition(self, scope, circuit, state, changes):
+        changes.append(CircuitStateChange(scope, circuit.state, state,
+                                          circuit.failures))
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = self.clock()
+            circuit.probes = 0
+        elif state == CLOSED:
+            circuit.failures = 0
+            circuit.probes = 0
+
+    def _notify(self, changes):
+        for change in changes:
+            for listener in self.listeners:
+                listener(change)
+
+    def before(self, url):
+        """Check that a request to `url` may be sent.
+
+        :raises CircuitOpenError: if its circuit is open
+        """
+        scope = self.scope(url)
+        changes = []
+        with self._lock:
+            circuit = self._circuits.get(scope)
+            if circuit is None or circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN:
+                retry_at = circuit.opened_at + self.recovery_timeout
+                if self.clock() < retry_at:
+                    raise CircuitOpenError(scope, retry_at)
+                self._transition(scope, circuit, HALF_OPEN, changes)
+            if circuit.probes >= self.half_open_max_calls:
+                raise CircuitOpenError(scope, self.clock())
+            circuit.probes += 1
+        self._notify(changes)
+
+    def is_failure(self, status):
+        """Whether a request that got `status` (None for no response) counts
+        as a failure.
+
+        :rtype: bool
+        """
+        return status is None or status in self.failure_statuses
+
+    def record(self, url, status):
+        """Record the outcome of a request let through by before().
+
+        :param status: response status, or None if no response was received
+        :type status: integer
+        """
+        scope = self.scope(url)
+        failed = self.is_failure(status)
+        changes = []
+        with self._lock:
+            circuit = self._circuits.get(scope)
+            if circuit is None:
+                if not failed:
+                    return
+                circuit = self._circuits[scope] = _Circuit()
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if failed:
+                    circuit.failures += 1
+                    self._transition(scope, circuit, OPEN, changes)
+                else:
+                    self._transition(scope, circuit, CLOSED, changes)
+            elif failed:
+                circuit.failures += 1
+                if (circuit.state == CLOSED and
+                        circuit.failures >= self.failure_threshold):
+                    self._transition(scope, circuit, OPEN, changes)
+            else:
+                circuit.failures = 0
+        self._notify(changes)
+
+    def reset(self):
+        """Close every circuit."""
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,248 @@
+"""
+Offline transport for the SendGrid API Client.
+
+DryRunTransport stands in for the connection pool: requests are validated
+locally, recorded in memory or to an NDJSON file, and answered with synthetic
+responses without touching the network.  It lets a mail pipeline be exercised
+and load-tested end to end, including serialization and the client's
+scheduling, at the speed of the local machine:
+    sg = SendGridAPIClient(apikey='SG.test', transport='dryrun')
+    sg.send(mail)
+    sg.pool.records[-1]['body']['personalizations']
+"""
+
+import email.message
+import gzip
+import io
+import itertools
+import json
+import threading
+import uuid
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+from .helpers.mail.exceptions import ApiKeyIncludedException
+from .helpers.mail.validators import ValidateApiKey
+from .transport import RawResponse
+
+
+MAX_PERSONALIZATIONS = 1000
+MAX_RECIPIENTS = 1000
+
+
+def _error(message, field=None):
+    return {'message': message, 'field': field, 'help': None}
+
+
+def validate_mail_payload(payload):
+    """Check a v3/mail/send request body for the errors the API would reject
+    it with.
+
+    This covers the structural rules (required fields, recipient limits,
+    content) rather than every constraint enforced by the API.
+
+    :param payload: the decoded request body
+    :type payload: dict
+    :return: errors in the format of the API, empty if the payload is valid
+    :rtype: list of dict
+    """
+    if not isinstance(payload, dict):
+        return [_error('The request body must be a JSON object.')]
+    errors = []
+    sender = payload.get('from')
+    if not isinstance(sender, dict) or not sender.get('email'):
+        errors.append(_error('The from email is required.', 'from.email'))
+
+    personalizations = payload.get('personalizations')
+    if personalizations is not None and not isinstance(personalizations, list):
+        errors.append(_error('The personalizations field must be an array.',
+                             'personalizations'))
+        personalizations = []
+    elif not personalizations:
+        errors.append(_error('The personalizations field is required and '
+                             'must have at least one personalization.',
+                             'personalizations'))
+        personalizations = []
+    elif len(personalizations) > MAX_PERSONALIZATIONS:
+        errors.append(_error('The personalizations field cannot have more '
+                             'than {} objects.'.format(MAX_PERSONALIZATIONS),
+                             'personalizations'))
+
+    has_template = bool(payload.get('template_id'))
+    recipients = 0
+    for index, personalization in enumerate(personalizations):
+        field = 'personalizations.{}'.format(index)
+        if not isinstance(personalization, dict):
+            errors.append(_error('Each personalization must be an object.',
+                                 field))
+            continue
+        if not personalization.get('to'):
+            errors.append(_error('The to array is required for all '
+                                 'personalization objects, and must have at '
+                                 'least one email object with a valid email '
+                                 'address.', field + '.to'))
+        for kind in ('to', 'cc', 'bcc'):
+            addresses = personalization.get(kind) or []
+            if not isinstance(addresses, list):
+                errors.append(_error('The {} field must be an array.'.format(
+                    kind), field + '.' + kind))
+                continue
+            for address in addresses:
+                recipients += 1
+                if not (isinstance(address, dict) and address.get('email')):
+                    errors.append(_error('Each email address must have an '
+                                         'email.', field + '.' + kind))
+        if not (has_template or payload.get('subject') or
+                personalization.get('subject')):
+            errors.append(_error('The subject is required. You can get '
+                                 'around this requirement if you use a '
+                                 'template with a subject defined or if '
+                                 'every personalization has a subject '
+                                 'defined.', 'subject'))
+    if recipients > MAX_RECIPIENTS:
+        errors.append(_error('The total number of recipients must be less '
+                             'than {}.'.format(MAX_RECIPIENTS + 1),
+                             'personalizations'))
+
+    contents = payload.get('content') or []
+    if not isinstance(contents, list):
+        errors.append(_error('The content field must be an array.',
+                             'content'))
+        contents = []
+    elif not (has_template or contents):
+        errors.append(_error('Unless a valid template_id is provided, the '
+                             'content parameter is required.', 'content'))
+    for index, content in enumerate(contents):
+        if not (isinstance(content, dict) and content.get('type') and
+                content.get('value') not in (None, '')):
+            errors.append(_error('Content must have a type and a non-empty '
+                                 'value.', 'content.{}'.format(index)))
+    try:
+        # Only the well-formed entries can be searched for a key.
+        ValidateApiKey().validate_message_dict(dict(
+            payload, content=[content for content in contents
+                              if isinstance(content, dict)]))
+    except ApiKeyIncludedException:
+        errors.append(_error('The content contains a SendGrid API key.',
+                             'content'))
+    return errors
+
+
+def decode_body(body, headers):
+    """Decode a JSON request body, gunzipping it if it is gzip-encoded.
+
+    :rtype: JSON-compatible object or None
+    """
+    if not body:
+        return None
+    encoding = dict((name.lower(), value)
+                    for name, value in (headers or {}).items()
+                    ).get('content-encoding')
+    if encoding == 'gzip':
+        body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+    return json.loads(body.decode('utf-8'))
+
+
+def _response(status, body=b'', headers=None):
+    message = email.message.Message()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    if body:
+        message['Content-Type'] = 'application/json'
+    message['Content-Length'] = str(len(body))
+    reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request'}.get(status, '')
+    return RawResponse(status, reason, message, body)
+
+
+class DryRunTransport(object):
+    """Transport answering every request locally with a synthetic response.
+
+    mail/send bodies are validated with validate_mail_payload() and answered
+    with 202 Accepted and an X-Message-Id header, or with 400 Bad Request and
+    the validation errors.  Other requests are answered with 200 and an empty
+    JSON object for GET, and 202 otherwise.
+    """
+
+    def __init__(self, record=True, validate=True):
+        """
+        :param record: keep every request in `records` (True), write it as a
+            line of JSON to a file (a path or a file object), or don't record
+            requests at all (False)
+        :type record: bool, string or file-like object
+        :param validate: validate mail/send bodies
+        :type validate: bool
+        """
+        self.validate = validate
+        self.records = [] if record is True else None
+        self._file = None
+        self._owns_file = False
+        if record and record is not True:
+            if hasattr(record, 'write'):
+                self._file = record
+            else:
+                self._file = io.open(record, 'a', encoding='utf-8')
+                self._owns_file = True
+        # number of requests answered
+        self.count = 0
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _record(self, method, url, headers, payload, status):
+        if self.records is None and self._file is None:
+            return
+        record = {'method': method,
+                  'url': url,
+                  'headers': dict((name, value)
+                                  for name, value in (headers or {}).items()
+                                  if name.lower() != 'authorization'),
+                  'body': payload,
+                  'status': status}
+        with self._lock:
+            if self.records is not None:
+                self.records.append(record)
+            if self._file is not None:
+                line = json.dumps(record, separators=(',', ':'))
+                self._file.write(u'{}\n'.format(line))
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        """Validate, record and answer a request.
+
+        Takes the same arguments as ConnectionPool.request.
+
+        :rtype: sendgrid.transport.RawResponse
+        """
+        with self._lock:
+            self.count += 1
+        try:
+            payload = decode_body(body, headers)
+        except ValueError:
+            self._record(method, url, headers, None, 400)
+            return _response(400, json.dumps({'errors': [
+                _error('Bad Request: the body is not valid JSON.')]}
+            ).encode('utf-8'))
+
+        if method == 'POST' and urlsplit(url).path.rstrip('/').endswith(
+                '/mail/send'):
+            errors = validate_mail_payload(payload) if self.validate else []
+            if errors:
+                self._record(method, url, headers, payload, 400)
+                return _response(
+                    400, json.dumps({'errors': errors}).encode('utf-8'))
+            self._record(method, url, headers, payload, 202)
+            message_id = '{}.{}'.format(uuid.uuid4().hex[:22], next(self._ids))
+            return _response(202, headers={'X-Message-Id': message_id})
+
+        status = 200 if method == 'GET' else 202
+        self._record(method, url, headers, payload, status)
+        return _response(status, b'{}' if method == 'GET' else b'')
+
+    def close(self):
+        """Close the NDJSON file, if it was opened by this transport."""
+        if self._owns_file:
+            self._file.close()
+            self._owns_file = False
+            self._file = None
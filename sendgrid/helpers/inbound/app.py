@@ -13,12 +13,69 @@ except:
     # Python 3+, Travis
     from sendgrid.helpers.inbound.parse import Parse
 
-from flask import Flask, request, render_template
+from flask import Flask, Response, abort, request, render_template
 import os
+import time
+
+from sendgrid import metrics
 
 app = Flask(__name__)
 config = Config()
 
+# Requests, body sizes and processing times of the received POSTs, once
+# enable_metrics() has been called.
+inbound_metrics = None
+
+
+def enable_metrics():
+    """Record metrics of the received POSTs and export them on /metrics.
+
+    Called on import when `metrics` is set in config.yml.  /metrics is not
+    authenticated."""
+    global inbound_metrics
+    if inbound_metrics is None:
+        inbound_metrics = (
+            metrics.REGISTRY.counter(
+                'sendgrid_inbound_requests_total',
+                'Inbound Parse POSTs received, by status.', ('status',)),
+            metrics.REGISTRY.histogram(
+                'sendgrid_inbound_request_bytes',
+                'Size of the Inbound Parse POST bodies.',
+                buckets=metrics.SIZE_BUCKETS),
+            metrics.REGISTRY.histogram(
+                'sendgrid_inbound_processing_seconds',
+                'Time spent processing an Inbound Parse POST.'))
+
+
+if config.metrics:
+    enable_metrics()
+
+
+@app.before_request
+def start_timer():
+    if inbound_metrics is not None:
+        request.environ['sendgrid.start'] = time.time()
+
+
+@app.after_request
+def record_inbound(response):
+    if (inbound_metrics is not None and 'sendgrid.start' in request.environ
+            and request.method == 'POST' and request.path == config.endpoint):
+        requests, sizes, seconds = inbound_metrics
+        requests.inc(status=response.status_code)
+        sizes.observe(request.content_length or 0)
+        seconds.observe(time.time() - request.environ['sendgrid.start'])
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Export the metrics of this process in Prometheus text format."""
+    if inbound_metrics is None:
+        abort(404)
+    return Response(metrics.REGISTRY.expose(),
+                    content_type=metrics.CONTENT_TYPE)
+
 
 @app.route('/', methods=['GET'])
 def index():
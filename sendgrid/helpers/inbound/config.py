@@ -22,6 +22,7 @@ class Config(object):
             self._host = config['host']
             self._keys = config['keys']
             self._port = config['port']
+            self._metrics = config.get('metrics', False)
 
     @staticmethod
     def init_environment():
@@ -62,3 +63,8 @@ class Config(object):
     def port(self):
         """Port to listen on."""
         return self._port
+
+    @property
+    def metrics(self):
+        """Record request metrics and export them on /metrics."""
+        return self._metrics
@@ -1,58 +1,100 @@
-from .asm import Asm
-from .attachment import Attachment
-from .batch_id import BatchId
-from .bcc_email import Bcc
-from .bcc_settings import BccSettings
-from .bcc_settings_email import BccSettingsEmail
-from .bypass_list_management import BypassListManagement
-from .category import Category
-from .cc_email import Cc
-from .click_tracking import ClickTracking
-from .content import Content
-from .content_id import ContentId
-from .custom_arg import CustomArg
-from .disposition import Disposition
-from .email import Email
-from .exceptions import SendGridException, ApiKeyIncludedException
-from .file_content import FileContent
-from .file_name import FileName
-from .file_type import FileType
-from .footer_settings import FooterSettings
-from .footer_text import FooterText
-from .footer_html import FooterHtml
-from .from_email import From
-from .ganalytics import Ganalytics
-from .group_id import GroupId
-from .groups_to_display import GroupsToDisplay
-from .header import Header
-from .html_content import HtmlContent
-from .ip_pool_name import IpPoolName
-from .mail_settings import MailSettings
-from .mail import Mail
-from .mime_type import MimeType
-from .open_tracking import OpenTracking
-from .open_tracking_substitution_tag import OpenTrackingSubstitutionTag
-from .personalization import Personalization
-from .plain_text_content import PlainTextContent
-from .reply_to import ReplyTo
-from .sandbox_mode import SandBoxMode
-from .section import Section
-from .send_at import SendAt
-from .spam_check import SpamCheck
-from .spam_threshold import SpamThreshold
-from .spam_url import SpamUrl
-from .subject import Subject
-from .subscription_tracking import SubscriptionTracking
-from .subscription_text import SubscriptionText
-from .subscription_html import SubscriptionHtml
-from .subscription_substitution_tag import SubscriptionSubstitutionTag
-from .substitution import Substitution
-from .template_id import TemplateId
-from .tracking_settings import TrackingSettings
-from .to_email import To
-from .utm_source import UtmSource
-from .utm_medium import UtmMedium
-from .utm_term import UtmTerm
-from .utm_content import UtmContent
-from .utm_campaign import UtmCampaign
-from .validators import ValidateApiKey
+"""Helper classes to build the request body of v3/mail/send.
+
+The classes are imported from their modules on first access (PEP 562), so that
+importing this package does not load all of them.
+"""
+import importlib
+import sys
+
+# Name of each public class -> module defining it.
+_MODULES = {
+    'Asm': 'asm',
+    'Attachment': 'attachment',
+    'BatchId': 'batch_id',
+    'Bcc': 'bcc_email',
+    'BccSettings': 'bcc_settings',
+    'BccSettingsEmail': 'bcc_settings_email',
+    'BypassListManagement': 'bypass_list_management',
+    'Category': 'category',
+    'Cc': 'cc_email',
+    'ClickTracking': 'click_tracking',
+    'Content': 'content',
+    'ContentId': 'content_id',
+    'CustomArg': 'custom_arg',
+    'Disposition': 'disposition',
+    'Email': 'email',
+    'SendGridException': 'exceptions',
+    'ApiKeyIncludedException': 'exceptions',
+    'FileContent': 'file_content',
+    'FileName': 'file_name',
+    'FileType': 'file_type',
+    'FooterSettings': 'footer_settings',
+    'FooterText': 'footer_text',
+    'FooterHtml': 'footer_html',
+    'From': 'from_email',
+    'Ganalytics': 'ganalytics',
+    'GroupId': 'group_id',
+    'GroupsToDisplay': 'groups_to_display',
+    'Header': 'header',
+    'HtmlContent': 'html_content',
+    'IpPoolName': 'ip_pool_name',
+    'MailSettings': 'mail_settings',
+    'Mail': 'mail',
+    'MimeType': 'mime_type',
+    'OpenTracking': 'open_tracking',
+    'OpenTrackingSubstitutionTag': 'open_tracking_substitution_tag',
+    'Personalization': 'personalization',
+    'PlainTextContent': 'plain_text_content',
+    'RecipientTable': 'recipient_table',
+    'ReplyTo': 'reply_to',
+    'SandBoxMode': 'sandbox_mode',
+    'Section': 'section',
+    'SendAt': 'send_at',
+    'SpamCheck': 'spam_check',
+    'SpamThreshold': 'spam_threshold',
+    'SpamUrl': 'spam_url',
+    'Subject': 'subject',
+    'SubscriptionTracking': 'subscription_tracking',
+    'SubscriptionText': 'subscription_text',
+    'SubscriptionHtml': 'subscription_html',
+    'SubscriptionSubstitutionTag': 'subscription_substitution_tag',
+    'Substitution': 'substitution',
+    'TemplateId': 'template_id',
+    'TrackingSettings': 'tracking_settings',
+    'To': 'to_email',
+    'UtmSource': 'utm_source',
+    'UtmMedium': 'utm_medium',
+    'UtmTerm': 'utm_term',
+    'UtmContent': 'utm_content',
+    'UtmCampaign': 'utm_campaign',
+    'ValidateApiKey': 'validators',
+}
+
+__all__ = sorted(_MODULES)
+
+# Submodules, which are also loaded on first access.
+_SUBMODULES = set(_MODULES.values()) | set(['serializer', 'tracked'])
+
+
+def _load(name):
+    value = getattr(importlib.import_module('.' + _MODULES[name], __name__),
+                    name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _SUBMODULES:
+            return importlib.import_module('.' + name, __name__)
+        if name not in _MODULES:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__) | _SUBMODULES)
+else:
+    # No module __getattr__ before Python 3.7: import everything up front.
+    for _name in __all__:
+        _load(_name)
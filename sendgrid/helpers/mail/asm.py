@@ -1,6 +1,11 @@
-class Asm(object):
+from .tracked import Tracked
+
+
+class Asm(Tracked):
     """An object specifying unsubscribe behavior."""
 
+    __slots__ = ('_group_id', '_groups_to_display')
+
     def __init__(self, group_id=None, groups_to_display=None):
         """Create an ASM with the given group_id and groups_to_display.
 
@@ -1,6 +1,13 @@
-class Attachment(object):
+from .tracked import Tracked
+
+
+class Attachment(Tracked):
     """An attachment to be included with an email."""
 
+    __slots__ = (
+        '_file_content', '_file_type', '_file_name', '_disposition',
+        '_content_id')
+
     def __init__(self, file_content=None, file_type=None, file_name=None, disposition=None, content_id=None):
         """Create an Attachment
 
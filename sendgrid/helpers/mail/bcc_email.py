@@ -3,3 +3,5 @@ from .email import Email
 
 class Bcc(Email):
     """A bcc email address with an optional name."""
+
+    __slots__ = ()
@@ -1,10 +1,15 @@
-class BccSettings(object):
+from .tracked import Tracked
+
+
+class BccSettings(Tracked):
     """Settings object for automatic BCC.
 
     This allows you to have a blind carbon copy automatically sent to the
     specified email address for every email that is sent.
     """
 
+    __slots__ = ('_enable', '_email')
+
     def __init__(self, enable=None, email=None):
         """Create a BCCSettings.
 
@@ -1,6 +1,11 @@
-class BccSettingsEmail(object):
+from .tracked import Tracked
+
+
+class BccSettingsEmail(Tracked):
     """The BccSettingsEmail of an Attachment."""
 
+    __slots__ = ('_bcc_settings_email',)
+
     def __init__(self, bcc_settings_email=None):
         """Create a BccSettingsEmail object
 
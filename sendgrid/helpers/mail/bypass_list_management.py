@@ -1,4 +1,7 @@
-class BypassListManagement(object):
+from .tracked import Tracked
+
+
+class BypassListManagement(Tracked):
     """Setting for Bypass List Management
 
     Allows you to bypass all unsubscribe groups and suppressions to ensure that
@@ -7,6 +10,8 @@ class BypassListManagement(object):
     receives your email.
     """
 
+    __slots__ = ('_enable',)
+
     def __init__(self, enable=None):
         """Create a BypassListManagement.
 
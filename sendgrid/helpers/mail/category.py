@@ -1,6 +1,11 @@
-class Category(object):
+from .tracked import Tracked
+
+
+class Category(Tracked):
     """A category name for this message."""
 
+    __slots__ = ('_name',)
+
     def __init__(self, name=None):
         """Create a Category.
 
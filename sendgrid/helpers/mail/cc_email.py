@@ -3,3 +3,5 @@ from .email import Email
 
 class Cc(Email):
     """A cc email address with an optional name."""
+
+    __slots__ = ()
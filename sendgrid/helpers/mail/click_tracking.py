@@ -1,6 +1,11 @@
-class ClickTracking(object):
+from .tracked import Tracked
+
+
+class ClickTracking(Tracked):
     """Allows you to track whether a recipient clicked a link in your email."""
 
+    __slots__ = ('_enable', '_enable_text')
+
     def __init__(self, enable=None, enable_text=None):
         """Create a ClickTracking to track clicked links in your email.
 
@@ -1,12 +1,15 @@
 from .validators import ValidateApiKey
+from .tracked import Tracked
 
 
-class Content(object):
+class Content(Tracked):
     """Content to be included in your email.
 
     You must specify at least one mime type in the Contents of your email.
     """
 
+    __slots__ = ('_type', '_value', '_validator')
+
     def __init__(self, type_=None, value=None):
         """Create a Content with the specified MIME type and value.
 
@@ -1,6 +1,11 @@
-class ContentId(object):
+from .tracked import Tracked
+
+
+class ContentId(Tracked):
     """The ContentId of an Attachment."""
 
+    __slots__ = ('_content_id',)
+
     def __init__(self, content_id=None):
         """Create a ContentId object
 
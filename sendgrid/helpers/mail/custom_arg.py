@@ -1,4 +1,7 @@
-class CustomArg(object):
+from .tracked import Tracked
+
+
+class CustomArg(Tracked):
     """Values that will be carried along with the email and its activity data.
 
     Substitutions will not be made on custom arguments, so any string entered
@@ -7,6 +10,8 @@ class CustomArg(object):
     Personalization. May not exceed 10,000 bytes.
     """
 
+    __slots__ = ('_key', '_value', '_personalization')
+
     def __init__(self, key=None, value=None, p=None):
         """Create a CustomArg with the given key and value.
             
@@ -1,6 +1,11 @@
-class Disposition(object):
+from .tracked import Tracked
+
+
+class Disposition(Tracked):
     """The MIME type of the content you are attaching to an Attachment content."""
 
+    __slots__ = ('_disposition',)
+
     def __init__(self, disposition=None):
         """Create a Disposition object
 
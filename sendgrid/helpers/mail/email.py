@@ -17,10 +17,19 @@ else:
     __html_parser__ = HTMLParser()
     html_entity_decode = __html_parser__.unescape
 
+try:
+    # Python 2: addresses and names are usually unicode
+    string_types = basestring
+except NameError:
+    string_types = str
+
 
 class Email(object):
     """An email address with an optional name."""
 
+    __slots__ = (
+        '_name', '_email', '_substitutions', '_subject', '_personalization')
+
     def __init__(self,
                  email=None,
                  name=None,
@@ -1,6 +1,11 @@
-class FileContent(object):
+from .tracked import Tracked
+
+
+class FileContent(Tracked):
     """The Base64 encoded content of an Attachment."""
 
+    __slots__ = ('_file_content',)
+
     def __init__(self, file_content=None):
         """Create a FileContent object
 
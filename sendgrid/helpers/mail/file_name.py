@@ -1,6 +1,11 @@
-class FileName(object):
+from .tracked import Tracked
+
+
+class FileName(Tracked):
     """The filename of an Attachment."""
 
+    __slots__ = ('_file_name',)
+
     def __init__(self, file_name=None):
         """Create a FileName object
 
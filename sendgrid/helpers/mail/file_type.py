@@ -1,6 +1,11 @@
-class FileType(object):
+from .tracked import Tracked
+
+
+class FileType(Tracked):
     """The MIME type of the content you are attaching to an Attachment content."""
 
+    __slots__ = ('_file_type',)
+
     def __init__(self, file_type=None):
         """Create a FileType object
 
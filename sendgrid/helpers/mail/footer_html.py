@@ -1,6 +1,11 @@
-class FooterHtml(object):
+from .tracked import Tracked
+
+
+class FooterHtml(Tracked):
     """The FooterHtml of an Attachment."""
 
+    __slots__ = ('_footer_html',)
+
     def __init__(self, footer_html=None):
         """Create a FooterHtml object
 
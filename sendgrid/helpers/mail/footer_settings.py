@@ -1,6 +1,11 @@
-class FooterSettings(object):
+from .tracked import Tracked
+
+
+class FooterSettings(Tracked):
     """The default footer that you would like included on every email."""
 
+    __slots__ = ('_enable', '_text', '_html')
+
     def __init__(self, enable=None, text=None, html=None):
         """Create a default footer.
 
@@ -1,6 +1,11 @@
-class FooterText(object):
+from .tracked import Tracked
+
+
+class FooterText(Tracked):
     """The FooterText of an Footer."""
 
+    __slots__ = ('_footer_text',)
+
     def __init__(self, footer_text=None):
         """Create a FooterText object
 
@@ -3,3 +3,5 @@ from .email import Email
 
 class From(Email):
     """A from email address with an optional name."""
+
+    __slots__ = ()
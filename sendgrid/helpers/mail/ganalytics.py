@@ -1,6 +1,13 @@
-class Ganalytics(object):
+from .tracked import Tracked
+
+
+class Ganalytics(Tracked):
     """Allows you to enable tracking provided by Google Analytics."""
 
+    __slots__ = (
+        '_enable', '_utm_source', '_utm_medium', '_utm_term', '_utm_content',
+        '_utm_campaign')
+
     def __init__(self,
                  enable=None,
                  utm_source=None,
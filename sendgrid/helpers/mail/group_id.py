@@ -1,6 +1,11 @@
-class GroupId(object):
+from .tracked import Tracked
+
+
+class GroupId(Tracked):
     """The unsubscribe group to associate with this email."""
 
+    __slots__ = ('_group_id',)
+
     def __init__(self, group_id=None):
         """Create a GroupId object
 
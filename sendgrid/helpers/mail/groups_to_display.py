@@ -1,6 +1,11 @@
-class GroupsToDisplay(object):
+from .tracked import Tracked
+
+
+class GroupsToDisplay(Tracked):
     """The unsubscribe groups that you would like to be displayed on the unsubscribe preferences page.."""
 
+    __slots__ = ('_groups_to_display',)
+
     def __init__(self, groups_to_display=None):
         """Create a GroupsToDisplay object
 
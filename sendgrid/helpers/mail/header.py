@@ -1,4 +1,7 @@
-class Header(object):
+from .tracked import Tracked
+
+
+class Header(Tracked):
     """A header to specify specific handling instructions for your email.
 
     If the name or value contain Unicode characters, they must be properly
@@ -7,6 +10,8 @@ class Header(object):
     Content-Transfer-Encoding, To, From, Subject, Reply-To, CC, BCC
     """
 
+    __slots__ = ('_key', '_value', '_personalization')
+
     def __init__(self, key=None, value=None, p=None):
         """Create a Header.
 
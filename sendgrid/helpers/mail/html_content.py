@@ -5,6 +5,8 @@ from .validators import ValidateApiKey
 class HtmlContent(Content):
     """HTML content to be included in your email."""
 
+    __slots__ = ()
+
     def __init__(self, value = None):
         """Create an HtmlContent with the specified MIME type and value.
 
@@ -1,6 +1,11 @@
-class IpPoolName(object):
+from .tracked import Tracked
+
+
+class IpPoolName(Tracked):
     """The IpPoolName of an Attachment."""
 
+    __slots__ = ('_ip_pool_name',)
+
     def __init__(self, ip_pool_name=None):
         """Create a IpPoolName object
 
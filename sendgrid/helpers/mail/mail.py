@@ -1,16 +1,49 @@
 """v3/mail/send response body builder"""
+import itertools
 from collections import OrderedDict
 from .content import Content
 from .custom_arg import CustomArg
-from .email import Email
+from .email import Email, string_types
 from .header import Header
 from .mime_type import MimeType
 from .personalization import Personalization
+from .recipient_table import RecipientTable
 from .send_at import SendAt
+from .serializer import dumps
 from .subject import Subject
+from .to_email import To
+from .tracked import revision, state
 
 class Mail(object):
     """Creates the response body for v3/mail/send"""
+
+    # Limits on a single v3/mail/send request
+    MAX_PERSONALIZATIONS = 1000
+    MAX_RECIPIENTS = 1000
+    MAX_REQUEST_BYTES = 30 * 1024 * 1024
+
+    # Members of the request body other than the personalizations: key,
+    # property holding the helpers, and whether it holds a helper, a list of
+    # helpers or a list of helpers merged into a dict.
+    _SHARED_MEMBERS = (
+        ('from', 'from_email', 'object'),
+        ('subject', 'subject', 'object'),
+        ('content', 'contents', 'list'),
+        ('attachments', 'attachments', 'list'),
+        ('template_id', 'template_id', 'object'),
+        ('sections', 'sections', 'dict'),
+        ('headers', 'headers', 'dict'),
+        ('categories', 'categories', 'list'),
+        ('custom_args', 'custom_args', 'dict'),
+        ('send_at', 'send_at', 'object'),
+        ('batch_id', 'batch_id', 'object'),
+        ('asm', 'asm', 'object'),
+        ('ip_pool_name', 'ip_pool_name', 'object'),
+        ('mail_settings', 'mail_settings', 'object'),
+        ('tracking_settings', 'tracking_settings', 'object'),
+        ('reply_to', 'reply_to', 'object'),
+    )
+
     def __init__(
             self,
             from_email=None,
@@ -40,6 +73,10 @@ class Mail(object):
         self._custom_args = None
         self._headers = None
         self._personalizations = []
+        self._global_substitutions = []
+        self._recipient_tables = []
+        # Serialized members of the body, see _shared_member().
+        self._memo = {}
         self._sections = None
         self._asm = None
         self._batch_id = None
@@ -64,9 +101,101 @@ class Mail(object):
         if html_content is not None:
             self.add_content(html_content)
 
+    @classmethod
+    def from_columns(cls, emails, names=None, substitutions=None,
+                     validate=True, **kwargs):
+        """A Mail sent separately to each recipient of the given columns,
+        without building a Personalization or Email per recipient:
+
+            mail = Mail.from_columns(
+                frame['email'], frame['name'],
+                substitutions={'-order-': frame['order']},
+                from_email=From('orders@example.com'),
+                subject='Your order -order-',
+                plain_text_content=PlainTextContent('...'))
+
+        The recipients are kept in a RecipientTable, see
+        RecipientTable.from_columns() for the columns accepted and
+        RecipientTable.from_frame() to take them from a DataFrame.
+
+        :param emails: address of each recipient
+        :param names: name of each recipient, if any
+        :param substitutions: column of values of each substitution key
+        :type substitutions: dict, optional
+        :param validate: check the addresses in one pass before building
+        :type validate: boolean
+        :param kwargs: arguments of Mail(), other than to_emails
+        :raises ValueError: if an address is invalid or the columns differ in
+            length
+        :rtype: Mail
+        """
+        mail = cls(**kwargs)
+        mail.add_recipient_table(RecipientTable.from_columns(
+            emails, names, substitutions, validate))
+        return mail
+
     def __str__(self):
         return str(self.get())
 
+    @staticmethod
+    def _copy_state(obj, new_obj):
+        """Copy the attributes of `obj` to `new_obj`, copying lists so that
+        adding to or removing from them does not affect `obj`."""
+        for name, value in state(obj):
+            if isinstance(value, list):
+                value = list(value)
+            object.__setattr__(new_obj, name, value)
+        return new_obj
+
+    def clone(self):
+        """A copy of this Mail to be modified and sent on its own, e.g. to a
+        different recipient.
+
+        Only the Mail itself and its personalizations are copied.  The other
+        helpers (contents, attachments, settings, ...) are shared with this
+        Mail, together with their serialized form: replace them on the copy
+        through its setters and add_*() methods rather than modifying them.
+
+        :rtype: Mail
+        """
+        mail = self._copy_state(self, object.__new__(type(self)))
+        mail._personalizations = [
+            self._copy_state(p, object.__new__(type(p)))
+            for p in self._personalizations]
+        mail._memo = dict(self._memo)
+        return mail
+
+    def derive(self, personalizations=None, to_emails=None, **overrides):
+        """A clone() of this Mail with the given changes:
+            mail.derive(to_emails=To('customer@example.com'),
+                        subject='Your order has shipped')
+
+        :param personalizations: Personalizations replacing those of the copy
+        :type personalizations: iterable of Personalization
+        :param to_emails: recipients replacing those of the copy, all in one
+            Personalization as with Mail(to_emails=...)
+        :type to_emails: To, list of To or string
+        :param overrides: values set on the copy through the properties of the
+            same names, after the recipients are replaced (e.g. subject,
+            from_email, template_id)
+        :rtype: Mail
+        """
+        mail = self.clone()
+        if personalizations is not None or to_emails is not None:
+            mail._personalizations = []
+            mail._recipient_tables = []
+        if personalizations is not None:
+            mail.add_personalizations(personalizations)
+        if to_emails is not None:
+            mail._set_emails(to_emails)
+        for name, value in overrides.items():
+            if not isinstance(getattr(type(self), name, None), property):
+                raise TypeError(
+                    'derive() got an unexpected keyword argument {!r}'.format(
+                        name))
+            setattr(mail, name, value)
+        return mail
+
     def _ensure_append(self, new_items, append_to, index=0):
         append_to = append_to or []
         append_to.insert(index, new_items)
@@ -85,25 +214,11 @@ class Mail(object):
         return from_obj.get() if from_obj is not None else None
 
     def _set_emails(self, emails, global_substitutions=None, is_multiple=False, p=0):
+        if global_substitutions is not None:
+            self.add_global_substitution(global_substitutions)
         # Send Multiple Emails to Multiple Recipients
         if is_multiple == True:
-            if isinstance(emails, list):
-                for email in emails:
-                    personalization = Personalization()
-                    personalization.add_email(email)
-                    self.add_personalization(personalization)
-            else:
-                personalization = Personalization()
-                personalization.add_email(emails)
-                self.add_personalization(personalization)
-            if global_substitutions is not None:
-                if isinstance(global_substitutions, list):
-                    for substitution in global_substitutions:
-                        for p in self.personalizations:
-                            p.add_substitution(substitution)
-                else:
-                    for p in self.personalizations:
-                        p.add_substitution(global_substitutions)
+            self.extend_recipients(emails if isinstance(emails, list) else [emails])
         else:  
             try:
                 personalization = self._personalizations[p]
@@ -117,12 +232,6 @@ class Mail(object):
                     personalization.add_email(email)
             else:
                 personalization.add_email(emails)
-            if global_substitutions is not None:
-                if isinstance(global_substitutions, list):
-                    for substitution in global_substitutions:
-                        personalization.add_substitution(substitution)
-                else:
-                    personalization.add_substitution(global_substitutions)
             
             if not has_internal_personalization:
                 self.add_personalization(personalization, index=p)
@@ -135,6 +244,55 @@ class Mail(object):
         self._personalizations = self._ensure_append(
             personalizations, self._personalizations, index)
 
+    def add_personalizations(self, personalizations):
+        """Append many Personalizations, keeping their order.
+
+        Unlike add_personalization(), which inserts at an index (the front by
+        default), this is an amortized O(1) append per Personalization, to
+        build messages with many recipients.
+
+        :param personalizations: the Personalizations to add
+        :type personalizations: iterable of Personalization
+        """
+        self._personalizations.extend(personalizations)
+
+    def extend_recipients(self, emails, global_substitutions=None):
+        """Send the message separately to each of `emails`: append one
+        Personalization per recipient, keeping their order.
+
+        :param emails: recipients; strings are added as To addresses
+        :type emails: iterable of To, Cc, Bcc or string
+        :param global_substitutions: substitutions applied to every
+            Personalization, see add_global_substitution()
+        :type global_substitutions: Substitution or list of Substitution
+        """
+        if global_substitutions is not None:
+            self.add_global_substitution(global_substitutions)
+        self.add_personalizations(
+            self._recipient_personalization(email) for email in emails)
+
+    @property
+    def recipient_tables(self):
+        return self._recipient_tables
+
+    def add_recipient_table(self, table):
+        """Send the message to the recipients of a RecipientTable, one
+        Personalization each, after the personalizations of this Mail.
+
+        The personalizations are built from the table as the request body is
+        serialized, so recipients added to the table later are included.
+
+        :type table: RecipientTable
+        """
+        self._recipient_tables.append(table)
+
+    @staticmethod
+    def _recipient_personalization(email):
+        personalization = Personalization()
+        personalization.add_email(
+            To(email) if isinstance(email, string_types) else email)
+        return personalization
+
     @property
     def to(self):
         pass
@@ -260,8 +418,38 @@ class Mail(object):
         else:
             self.add_substitution(substitution)
 
+    @property
+    def global_substitutions(self):
+        return self._global_substitutions
+
+    def add_global_substitution(self, substitution):
+        """Add Substitutions applied to every Personalization.
+
+        They are kept once on the Mail rather than copied into each
+        Personalization, and merged into the substitutions of every
+        Personalization when the request body is built, since the v3 API has
+        no message-wide substitutions.  A Personalization's own Substitution
+        for the same key takes precedence.
+
+        This includes Personalizations added afterwards, with
+        add_personalization() or a recipient table, and is also what
+        add_substitution() does with a Substitution without a
+        personalization; previously those were copied only into the
+        Personalizations that already existed.
+
+        :type substitution: Substitution or list of Substitution
+        """
+        if isinstance(substitution, list):
+            self._global_substitutions.extend(substitution)
+        else:
+            self._global_substitutions.append(substitution)
+
     def add_substitution(self, substitution):
-        if substitution.personalization:
+        if isinstance(substitution, list):
+            for s in substitution:
+                self.add_substitution(s)
+            return
+        if substitution.personalization is not None:
             try:
                 personalization = self._personalizations[substitution.personalization]
                 has_internal_personalization = True
@@ -272,14 +460,8 @@ class Mail(object):
             
             if not has_internal_personalization:
                 self.add_personalization(personalization, index=substitution.personalization)
-        else:    
-            if isinstance(substitution, list):
-                for s in substitution:
-                    for p in self.personalizations:
-                        p.add_substitution(s)
-            else:
-                for p in self.personalizations:
-                    p.add_substitution(substitution)
+        else:
+            self.add_global_substitution(substitution)
 
     @property
     def custom_args(self):
@@ -494,29 +676,146 @@ class Mail(object):
         """
         :return: request body dict
         """
-        mail = {
-            'from': self._get_or_none(self.from_email),
-            'subject': self._get_or_none(self.subject),
-            'personalizations': [p.get() for p in self.personalizations or []],
-            'content': [c.get() for c in self.contents or []],
-            'attachments': [a.get() for a in self.attachments or []],
-            'template_id': self._get_or_none(self.template_id),
-            'sections': self._flatten_dicts(self.sections),
-            'headers': self._flatten_dicts(self.headers),
-            'categories': [c.get() for c in self.categories or []],
-            'custom_args': self._flatten_dicts(self.custom_args),
-            'send_at':  self._get_or_none(self.send_at),
-            'batch_id': self._get_or_none(self.batch_id),
-            'asm': self._get_or_none(self.asm),
-            'ip_pool_name': self._get_or_none(self.ip_pool_name),
-            'mail_settings': self._get_or_none(self.mail_settings),
-            'tracking_settings': self._get_or_none(self.tracking_settings),
-            'reply_to': self._get_or_none(self.reply_to),
-        }
+        mail = {}
+        for key, attribute, kind in self._SHARED_MEMBERS:
+            mail[key] = self._member_value(attribute, kind)
+            if key == 'subject':
+                mail['personalizations'] = list(
+                    self._iter_personalization_dicts())
 
         return {key: value for key, value in mail.items()
                 if value is not None and value != [] and value != {}}
 
+    def _member_value(self, attribute, kind):
+        helpers = getattr(self, attribute)
+        if kind == 'list':
+            return [h.get() for h in helpers or []]
+        if kind == 'dict':
+            return self._flatten_dicts(helpers)
+        return self._get_or_none(helpers)
+
+    def _shared_member(self, key, attribute, kind):
+        """One member of the request body other than the personalizations,
+        rebuilt only if its helpers changed since the previous call.
+
+        :return: [revision of the helpers, JSON-ready value, JSON encoded
+            member or None if not encoded yet]
+        :rtype: list
+        """
+        current = revision(getattr(self, attribute))
+        memo = self._memo.get(key)
+        if memo is None or memo[0] != current:
+            memo = self._memo[key] = [
+                current, self._member_value(attribute, kind), None]
+        return memo
+
+    def _shared_json(self):
+        """Everything in the request body except the personalizations, as a
+        JSON fragment of comma separated members.
+
+        Members are encoded only when their helpers changed, and the fragment
+        is rebuilt only when one of its members was.
+
+        :rtype: bytes
+        """
+        members = []
+        for key, attribute, kind in self._SHARED_MEMBERS:
+            memo = self._shared_member(key, attribute, kind)
+            value = memo[1]
+            if value is None or value == [] or value == {}:
+                continue
+            if memo[2] is None:
+                memo[2] = dumps(key) + b':' + dumps(value)
+            members.append(memo[2])
+        cached = self._memo.get(None)
+        if cached is None or len(cached[0]) != len(members) or any(
+                a is not b for a, b in zip(cached[0], members)):
+            cached = self._memo[None] = (members, b','.join(members))
+        return cached[1]
+
+    def _iter_personalization_dicts(self):
+        """JSON-ready dicts of every personalization, then of every row of the
+        recipient tables, in order, with the global substitutions merged in."""
+        shared = self._flatten_dicts(self._global_substitutions)
+        for personalization in itertools.chain(
+                (p.get() for p in self.personalizations),
+                *self._recipient_tables):
+            if shared:
+                substitutions = dict(shared)
+                substitutions.update(personalization.get('substitutions', {}))
+                personalization['substitutions'] = substitutions
+            yield personalization
+
+    @staticmethod
+    def _json_document(shared_json, personalizations_json=None):
+        # A single join, so that a large shared part is copied only once.
+        parts = [b'{']
+        if personalizations_json:
+            parts += [b'"personalizations":', personalizations_json]
+            if shared_json:
+                parts.append(b',')
+        if shared_json:
+            parts.append(shared_json)
+        parts.append(b'}')
+        return b''.join(parts)
+
+    def to_json_bytes(self):
+        """
+        Get the JSON encoded request body.
+
+        Equivalent to JSON encoding get(), but each part of the body is
+        encoded straight to bytes (with orjson when it is installed) and the
+        full dict tree is never assembled and filtered.
+
+        :return: request body
+        :rtype: bytes
+        """
+        personalizations = list(self._iter_personalization_dicts())
+        return self._json_document(
+            self._shared_json(),
+            dumps(personalizations) if personalizations else None)
+
+    def to_json_chunks(self,
+                       max_personalizations=MAX_PERSONALIZATIONS,
+                       max_recipients=MAX_RECIPIENTS,
+                       max_bytes=MAX_REQUEST_BYTES):
+        """
+        Split the request body into bodies the v3 API accepts.
+
+        Every body carries the same content, attachments and settings, which
+        are encoded only once, and a consecutive slice of the personalizations
+        that stays within the given limits.
+
+        :param max_personalizations: personalizations allowed per request
+        :type max_personalizations: integer
+        :param max_recipients: to, cc and bcc recipients allowed per request
+        :type max_recipients: integer
+        :param max_bytes: largest request body, in bytes
+        :type max_bytes: integer
+        :return: request bodies
+        :rtype: generator of bytes
+        """
+        shared = self._shared_json()
+        overhead = len(self._json_document(shared, b'[]'))
+        batch, size, recipients = [], overhead, 0
+        for personalization in self._iter_personalization_dicts():
+            encoded = dumps(personalization)
+            count = (len(personalization.get('to', ())) +
+                     len(personalization.get('cc', ())) +
+                     len(personalization.get('bcc', ())))
+            if batch and (len(batch) >= max_personalizations or
+                          recipients + count > max_recipients or
+                          size + len(encoded) + 1 > max_bytes):
+                yield self._json_document(shared, b'[' + b','.join(batch) + b']')
+                batch, size, recipients = [], overhead, 0
+            batch.append(encoded)
+            size += len(encoded) + 1
+            recipients += count
+        if batch:
+            yield self._json_document(shared, b'[' + b','.join(batch) + b']')
+        else:
+            yield self._json_document(shared)
+
     @classmethod
     def from_EmailMessage(cls, message):
         """Create a Mail object from an instance of
@@ -1,6 +1,13 @@
-class MailSettings(object):
+from .tracked import Tracked
+
+
+class MailSettings(Tracked):
     """A collection of mail settings that specify how to handle this email."""
 
+    __slots__ = (
+        '_bcc_settings', '_bypass_list_management', '_footer_settings',
+        '_sandbox_mode', '_spam_check')
+
     def __init__(self,
                  bcc_settings = None,
                  bypass_list_management = None,
@@ -1,5 +1,11 @@
-class MimeType(object):
+from .tracked import Tracked
+
+
+class MimeType(Tracked):
     """The MIME type of the content of your email.
     """
+
+    __slots__ = ()
+
     text = "text/plain"
     html = "text/html"
\ No newline at end of file
@@ -1,10 +1,15 @@
-class OpenTracking(object):
+from .tracked import Tracked
+
+
+class OpenTracking(Tracked):
     """
     Allows you to track whether the email was opened or not, by including a
     single pixel image in the body of the content. When the pixel is loaded,
     we log that the email was opened.
     """
 
+    __slots__ = ('_enable', '_substitution_tag')
+
     def __init__(self, enable=None, substitution_tag=None):
         """Create an OpenTracking to track when your email is opened.
 
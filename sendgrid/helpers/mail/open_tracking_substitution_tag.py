@@ -1,6 +1,11 @@
-class OpenTrackingSubstitutionTag(object):
+from .tracked import Tracked
+
+
+class OpenTrackingSubstitutionTag(Tracked):
     """The OpenTrackingSubstitutionTag of an SubscriptionTracking."""
 
+    __slots__ = ('_open_tracking_substitution_tag',)
+
     def __init__(self, open_tracking_substitution_tag=None):
         """Create a OpenTrackingSubstitutionTag object
 
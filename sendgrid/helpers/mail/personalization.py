@@ -1,17 +1,26 @@
+from .serializer import dumps
+
+
 class Personalization(object):
     """A Personalization defines who should receive an individual message and
     how that message should be handled.
     """
 
+    __slots__ = (
+        '_tos', '_ccs', '_bccs', '_subject', '_headers', '_substitutions',
+        '_custom_args', '_send_at')
+
     def __init__(self):
         """Create an empty Personalization and initialize member variables."""
         self._tos = []
-        self._ccs = []
-        self._bccs = []
+        # Created when first used: most Personalizations leave them empty,
+        # and an empty list per attribute adds up over many recipients.
+        self._ccs = None
+        self._bccs = None
         self._subject = None
-        self._headers = []
-        self._substitutions = []
-        self._custom_args = []
+        self._headers = None
+        self._substitutions = None
+        self._custom_args = None
         self._send_at = None
 
     def add_email(self, email):
@@ -55,6 +64,8 @@ class Personalization(object):
 
         :rtype: list(dict)
         """
+        if self._ccs is None:
+            self._ccs = []
         return self._ccs
 
     @ccs.setter
@@ -67,7 +78,7 @@ class Personalization(object):
         :param email: new recipient to be CCed
         :type email: Email
         """
-        self._ccs.append(email.get())
+        self.ccs.append(email.get())
 
     @property
     def bccs(self):
@@ -75,6 +86,8 @@ class Personalization(object):
 
         :rtype: list(dict)
         """
+        if self._bccs is None:
+            self._bccs = []
         return self._bccs
 
     @bccs.setter
@@ -87,7 +100,7 @@ class Personalization(object):
         :param email: new recipient to be BCCed
         :type email: Email
         """
-        self._bccs.append(email.get())
+        self.bccs.append(email.get())
 
     @property
     def subject(self):
@@ -109,6 +122,8 @@ class Personalization(object):
 
         :rtype: list(dict)
         """
+        if self._headers is None:
+            self._headers = []
         return self._headers
 
     @headers.setter
@@ -120,7 +135,7 @@ class Personalization(object):
 
         :type header: Header
         """
-        self._headers.append(header.get())
+        self.headers.append(header.get())
 
     @property
     def substitutions(self):
@@ -128,6 +143,8 @@ class Personalization(object):
 
         :rtype: list(dict)
         """
+        if self._substitutions is None:
+            self._substitutions = []
         return self._substitutions
 
     @substitutions.setter
@@ -139,7 +156,7 @@ class Personalization(object):
 
         :type substitution: Substitution
         """
-        self._substitutions.append(substitution.get())
+        self.substitutions.append(substitution.get())
 
     @property
     def custom_args(self):
@@ -147,6 +164,8 @@ class Personalization(object):
 
         :rtype: list(dict)
         """
+        if self._custom_args is None:
+            self._custom_args = []
         return self._custom_args
 
     @custom_args.setter
@@ -158,7 +177,7 @@ class Personalization(object):
 
         :type custom_arg: CustomArg
         """
-        self._custom_args.append(custom_arg.get())
+        self.custom_args.append(custom_arg.get())
 
     @property
     def send_at(self):
@@ -182,23 +201,33 @@ class Personalization(object):
         :rtype: dict
         """
         personalization = {}
-
-        for key in ['tos', 'ccs', 'bccs']:
-            value = getattr(self, key)
-            if value:
-                personalization[key[:-1]] = value
-
-        for key in ['subject', 'send_at']:
-            value = getattr(self, key)
-            if value:
-                personalization[key] = value
-
-        for prop_name in ['headers', 'substitutions', 'custom_args']:
-            prop = getattr(self, prop_name)
+        if self._tos:
+            personalization['to'] = self._tos
+        if self._ccs:
+            personalization['cc'] = self._ccs
+        if self._bccs:
+            personalization['bcc'] = self._bccs
+        if self._subject:
+            personalization['subject'] = self._subject
+        if self._send_at:
+            personalization['send_at'] = self._send_at
+
+        for prop_name, prop in (('headers', self._headers),
+                                ('substitutions', self._substitutions),
+                                ('custom_args', self._custom_args)):
             if prop:
                 obj = {}
-                for key in prop:
-                    obj.update(key)
-                    personalization[prop_name] = obj
+                for item in prop:
+                    obj.update(item)
+                personalization[prop_name] = obj
 
         return personalization
+
+    def to_json_bytes(self):
+        """
+        Get the JSON encoded wire format of this Personalization.
+
+        :returns: This Personalization, ready for use in a request body.
+        :rtype: bytes
+        """
+        return dumps(self.get())
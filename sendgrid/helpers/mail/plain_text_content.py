@@ -6,6 +6,8 @@ class PlainTextContent(Content):
     """Plain text content to be included in your email.
     """
 
+    __slots__ = ()
+
     def __init__(self, value):
         """Create a PlainTextContent with the specified MIME type and value.
 
@@ -0,0 +1,236 @@
+import re
+
+from .email import string_types
+
+# Deliberately loose: an address must have a local part, an @ and a dotted
+# domain, without whitespace.  The API does the full validation.
+_ADDRESS = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+\Z')
+
+
+def column_values(column):
+    """The values of a column as a list of Python objects, missing values
+    as None.
+
+    :param column: a list or other sequence, a NumPy array, a pandas Series
+        or a pyarrow Array or ChunkedArray
+    :rtype: list
+    """
+    if hasattr(column, 'to_pylist'):
+        # pyarrow: nulls are converted to None.
+        return column.to_pylist()
+    if hasattr(column, 'notna'):
+        # pandas: NaN, NaT and NA become None.
+        column = column.astype(object).where(column.notna(), None)
+    if hasattr(column, 'tolist'):
+        # NumPy and pandas: scalars are converted to Python objects.
+        return column.tolist()
+    return list(column)
+
+
+def invalid_addresses(emails):
+    """Indexes of the values of `emails` that are not plausible addresses,
+    checked in a single pass.
+
+    :type emails: list
+    :rtype: list of integers
+    """
+    match = _ADDRESS.match
+    return [index for index, email in enumerate(emails)
+            if not (isinstance(email, string_types) and match(email))]
+
+
+class RecipientTable(object):
+    """Recipients of a send stored column by column, one Personalization
+    each.
+
+    A blast send with a Personalization per recipient holds a Personalization,
+    lists and dicts for every recipient.  A RecipientTable keeps a column of
+    addresses, a column of names and a column per substitution key instead,
+    and the personalizations are only built, one at a time, when the request
+    body is serialized:
+
+        table = RecipientTable(substitution_keys=['-name-', '-order-'])
+        for customer in customers:
+            table.append(customer.email, customer.name,
+                         [customer.name, customer.order])
+        mail.add_recipient_table(table)
+
+    Addresses and names are used as given: unlike To, they are not parsed
+    from a "Name <address>" string.
+    """
+
+    __slots__ = ('_emails', '_names', '_keys', '_columns')
+
+    def __init__(self, substitution_keys=()):
+        """
+        :param substitution_keys: substitution tags, one column each
+        :type substitution_keys: iterable of strings
+        """
+        self._emails = []
+        self._names = []
+        self._keys = tuple(substitution_keys)
+        self._columns = [[] for _ in self._keys]
+
+    @classmethod
+    def from_columns(cls, emails, names=None, substitutions=None,
+                     validate=True):
+        """A RecipientTable made of whole columns at once, e.g. taken from a
+        DataFrame:
+
+            table = RecipientTable.from_columns(
+                frame['email'], frame['name'],
+                substitutions={'-name-': frame['name'],
+                               '-order-': frame['order']})
+
+        Columns may be lists, NumPy arrays, pandas Series or pyarrow arrays;
+        see column_values().  Substitution values that are not strings are
+        converted with str(), missing values are left out.
+
+        :param emails: address of each recipient
+        :param names: name of each recipient, if any
+        :param substitutions: column of values of each substitution key
+        :type substitutions: dict, optional
+        :param validate: check the addresses, see invalid_addresses()
+        :type validate: boolean
+        :raises ValueError: if an address is invalid or the columns differ in
+            length
+        :rtype: RecipientTable
+        """
+        substitutions = substitutions or {}
+        table = cls(substitution_keys=substitutions)
+        emails = column_values(emails)
+        if validate:
+            invalid = invalid_addresses(emails)
+            if invalid:
+                raise ValueError(
+                    '{} invalid email addresses, first at rows {}'.format(
+                        len(invalid), ', '.join(
+                            '{} ({!r})'.format(index, emails[index])
+                            for index in invalid[:5])))
+        if names is None:
+            names = [None] * len(emails)
+        else:
+            names = _checked_length(column_values(names), emails, 'names')
+        columns = []
+        for key in table._keys:
+            values = _checked_length(
+                column_values(substitutions[key]), emails, key)
+            columns.append([
+                value if value is None or isinstance(value, string_types)
+                else str(value) for value in values])
+        table._emails = emails
+        table._names = names
+        table._columns = columns
+        return table
+
+    @classmethod
+    def from_frame(cls, frame, email='email', name=None, substitutions=None,
+                   validate=True):
+        """A RecipientTable made of the columns of a pandas DataFrame or a
+        pyarrow Table, see from_columns().  Neither library is required
+        unless such a frame is passed:
+
+            table = RecipientTable.from_frame(
+                frame, name='name',
+                substitutions={'-name-': 'name', '-order-': 'order'})
+
+        :param frame: the recipients, one per row
+        :type frame: pandas.DataFrame or pyarrow.Table
+        :param email: column holding the addresses
+        :type email: string
+        :param name: column holding the names
+        :type name: string, optional
+        :param substitutions: column holding the values of each substitution
+            key
+        :type substitutions: dict, optional
+        :rtype: RecipientTable
+        """
+        return cls.from_columns(
+            frame[email],
+            None if name is None else frame[name],
+            dict((key, frame[column])
+                 for key, column in (substitutions or {}).items()),
+            validate)
+
+    @property
+    def substitution_keys(self):
+        """:rtype: tuple of strings"""
+        return self._keys
+
+    def __len__(self):
+        return len(self._emails)
+
+    def append(self, email, name=None, substitutions=None):
+        """Add a recipient.
+
+        :param email: address of the recipient
+        :type email: string
+        :param name: name of the recipient
+        :type name: string, optional
+        :param substitutions: values of the substitution keys, in order or by
+            key; a missing or None value leaves the key out for this recipient
+        :type substitutions: sequence or dict, optional
+        """
+        if substitutions is None:
+            values = (None,) * len(self._keys)
+        elif isinstance(substitutions, dict):
+            unknown = set(substitutions) - set(self._keys)
+            if unknown:
+                raise ValueError('Unknown substitution keys: {}'.format(
+                    ', '.join(sorted(unknown))))
+            values = [substitutions.get(key) for key in self._keys]
+        else:
+            values = tuple(substitutions)
+            if len(values) != len(self._keys):
+                raise ValueError('Expected {} substitution values, got {}'
+                                 .format(len(self._keys), len(values)))
+        self._emails.append(email)
+        self._names.append(name)
+        for column, value in zip(self._columns, values):
+            column.append(value)
+
+    def extend(self, rows):
+        """Add many recipients.
+
+        :param rows: (email, name, substitutions) of each recipient, as taken
+            by append(); name and substitutions may be omitted
+        :type rows: iterable of tuples
+        """
+        for row in rows:
+            self.append(*row)
+
+    def personalization(self, index):
+        """JSON-ready Personalization of one recipient.
+
+        :rtype: dict
+        """
+        to = {'email': self._emails[index]}
+        if self._names[index] is not None:
+            to['name'] = self._names[index]
+        personalization = {'to': [to]}
+        substitutions = {}
+        for key, column in zip(self._keys, self._columns):
+            if column[index] is not None:
+                substitutions[key] = column[index]
+        if substitutions:
+            personalization['substitutions'] = substitutions
+        return personalization
+
+    def __iter__(self):
+        """JSON-ready Personalizations of every recipient, in order."""
+        for index in range(len(self._emails)):
+            yield self.personalization(index)
+
+    def get(self):
+        """
+        :returns: the Personalizations, ready for use in a request body
+        :rtype: list(dict)
+        """
+        return list(self)
+
+
+def _checked_length(values, emails, column):
+    if len(values) != len(emails):
+        raise ValueError('Expected {} values for {}, got {}'.format(
+            len(emails), column, len(values)))
+    return values
@@ -2,4 +2,6 @@ from .email import Email
 
 
 class ReplyTo(Email):
-    """A reply to email address with an optional name."""
\ No newline at end of file
+    """A reply to email address with an optional name."""
+
+    __slots__ = ()
\ No newline at end of file
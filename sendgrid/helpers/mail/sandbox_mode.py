@@ -1,9 +1,15 @@
-class SandBoxMode(object):
+from .tracked import Tracked
+
+
+class SandBoxMode(Tracked):
     """Setting for sandbox mode.
 
     This allows you to send a test email to ensure that your request body is
     valid and formatted correctly.
     """
+
+    __slots__ = ('_enable',)
+
     def __init__(self, enable=None):
         """Create an enabled or disabled SandBoxMode.
 
@@ -1,6 +1,11 @@
-class Section(object):
+from .tracked import Tracked
+
+
+class Section(Tracked):
     """A block section of code to be used as a substitution."""
 
+    __slots__ = ('_key', '_value')
+
     def __init__(self, key=None, value=None):
         """Create a section with the given key and value."""
         self._key = None
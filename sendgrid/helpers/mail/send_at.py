@@ -1,4 +1,7 @@
-class SendAt(object):
+from .tracked import Tracked
+
+
+class SendAt(Tracked):
     """A unix timestamp allowing you to specify when you want your 
     email to be delivered. This may be overridden by the 
     personalizations[x].send_at parameter. You can't schedule more 
@@ -9,6 +12,9 @@ class SendAt(object):
     at 10:53) can result in lower deferral rates because it won't 
     be going through our servers at the same times as everyone else's 
     mail."""
+
+    __slots__ = ('_send_at', '_personalization')
+
     def __init__(self, send_at=None, p=None):
         """Create a unix timestamp specifying when your email should 
         be delivered.
@@ -0,0 +1,33 @@
+"""JSON encoding of request bodies straight to bytes.
+
+orjson is used when it is installed; otherwise a compact stdlib encoder is
+used.  Both produce UTF-8 bytes ready to be sent on the wire.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    BACKEND = 'orjson'
+
+    def dumps(obj):
+        """Encode `obj` as compact JSON.
+
+        :rtype: bytes
+        """
+        return orjson.dumps(obj)
+else:
+    BACKEND = 'json'
+    _encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def dumps(obj):
+        """Encode `obj` as compact JSON.
+
+        :rtype: bytes
+        """
+        return _encode(obj).encode('utf-8')
+
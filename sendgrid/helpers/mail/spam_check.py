@@ -1,6 +1,11 @@
-class SpamCheck(object):
+from .tracked import Tracked
+
+
+class SpamCheck(Tracked):
     """This allows you to test the content of your email for spam."""
 
+    __slots__ = ('_enable', '_threshold', '_post_to_url')
+
     def __init__(self, enable=None, threshold=None, post_to_url=None):
         """Create a SpamCheck to test the content of your email for spam.
 
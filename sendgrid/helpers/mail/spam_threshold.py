@@ -1,8 +1,13 @@
-class SpamThreshold(object):
+from .tracked import Tracked
+
+
+class SpamThreshold(Tracked):
     """The threshold used to determine if your content qualifies as spam 
        on a scale from 1 to 10, with 10 being most strict, or most likely 
        to be considered as spam."""
 
+    __slots__ = ('_spam_threshold',)
+
     def __init__(self, spam_threshold=None):
         """Create a SpamThreshold object
 
@@ -1,7 +1,12 @@
-class SpamUrl(object):
+from .tracked import Tracked
+
+
+class SpamUrl(Tracked):
     """An Inbound Parse URL that you would like a copy of your email 
        along with the spam report to be sent to."""
 
+    __slots__ = ('_spam_url',)
+
     def __init__(self, spam_url=None):
         """Create a SpamUrl object
 
@@ -1,6 +1,11 @@
-class Subject(object):
+from .tracked import Tracked
+
+
+class Subject(Tracked):
     """A subject for an email message."""
 
+    __slots__ = ('_subject', '_personalization')
+
     def __init__(self, subject, p=None):
         """Create a Subjuct.
 
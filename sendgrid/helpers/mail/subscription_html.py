@@ -1,6 +1,11 @@
-class SubscriptionHtml(object):
+from .tracked import Tracked
+
+
+class SubscriptionHtml(Tracked):
     """The SubscriptionHtml of an SubscriptionTracking."""
 
+    __slots__ = ('_subscription_html',)
+
     def __init__(self, subscription_html=None):
         """Create a SubscriptionHtml object
 
@@ -1,6 +1,11 @@
-class SubscriptionSubstitutionTag(object):
+from .tracked import Tracked
+
+
+class SubscriptionSubstitutionTag(Tracked):
     """The SubscriptionSubstitutionTag of an SubscriptionTracking."""
 
+    __slots__ = ('_subscription_substitution_tag',)
+
     def __init__(self, subscription_substitution_tag=None):
         """Create a SubscriptionSubstitutionTag object
 
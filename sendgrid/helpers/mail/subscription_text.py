@@ -1,6 +1,11 @@
-class SubscriptionText(object):
+from .tracked import Tracked
+
+
+class SubscriptionText(Tracked):
     """The SubscriptionText of an SubscriptionTracking."""
 
+    __slots__ = ('_subscription_text',)
+
     def __init__(self, subscription_text=None):
         """Create a SubscriptionText object
 
@@ -1,9 +1,14 @@
-class SubscriptionTracking(object):
+from .tracked import Tracked
+
+
+class SubscriptionTracking(Tracked):
     """Allows you to insert a subscription management link at the bottom of the
     text and html bodies of your email. If you would like to specify the
     location of the link within your email, you may use the substitution_tag.
     """
 
+    __slots__ = ('_enable', '_text', '_html', '_substitution_tag')
+
     def __init__(self, enable=None, text=None, html=None, substitution_tag=None):
         """Create a SubscriptionTracking to customize subscription management.
 
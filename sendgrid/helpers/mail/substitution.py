@@ -3,6 +3,8 @@ class Substitution(object):
     the body of your email, as well as in the Subject and Reply-To parameters.
     """
 
+    __slots__ = ('_key', '_value', '_personalization')
+
     def __init__(self, key=None, value=None, p=None):
         """Create a Substitution with the given key and value.
 
@@ -1,6 +1,11 @@
-class TemplateId(object):
+from .tracked import Tracked
+
+
+class TemplateId(Tracked):
     """The TemplateId of an Attachment."""
 
+    __slots__ = ('_template_id',)
+
     def __init__(self, template_id=None):
         """Create a TemplateId object
 
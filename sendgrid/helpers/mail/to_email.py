@@ -3,3 +3,5 @@ from .email import Email
 
 class To(Email):
     """A to email address with an optional name."""
+
+    __slots__ = ()
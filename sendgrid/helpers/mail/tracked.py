@@ -0,0 +1,87 @@
+"""Change tracking for the mail helpers.
+
+Every attribute assignment on a Tracked helper stamps it with a new value of
+a global counter, so that its revision() changes whenever it, or a helper it
+holds, is modified through its setters.  Mail uses revisions to reuse the
+serialized form of the parts of a message that did not change between two
+sends.
+
+Helpers created once per recipient (Email and its subclasses,
+Personalization, Substitution) are not Tracked, to keep building large
+messages cheap; their revision is a snapshot of their attributes instead.
+
+Changes made to a helper's lists in place (e.g. mail.contents.append(...))
+are seen as long as the list holds helpers or plain values; prefer the
+setters and add_*() methods.
+"""
+import itertools
+
+_stamps = itertools.count(1)
+_slot_names = {}
+
+
+def slot_names(cls):
+    """Names of the attributes declared in the __slots__ of `cls` and its
+    bases.
+
+    :rtype: tuple of strings
+    """
+    names = _slot_names.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            names.extend(name for name in slots if name not in names)
+        names = _slot_names[cls] = tuple(names)
+    return names
+
+
+def state(obj):
+    """The attributes of a helper, whether stored in slots or in __dict__.
+
+    :rtype: list of (name, value)
+    """
+    items = [(name, getattr(obj, name)) for name in slot_names(type(obj))
+             if hasattr(obj, name)]
+    items.extend(getattr(obj, '__dict__', {}).items())
+    return items
+
+
+class Tracked(object):
+    """Base class of the helpers whose changes are tracked."""
+
+    __slots__ = ('_stamp',)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_stamp', next(_stamps))
+
+    def _revision(self):
+        # The stamp covers the plain attributes; the helpers held are
+        # stamped on their own.
+        return tuple(revision(value) for name, value in state(self)
+                     if name == '_stamp' or _holds_helpers(value))
+
+
+def _holds_helpers(value):
+    return isinstance(value, (Tracked, list, dict)) or hasattr(value, 'get')
+
+
+def revision(value):
+    """A value that compares equal between two calls only if `value` was not
+    modified in between.
+
+    :param value: a helper, a list of helpers, or a plain value
+    """
+    if isinstance(value, Tracked):
+        return value._revision()
+    if isinstance(value, list):
+        return tuple(revision(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, revision(item)) for key, item in value.items())
+    if hasattr(value, 'get'):
+        # An untracked helper.
+        return (type(value),) + revision(dict(state(value)))
+    return value
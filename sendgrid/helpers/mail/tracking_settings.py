@@ -1,6 +1,13 @@
-class TrackingSettings(object):
+from .tracked import Tracked
+
+
+class TrackingSettings(Tracked):
     """Settings to track how recipients interact with your email."""
 
+    __slots__ = (
+        '_click_tracking', '_open_tracking', '_subscription_tracking',
+        '_ganalytics')
+
     def __init__(self):
         """Create an empty TrackingSettings."""
         self._click_tracking = None
@@ -1,6 +1,11 @@
-class UtmCampaign(object):
+from .tracked import Tracked
+
+
+class UtmCampaign(Tracked):
     """The UtmCampaign of an Ganalytics."""
 
+    __slots__ = ('_utm_campaign',)
+
     def __init__(self, utm_campaign=None):
         """Create a UtmCampaign object
 
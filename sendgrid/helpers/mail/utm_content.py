@@ -1,6 +1,11 @@
-class UtmContent(object):
+from .tracked import Tracked
+
+
+class UtmContent(Tracked):
     """The UtmContent of an Ganalytics."""
 
+    __slots__ = ('_utm_content',)
+
     def __init__(self, utm_content=None):
         """Create a UtmContent object
 
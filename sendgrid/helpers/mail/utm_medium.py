@@ -1,6 +1,11 @@
-class UtmMedium(object):
+from .tracked import Tracked
+
+
+class UtmMedium(Tracked):
     """The UtmMedium of an Ganalytics."""
 
+    __slots__ = ('_utm_medium',)
+
     def __init__(self, utm_medium=None):
         """Create a UtmMedium object
 
@@ -1,6 +1,11 @@
-class UtmSource(object):
+from .tracked import Tracked
+
+
+class UtmSource(Tracked):
     """The UtmSource of an Ganalytics."""
 
+    __slots__ = ('_utm_source',)
+
     def __init__(self, utm_source=None):
         """Create a UtmSource object
 
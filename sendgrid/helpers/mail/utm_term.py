@@ -1,6 +1,11 @@
-class UtmTerm(object):
+from .tracked import Tracked
+
+
+class UtmTerm(Tracked):
     """The UtmTerm of an Ganalytics."""
 
+    __slots__ = ('_utm_term',)
+
     def __init__(self, utm_term=None):
         """Create a UtmTerm object
 
@@ -0,0 +1,159 @@
+"""
+Request lifecycle hooks of the SendGrid API Client.
+
+Callbacks registered on SendGridAPIClient are called with a RequestEvent for
+every attempt of every request sent through send() or the fluent client:
+
+on_request
+    before the attempt is sent
+on_response
+    once a response has been received, whatever its status
+on_error
+    when the attempt failed, either without a response (connection error,
+    timeout, open circuit) or with an error status
+
+Callbacks registered for 'circuit' are called with a
+sendgrid.circuit_breaker.CircuitStateChange whenever a circuit of the
+client's circuit breaker changes state.
+
+An exception raised by a callback is logged and does not affect the request.
+"""
+
+import logging
+import time
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Highest resolution clock available, for measuring durations.
+clock = getattr(time, 'perf_counter', time.time)
+
+PHASES = ('build', 'serialize', 'connect', 'ttfb', 'total')
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestEvent(object):
+    """One attempt of an API request, as seen by the hooks.
+
+    `timings` holds the duration in seconds of each phase that is known at
+    the time the hook is called:
+
+    build
+        building the URL and headers of the request
+    serialize
+        encoding the request body
+    connect
+        opening the connection, 0 when a pooled connection was reused
+    ttfb
+        from sending the request to receiving the response headers
+    total
+        from the start of the call (including earlier attempts and backoff
+        delays) to the end of this attempt
+    """
+
+    def __init__(self, method, url, request_bytes, attempt=1, timings=None):
+        """
+        :param method: HTTP verb
+        :type method: string
+        :param url: requested URL
+        :type url: string
+        :param request_bytes: size of the request body as sent, in bytes
+        :type request_bytes: integer
+        :param attempt: number of the attempt, starting at 1
+        :type attempt: integer
+        :param timings: phase durations known so far, in seconds
+        :type timings: dict
+        """
+        self.method = method
+        self.url = url
+        self.request_bytes = request_bytes
+        self.attempt = attempt
+        self.timings = dict(timings or {})
+        self.status_code = None
+        self.headers = None
+        self.response_bytes = None
+        self.error = None
+        self.retrying = False
+        # State of the request's circuit, if the client has a circuit breaker.
+        self.circuit_state = None
+
+    @property
+    def path(self):
+        """The endpoint path, e.g. /v3/mail/send.
+
+        :rtype: string
+        """
+        return urlsplit(self.url).path
+
+    @property
+    def rate_limit(self):
+        """X-RateLimit-Limit, -Remaining and -Reset of the response, as
+        integers; empty if there was no response.
+
+        :rtype: dict
+        """
+        if self.headers is None:
+            return {}
+        return {
+            'limit': _int_or_none(self.headers.get('X-RateLimit-Limit')),
+            'remaining': _int_or_none(
+                self.headers.get('X-RateLimit-Remaining')),
+            'reset': _int_or_none(self.headers.get('X-RateLimit-Reset')),
+        }
+
+    def __repr__(self):
+        return '<RequestEvent {} {} attempt={} status={}>'.format(
+            self.method, self.path, self.attempt, self.status_code)
+
+
+class Hooks(object):
+    """Callbacks registered per lifecycle event."""
+
+    EVENTS = ('request', 'response', 'error', 'circuit')
+
+    def __init__(self, on_request=None, on_response=None, on_error=None):
+        self.callbacks = dict((event, []) for event in self.EVENTS)
+        for event, callback in (('request', on_request),
+                                ('response', on_response),
+                                ('error', on_error)):
+            if callback is not None:
+                self.add(event, callback)
+
+    def __bool__(self):
+        return any(self.callbacks.values())
+
+    __nonzero__ = __bool__
+
+    def add(self, event, callback):
+        """Register `callback` to be called with a RequestEvent (or, for
+        'circuit', a CircuitStateChange) on `event`.
+
+        :param event: 'request', 'response', 'error' or 'circuit'
+        :type event: string
+        :type callback: callable
+        """
+        if event not in self.callbacks:
+            raise ValueError('event must be one of {}'.format(self.EVENTS))
+        self.callbacks[event].append(callback)
+
+    def remove(self, event, callback):
+        """Unregister a callback added with add()."""
+        self.callbacks[event].remove(callback)
+
+    def fire(self, event, data):
+        for callback in self.callbacks[event]:
+            try:
+                callback(data)
+            except Exception:
+                logger.exception('Error in %s hook %r', event, callback)
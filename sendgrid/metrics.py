@@ -0,0 +1,302 @@
+"""
+In-process metrics exported in the Prometheus text format.
+
+A Registry holds counters and fixed-bucket histograms; Registry.expose()
+renders them for a Prometheus scrape.  SendGridAPIClient(metrics=True) records
+its requests in the default REGISTRY, and the Inbound Parse app serves it on
+/metrics.  Nothing is recorded unless metrics are enabled, so a disabled
+registry costs nothing on the request path.
+"""
+
+import math
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, from a fast API call to a slow one.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+# Bytes, from a bare notification to a message with large attachments.
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\').replace('\n', r'\n')
+            .replace('"', r'\"'))
+
+
+def _format_value(value):
+    if value == math.floor(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value))
+                          for name, value in pairs) + '}'
+
+
+class _Metric(object):
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames) or not all(
+                name in labels for name in self.labelnames):
+            raise ValueError('{} expects labels {}'.format(self.name,
+                                                           self.labelnames))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def expose(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} {}'.format(self.name, self.kind)]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._samples(items))
+        return lines
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter of the given labels by `amount`."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Current value for the given labels.
+
+        :rtype: number
+        """
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, items):
+        for key, value in items:
+            yield '{}{} {}'.format(self.name, _labels(self.labelnames, key),
+                                   _format_value(value))
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets, per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=LATENCY_BUCKETS):
+        """
+        :param buckets: upper bounds of the buckets, in increasing order; a
+            +Inf bucket is always added
+        :type buckets: tuple of numbers
+        """
+        super(Histogram, self).__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Record one observation for the given labels."""
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1),
+                                             0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        """Number of observations for the given labels.
+
+        :rtype: integer
+        """
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _samples(self, items):
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                yield '{}_bucket{} {}'.format(
+                    self.name,
+                    _labels(self.labelnames, key, [('le', le)]),
+                    cumulative)
+            labels = _labels(self.labelnames, key)
+            yield '{}_sum{} {}'.format(self.name, labels, _format_value(total))
+            yield '{}_count{} {}'.format(self.name, labels, count)
+
+
+class Registry(object):
+    """A set of metrics exported together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation,
+                                                   labelnames, **kwargs)
+            elif not isinstance(metric, cls) or (metric.labelnames !=
+                                                 tuple(labelnames)):
+                raise ValueError(
+                    'Metric {} is already registered differently'.format(name))
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """The counter registered under `name`, created if needed.
+
+        :rtype: Counter
+        """
+        return self._get(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=LATENCY_BUCKETS):
+        """The histogram registered under `name`, created if needed.
+
+        :rtype: Histogram
+        """
+        return self._get(Histogram, name, documentation, labelnames,
+                         buckets=buckets)
+
+    def get(self, name):
+        """The metric registered under `name`, or None."""
+        return self._metrics.get(name)
+
+    def clear(self):
+        """Reset every metric to zero."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    def expose(self):
+        """All metrics in the Prometheus text exposition format.
+
+        :rtype: string
+        """
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].expose())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def endpoint_label(path):
+    """The path of an API call with its identifiers replaced by `{id}`, so
+    that it can be used as a label of bounded cardinality:
+    /v3/templates/3f2a9c/versions -> /v3/templates/{id}/versions
+
+    Segments holding a digit or an @ (ids, email addresses, dates) after the
+    version are treated as identifiers.
+
+    :rtype: string
+    """
+    segments = path.strip('/').split('/')
+    for i, segment in enumerate(segments):
+        if i > 0 and (any(c.isdigit() for c in segment) or '@' in segment):
+            segments[i] = '{id}'
+    return '/' + '/'.join(segments)
+
+
+class ClientMetrics(object):
+    """Records the requests of a SendGridAPIClient through its hooks:
+        sendgrid_requests_total{endpoint,method,status}
+        sendgrid_request_duration_seconds{endpoint,method}
+        sendgrid_request_bytes_total{endpoint,method}
+        sendgrid_retries_total{endpoint,method}
+        sendgrid_rate_limited_total{endpoint}
+        sendgrid_request_errors_total{endpoint,method,error}
+        sendgrid_circuit_transitions_total{endpoint,state}
+    """
+
+    def __init__(self, registry=REGISTRY):
+        self.requests = registry.counter(
+            'sendgrid_requests_total',
+            'API responses received, by endpoint, method and status.',
+            ('endpoint', 'method', 'status'))
+        self.duration = registry.histogram(
+            'sendgrid_request_duration_seconds',
+            'Time from the start of an API call to its response.',
+            ('endpoint', 'method'))
+        self.bytes_sent = registry.counter(
+            'sendgrid_request_bytes_total',
+            'Request body bytes sent to the API.',
+            ('endpoint', 'method'))
+        self.retries = registry.counter(
+            'sendgrid_retries_total',
+            'Failed attempts that were retried.',
+            ('endpoint', 'method'))
+        self.rate_limited = registry.counter(
+            'sendgrid_rate_limited_total',
+            'Requests rejected with 429 Too Many Requests.',
+            ('endpoint',))
+        self.errors = registry.counter(
+            'sendgrid_request_errors_total',
+            'Attempts that failed without a response.',
+            ('endpoint', 'method', 'error'))
+        self.circuit_transitions = registry.counter(
+            'sendgrid_circuit_transitions_total',
+            'Circuit breaker state changes, by endpoint and new state.',
+            ('endpoint', 'state'))
+
+    def install(self, client):
+        """Register the hooks updating these metrics on `client`.
+
+        :type client: sendgrid.SendGridAPIClient
+        """
+        client.add_hook('response', self.on_response)
+        client.add_hook('error', self.on_error)
+        client.add_hook('circuit', self.on_circuit)
+
+    def on_response(self, event):
+        endpoint = endpoint_label(event.path)
+        method = event.method
+        self.requests.inc(endpoint=endpoint, method=method,
+                          status=event.status_code)
+        self.duration.observe(event.timings.get('total', 0.0),
+                              endpoint=endpoint, method=method)
+        self.bytes_sent.inc(event.request_bytes, endpoint=endpoint,
+                            method=method)
+        if event.status_code == 429:
+            self.rate_limited.inc(endpoint=endpoint)
+        if event.retrying:
+            self.retries.inc(endpoint=endpoint, method=method)
+
+    def on_error(self, event):
+        if event.status_code is not None:
+            # Already recorded by on_response.
+            return
+        endpoint = endpoint_label(event.path)
+        self.errors.inc(endpoint=endpoint, method=event.method,
+                        error=type(getattr(event.error, 'reason', event.error)
+                                   ).__name__)
+        if event.retrying:
+            self.retries.inc(endpoint=endpoint, method=event.method)
+
+    def on_circuit(self, change):
+        self.circuit_transitions.inc(endpoint=change.scope, state=change.state)
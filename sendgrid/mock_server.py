@@ -0,0 +1,326 @@
+"""
+A local stand-in for the SendGrid v3 API, for load and latency testing.
+
+Every /v3 route is accepted: unlike Prism, requests are not checked against
+the API spec, so it does not replace Prism for testing the endpoints
+themselves.  mail/send bodies are validated like the API does and answered
+with 202, other requests get the usual status of their method (200 for GET,
+PUT and PATCH, 201 for POST, 204 for DELETE) with their JSON body echoed
+back.  As with Prism, an X-Mock request header selects the
+status of the response.  Latency, errors and rate limiting can be injected:
+    python -m sendgrid.mock_server --port 4010 --latency 0.05 --jitter 0.02 \\
+        --error-rate 0.01 --rate-limit 600 --throttle-rate 0.005
+
+and the client pointed at it:
+    sg = SendGridAPIClient(apikey='SG.test', host='http://localhost:4010')
+"""
+
+import argparse
+import collections
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit
+
+from .dryrun import decode_body, validate_mail_payload
+
+
+DEFAULT_STATUSES = {'GET': 200, 'POST': 201, 'PUT': 200, 'PATCH': 200,
+                    'DELETE': 204}
+
+REASONS = {401: 'authorization required',
+           404: 'resource not found',
+           429: 'too many requests',
+           500: 'internal server error',
+           502: 'bad gateway',
+           503: 'service unavailable'}
+
+
+def _errors(message, field=None):
+    return {'errors': [{'message': message, 'field': field, 'help': None}]}
+
+
+class MockConfig(object):
+    """Behaviour of the mock server."""
+
+    def __init__(self,
+                 latency=0.0,
+                 jitter=0.0,
+                 error_rate=0.0,
+                 error_statuses=(500, 503),
+                 rate_limit=None,
+                 window=1.0,
+                 throttle_rate=0.0,
+                 validate=True,
+                 require_auth=True,
+                 seed=None):
+        """
+        :param latency: seconds every response is delayed by
+        :type latency: float
+        :param jitter: upper bound of a random extra delay, in seconds
+        :type jitter: float
+        :param error_rate: fraction of requests failed with one of
+            `error_statuses`
+        :type error_rate: float
+        :param error_statuses: statuses of the injected errors
+        :type error_statuses: tuple of integers
+        :param rate_limit: requests allowed per endpoint and window, reported
+            in X-RateLimit-* headers and enforced with 429; unlimited if None
+        :type rate_limit: integer
+        :param window: length of a rate limit window, in seconds
+        :type window: float
+        :param throttle_rate: fraction of requests answered with 429 regardless
+            of the rate limit
+        :type throttle_rate: float
+        :param validate: reject invalid mail/send bodies with 400
+        :type validate: bool
+        :param require_auth: answer requests without a bearer token with 401
+        :type require_auth: bool
+        :param seed: seed of the random injection, for reproducible runs
+        :type seed: integer
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.rate_limit = rate_limit
+        self.window = window
+        self.throttle_rate = throttle_rate
+        self.validate = validate
+        self.require_auth = require_auth
+        self.random = random.Random(seed)
+
+
+class MockSendGridHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SendGridMock/1.0'
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, payload, headers = self.server.respond(
+            self.command, self.path, dict(self.headers.items()), body)
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+
+        self.send_response(status)
+        if data:
+            self.send_header('Content-Type', 'application/json')
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class MockSendGridServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP/1.1 server answering like the v3 API.
+
+    Connections are kept alive and served by one thread each, so the number
+    of concurrent clients is only bounded by the listen backlog.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, address=('127.0.0.1', 4010), config=None, verbose=False):
+        """
+        :param address: (host, port) to listen on; port 0 picks a free port
+        :type address: tuple
+        :param config: injected behaviour
+        :type config: MockConfig
+        :param verbose: log every request to stderr
+        :type verbose: bool
+        """
+        HTTPServer.__init__(self, address, MockSendGridHandler)
+        self.config = config or MockConfig()
+        self.verbose = verbose
+        self.stats = collections.Counter()
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(*self.server_address[:2])
+
+    def handle_error(self, request, client_address):
+        # Clients closing keep-alive connections are not worth a traceback.
+        if self.verbose:
+            HTTPServer.handle_error(self, request, client_address)
+
+    def _rate_limit_headers(self, path):
+        config = self.config
+        now = time.time()
+        with self._lock:
+            reset, remaining = self._windows.get(path, (0, 0))
+            if now >= reset:
+                reset = (int(now // config.window) + 1) * config.window
+                remaining = config.rate_limit
+            allowed = remaining > 0
+            if allowed:
+                remaining -= 1
+            self._windows[path] = (reset, remaining)
+        headers = [('X-RateLimit-Limit', str(config.rate_limit)),
+                   ('X-RateLimit-Remaining', str(remaining)),
+                   ('X-RateLimit-Reset', str(int(reset)))]
+        return allowed, headers
+
+    def _injected(self):
+        """A status picked by the random error and throttle injection."""
+        config = self.config
+        with self._lock:
+            draw = config.random.random()
+            if draw < config.throttle_rate:
+                return 429
+            if draw < config.throttle_rate + config.error_rate:
+                return config.random.choice(config.error_statuses)
+        return None
+
+    def _delay(self):
+        config = self.config
+        delay = config.latency
+        if config.jitter:
+            with self._lock:
+                delay += config.random.uniform(0, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def respond(self, method, target, headers, body):
+        """Compute the response to a request.
+
+        :return: status, JSON-compatible payload (None for no body) and
+            extra headers
+        :rtype: tuple
+        """
+        self._delay()
+        status, payload, extra = self._respond(method, target, headers, body)
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[status] += 1
+        return status, payload, extra
+
+    def _respond(self, method, target, headers, body):
+        config = self.config
+        headers = dict((name.lower(), value) for name, value in headers.items())
+        path = urlsplit(target).path.rstrip('/')
+        extra = []
+
+        if not path.startswith('/v3/'):
+            return 404, _errors(REASONS[404]), extra
+        if config.require_auth and not headers.get(
+                'authorization', '').startswith('Bearer '):
+            return 401, _errors(REASONS[401]), extra
+
+        if config.rate_limit is not None:
+            allowed, extra = self._rate_limit_headers(path)
+            if not allowed:
+                return 429, _errors(REASONS[429]), extra
+        injected = self._injected()
+        if injected is not None:
+            if injected == 429:
+                extra.append(('Retry-After', '1'))
+            return injected, _errors(REASONS.get(injected, 'error')), extra
+
+        try:
+            payload = decode_body(body, headers)
+        except ValueError:
+            return 400, _errors('Bad Request: the body is not valid JSON.'), extra
+
+        if 'x-mock' in headers:
+            status = int(headers['x-mock'])
+        elif method == 'POST' and path == '/v3/mail/send':
+            if config.validate:
+                errors = validate_mail_payload(payload)
+                if errors:
+                    return 400, {'errors': errors}, extra
+            extra.append(('X-Message-Id', uuid.uuid4().hex))
+            return 202, None, extra
+        else:
+            status = DEFAULT_STATUSES.get(method, 200)
+
+        if status in (202, 204) or status < 200:
+            return status, None, extra
+        if status >= 400:
+            return status, _errors(REASONS.get(status, 'error')), extra
+        if method == 'GET' or payload is None:
+            return status, {}, extra
+        return status, payload, extra
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sendgrid.mock_server',
+        description='Local stand-in for the SendGrid v3 API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4010)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds every response is delayed by')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='upper bound of a random extra delay, in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of requests answered with a 5xx error')
+    parser.add_argument('--error-status', type=int, action='append',
+                        help='status of the injected errors (repeatable, '
+                             'default: 500 and 503)')
+    parser.add_argument('--rate-limit', type=int, default=None,
+                        help='requests allowed per endpoint and window')
+    parser.add_argument('--window', type=float, default=1.0,
+                        help='rate limit window, in seconds')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='fraction of requests answered with 429')
+    parser.add_argument('--no-validate', action='store_true',
+                        help='accept invalid mail/send bodies')
+    parser.add_argument('--no-auth', action='store_true',
+                        help='accept requests without a bearer token')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true',
+                        help='log every request')
+    args = parser.parse_args(argv)
+
+    config = MockConfig(latency=args.latency,
+                        jitter=args.jitter,
+                        error_rate=args.error_rate,
+                        error_statuses=args.error_status or (500, 503),
+                        rate_limit=args.rate_limit,
+                        window=args.window,
+                        throttle_rate=args.throttle_rate,
+                        validate=not args.no_validate,
+                        require_auth=not args.no_auth,
+                        seed=args.seed)
+    server = MockSendGridServer((args.host, args.port), config,
+                                verbose=args.verbose)
+    sys.stderr.write('Mock SendGrid API listening on {}\n'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sys.stderr.write('{} requests: {}\n'.format(
+            server.stats['requests'],
+            ', '.join('{} x {}'.format(count, status)
+                      for status, count in sorted(server.stats.items(),
+                                                  key=lambda item: str(item[0]))
+                      if status != 'requests')))
+
+
+if __name__ == '__main__':
+    main()
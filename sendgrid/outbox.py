@@ -0,0 +1,384 @@
+"""
+Durable local outbox for mail sends.
+
+Outbox persists serialized Mail payloads to a SQLite database before they are
+sent, and drains it with worker threads through a SendGridAPIClient:
+    outbox = Outbox(sg, 'outbox.db', workers=8)
+    outbox.start()
+    for mail in campaign:
+        outbox.enqueue(mail)
+    outbox.join()
+    outbox.stop()
+
+enqueue() only writes to the local database, so producers never wait on the
+network.  A message is removed once the API has accepted it, so delivery is
+at-least-once: after a crash, messages that were being sent are sent again
+when the outbox is reopened, and the others simply resume.  Workers lease the
+messages they claim and renew the lease on the rest of the batch before each
+send; a single send outlasting the lease may still be repeated by another
+worker.
+
+Messages rejected by the API with a 4xx status (other than 429), or still
+failing after `max_attempts`, are moved to a dead letter table instead of
+being retried forever.
+"""
+
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    body BLOB NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_available ON outbox (available_at, id);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    body BLOB NOT NULL,
+    enqueued_at REAL NOT NULL,
+    failed_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    status INTEGER,
+    error TEXT
+);
+"""
+
+
+def _encode(message):
+    if isinstance(message, bytes):
+        return message
+    return message.to_json_bytes()
+
+
+class DeadLetter(object):
+    """A message that could not be delivered."""
+
+    def __init__(self, id, body, enqueued_at, failed_at, attempts, status,
+                 error):
+        self.id = id
+        self.body = bytes(body)
+        self.enqueued_at = enqueued_at
+        self.failed_at = failed_at
+        self.attempts = attempts
+        self.status = status
+        self.error = error
+
+    def __repr__(self):
+        return '<DeadLetter #{} status={} error={!r}>'.format(
+            self.id, self.status, self.error)
+
+
+class Outbox(object):
+    """SQLite-backed queue of messages drained by worker threads."""
+
+    def __init__(self, client, path, workers=4, batch_size=50, lease=300.0,
+                 max_attempts=10, base_delay=1.0, max_delay=300.0,
+                 poll_interval=0.1, synchronous='NORMAL'):
+        """
+        :param client: client the messages are sent with
+        :type client: sendgrid.SendGridAPIClient
+        :param path: SQLite database file, created if needed
+        :type path: string
+        :param workers: number of sending threads
+        :type workers: integer
+        :param batch_size: messages claimed by a worker at a time
+        :type batch_size: integer
+        :param lease: seconds after which a claimed message that was neither
+            acknowledged nor released is handed to another worker; renewed
+            before each message of a batch is sent
+        :type lease: float
+        :param max_attempts: attempts after which a failing message is moved
+            to the dead letters
+        :type max_attempts: integer
+        :param base_delay: delay before retrying a failed message, in
+            seconds; doubled on every further attempt
+        :type base_delay: float
+        :param max_delay: upper bound of the retry delay, in seconds
+        :type max_delay: float
+        :param poll_interval: seconds an idle worker waits before looking for
+            new messages
+        :type poll_interval: float
+        :param synchronous: SQLite synchronous pragma. NORMAL survives a crash
+            of the process; FULL also survives a crash of the machine, at
+            the cost of an fsync per enqueue()
+        :type synchronous: string
+        """
+        self.client = client
+        self.path = path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous={}'.format(synchronous))
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        # Messages claimed before a crash are available again right away.
+        self._execute('UPDATE outbox SET available_at = 0 '
+                      'WHERE available_at > ? AND last_error IS NULL',
+                      (time.time(),))
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def enqueue(self, message):
+        """Persist a message to be sent.
+
+        :param message: the message, or its serialized request body
+        :type message: Mail or bytes
+        :return: id of the queued message
+        :rtype: integer
+        """
+        body = _encode(message)
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT INTO outbox (body, enqueued_at) VALUES (?, ?)',
+                (sqlite3.Binary(body), time.time()))
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def enqueue_many(self, messages):
+        """Persist many messages in a single transaction.
+
+        :type messages: iterable of Mail or bytes
+        :return: number of queued messages
+        :rtype: integer
+        """
+        now = time.time()
+        rows = [(sqlite3.Binary(_encode(message)), now)
+                for message in messages]
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                self._db.executemany(
+                    'INSERT INTO outbox (body, enqueued_at) VALUES (?, ?)',
+                    rows)
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+        self._wakeup.set()
+        return len(rows)
+
+    def pending(self):
+        """Number of messages not yet accepted by the API.
+
+        :rtype: integer
+        """
+        return self._execute('SELECT COUNT(*) FROM outbox')[0][0]
+
+    def dead_letters(self):
+        """Messages that could not be delivered.
+
+        :rtype: list of DeadLetter
+        """
+        return [DeadLetter(*row) for row in self._execute(
+            'SELECT id, body, enqueued_at, failed_at, attempts, status, error '
+            'FROM dead_letters ORDER BY id')]
+
+    def requeue_dead_letters(self):
+        """Queue the dead letters again, e.g. once the cause of their failure
+        has been fixed.
+
+        :return: number of requeued messages
+        :rtype: integer
+        """
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            count = self._db.execute(
+                'INSERT INTO outbox (body, enqueued_at) '
+                'SELECT body, enqueued_at FROM dead_letters ORDER BY id'
+            ).rowcount
+            self._db.execute('DELETE FROM dead_letters')
+            self._db.execute('COMMIT')
+        self._wakeup.set()
+        return count
+
+    def _claim(self):
+        """Lease the next batch of available messages.
+
+        :return: the end of the lease and the leased messages
+        :rtype: (float, list of (id, body, attempts))
+        """
+        now = time.time()
+        leased_until = now + self.lease
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._db.execute(
+                    'SELECT id, body, attempts FROM outbox '
+                    'WHERE available_at <= ? ORDER BY available_at, id '
+                    'LIMIT ?', (now, self.batch_size)).fetchall()
+                if rows:
+                    self._db.executemany(
+                        'UPDATE outbox SET available_at = ?, '
+                        'attempts = attempts + 1, last_error = NULL '
+                        'WHERE id = ?',
+                        [(leased_until, row[0]) for row in rows])
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+        return leased_until, rows
+
+    def _renew(self, message_ids, leased_until):
+        """Extend the lease on claimed messages.
+
+        Messages whose lease expired and that were claimed by another worker
+        in the meantime are left alone.
+
+        :return: the new end of the lease and the ids still leased
+        :rtype: (float, set of integer)
+        """
+        renewed = time.time() + self.lease
+        ids = ','.join('?' * len(message_ids))
+        with self._lock:
+            self._db.execute(
+                'UPDATE outbox SET available_at = ? '
+                'WHERE available_at = ? AND id IN ({})'.format(ids),
+                [renewed, leased_until] + list(message_ids))
+            held = self._db.execute(
+                'SELECT id FROM outbox '
+                'WHERE available_at = ? AND id IN ({})'.format(ids),
+                [renewed] + list(message_ids)).fetchall()
+        return renewed, set(row[0] for row in held)
+
+    def _ack(self, message_id):
+        self._execute('DELETE FROM outbox WHERE id = ?', (message_id,))
+
+    def _retry_delay(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def _fail(self, message_id, attempts, error, leased_until):
+        """Record the failure of the `attempts`-th attempt to send a message,
+        unless another worker has claimed it since."""
+        status = getattr(error, 'status_code', None)
+        permanent = status is not None and 400 <= status < 500 and status != 429
+        if permanent or attempts >= self.max_attempts:
+            with self._lock:
+                self._db.execute('BEGIN IMMEDIATE')
+                self._db.execute(
+                    'INSERT INTO dead_letters (id, body, enqueued_at, '
+                    'failed_at, attempts, status, error) '
+                    'SELECT id, body, enqueued_at, ?, ?, ?, ? FROM outbox '
+                    'WHERE id = ? AND available_at = ?',
+                    (time.time(), attempts, status, repr(error),
+                     message_id, leased_until))
+                self._db.execute('DELETE FROM outbox '
+                                 'WHERE id = ? AND available_at = ?',
+                                 (message_id, leased_until))
+                self._db.execute('COMMIT')
+            logger.warning('Outbox message %d failed permanently: %r',
+                           message_id, error)
+            return
+        self._execute(
+            'UPDATE outbox SET available_at = ?, last_error = ? '
+            'WHERE id = ? AND available_at = ?',
+            (time.time() + self._retry_delay(attempts), repr(error),
+             message_id, leased_until))
+
+    def process_batch(self):
+        """Send one batch of available messages in the calling thread.
+
+        :return: number of messages processed
+        :rtype: integer
+        """
+        leased_until, rows = self._claim()
+        ids = [row[0] for row in rows]
+        for i, (message_id, body, attempts) in enumerate(rows):
+            # Renew the lease so that a batch taking longer than `lease` is
+            # not handed to another worker halfway through.
+            leased_until, held = self._renew(ids[i:], leased_until)
+            if message_id not in held:
+                continue
+            try:
+                self.client._post_mail(bytes(body))
+            except Exception as error:
+                self._fail(message_id, attempts + 1, error, leased_until)
+            else:
+                self._ack(message_id)
+                with self._lock:
+                    self.sent += 1
+        return len(rows)
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception:
+                logger.exception('Outbox worker error')
+                processed = 0
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def start(self):
+        """Start the worker threads."""
+        self._stopping.clear()
+        for i in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._work,
+                                      name='sendgrid-outbox-{}'.format(i))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self, timeout=None):
+        """Wait until every queued message has been accepted or moved to the
+        dead letters.
+
+        :param timeout: seconds to wait at most
+        :type timeout: float
+        :return: whether the outbox is empty
+        :rtype: bool
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while self.pending():
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def stop(self, timeout=None):
+        """Stop the workers once they have finished their current batch.
+
+        Messages left in the outbox are sent when it is started again.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [thread for thread in self._threads
+                         if thread.is_alive()]
+
+    def close(self):
+        """Stop the workers and close the database."""
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,195 @@
+"""
+Lazy iteration over paginated v3 list endpoints.
+
+List endpoints page their results in one of three ways:
+
+offset
+    `offset`/`limit` query parameters, e.g. suppression/bounces
+page
+    1-based `page`/`page_size` query parameters, e.g. contactdb/recipients
+token
+    `page_size`/`page_token`, with the token of the next page returned in
+    `_metadata.next`, e.g. templates
+
+paginate() hides the difference and yields the items one by one, holding at
+most a few pages in memory at a time.
+"""
+
+try:
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import parse_qs, urlsplit
+
+
+STYLES = ('offset', 'page', 'token')
+
+
+def guess_style(endpoint):
+    """The pagination style used by a fluent endpoint, from its path.
+
+    :param endpoint: fluent endpoint, e.g. sg.client.suppression.bounces
+    :type endpoint: python_http_client.Client
+    :rtype: string
+    """
+    path = [str(part) for part in endpoint._url_path]
+    if path and path[0] == 'contactdb':
+        return 'page'
+    if path and path[0] in ('templates', 'designs'):
+        return 'token'
+    return 'offset'
+
+
+def page_items(body, items_key=None):
+    """The list of items held by a decoded page.
+
+    A page is either a JSON array, or an object holding the items in
+    `items_key` or, when not given, in its only array member.
+
+    :rtype: list
+    """
+    if body is None:
+        return []
+    if isinstance(body, list):
+        return body
+    if items_key is not None:
+        return body.get(items_key) or []
+    lists = [value for value in body.values() if isinstance(value, list)]
+    if len(lists) == 1:
+        return lists[0]
+    if not lists:
+        return []
+    raise ValueError(
+        'Cannot tell which member of the page holds the items; '
+        'pass items_key, one of {}'.format(
+            sorted(key for key, value in body.items()
+                   if isinstance(value, list))))
+
+
+def _next_token(body):
+    try:
+        next_url = body['_metadata']['next']
+    except (KeyError, TypeError):
+        return None
+    tokens = parse_qs(urlsplit(next_url).query).get('page_token')
+    return tokens[0] if tokens else None
+
+
+def _page_params(style, number, offset, page_size, query_params):
+    params = dict(query_params or {})
+    if style == 'offset':
+        params.update(offset=offset, limit=page_size)
+    else:
+        params.update(page=number + 1, page_size=page_size)
+    return params
+
+
+def _fetch(endpoint, params, items_key):
+    return page_items(endpoint.get(query_params=params).to_dict, items_key)
+
+
+def _paginate_numbered(endpoint, style, page_size, prefetch, query_params,
+                       items_key):
+    # Endpoints may return fewer items per page than requested, so a short
+    # page does not mean the listing is over: only an empty one does, and
+    # offsets advance by the number of items actually received.
+    items = _fetch(endpoint, _page_params(style, 0, 0, page_size, query_params),
+                   items_key)
+    if not items:
+        return
+    for item in items:
+        yield item
+    number, offset = 1, len(items)
+
+    if not prefetch:
+        while True:
+            items = _fetch(
+                endpoint,
+                _page_params(style, number, offset, page_size, query_params),
+                items_key)
+            if not items:
+                return
+            for item in items:
+                yield item
+            number += 1
+            offset += len(items)
+
+    # Page parameters do not depend on earlier pages, so the next `prefetch`
+    # pages can be requested while the current one is being consumed.  Every
+    # page but the last is assumed to be as long as the first.
+    stride = offset
+    from concurrent import futures
+    executor = futures.ThreadPoolExecutor(max_workers=prefetch + 1)
+    pending = []
+    try:
+        while True:
+            while len(pending) <= prefetch:
+                params = _page_params(style, number, offset, page_size,
+                                      query_params)
+                pending.append(
+                    executor.submit(_fetch, endpoint, params, items_key))
+                number += 1
+                offset += stride
+            items = pending.pop(0).result()
+            if not items:
+                return
+            for item in items:
+                yield item
+    finally:
+        # Pages past the end are never read; their errors are irrelevant.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _paginate_token(endpoint, page_size, query_params, items_key):
+    params = dict(query_params or {}, page_size=page_size)
+    while True:
+        body = endpoint.get(query_params=params).to_dict
+        for item in page_items(body, items_key):
+            yield item
+        token = _next_token(body)
+        if token is None or token == params.get('page_token'):
+            return
+        params['page_token'] = token
+
+
+def paginate(endpoint, page_size=500, prefetch=0, style=None,
+             query_params=None, items_key=None):
+    """Iterate over every item of a paginated list endpoint.
+
+    Pages are requested lazily as the items are consumed, so memory use is
+    bounded by `prefetch + 1` pages regardless of the size of the listing:
+        for bounce in paginate(sg.client.suppression.bounces, page_size=500):
+            ...
+
+    :param endpoint: fluent endpoint, e.g. sg.client.suppression.bounces
+    :type endpoint: python_http_client.Client
+    :param page_size: number of items requested per page
+    :type page_size: integer
+    :param prefetch: number of pages requested ahead, concurrently, to hide
+        the round-trip latency. Ignored by token-paginated endpoints, whose
+        next page is only known once the current one has been received
+    :type prefetch: integer
+    :param style: 'offset', 'page' or 'token'; guessed from the endpoint path
+        when not given
+    :type style: string
+    :param query_params: extra query parameters sent with every page, e.g.
+        {'start_time': 1443651141}
+    :type query_params: dictionary
+    :param items_key: member of the page object holding the items, e.g.
+        'recipients'; only needed when a page holds several arrays
+    :type items_key: string
+    :rtype: generator
+    """
+    if page_size < 1:
+        raise ValueError('page_size must be at least 1')
+    if prefetch < 0:
+        raise ValueError('prefetch must not be negative')
+    style = style or guess_style(endpoint)
+    if style not in STYLES:
+        raise ValueError('style must be one of {}'.format(STYLES))
+    if style == 'token':
+        return _paginate_token(endpoint, page_size, query_params, items_key)
+    return _paginate_numbered(endpoint, style, page_size, prefetch,
+                              query_params, items_key)
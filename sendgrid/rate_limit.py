@@ -0,0 +1,174 @@
+"""
+Client-side scheduling driven by the v3 API rate limit headers.
+
+Every response carries X-RateLimit-Limit, X-RateLimit-Remaining and
+X-RateLimit-Reset for the endpoint that was called.  RateLimiter keeps a token
+bucket per endpoint from those headers and spaces requests out so a bulk job
+runs at the highest sustainable rate instead of bursting into 429 responses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+
+def _int_header(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket(object):
+    """Request budget of a single endpoint for the current rate limit window."""
+
+    def __init__(self, limit, remaining, reset):
+        """
+        :param limit: requests allowed per window
+        :type limit: integer
+        :param remaining: requests left in the current window
+        :type remaining: integer
+        :param reset: unix timestamp at which the window resets
+        :type reset: float
+        """
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.next_slot = 0.0
+        # Length of a window, learned from successive reset times.
+        self.window = None
+
+    def update(self, limit, remaining, reset):
+        if reset != self.reset:
+            if reset > self.reset:
+                window = reset - self.reset
+                if self.window is None or window < self.window:
+                    self.window = window
+            self.limit, self.remaining, self.reset = limit, remaining, reset
+        else:
+            # Responses can arrive out of order; the smallest budget reported
+            # for the current window is the most recent one.
+            self.limit = limit
+            self.remaining = min(self.remaining, remaining)
+
+    def reserve(self, now, headroom):
+        """Take one token and return how long to wait before using it.
+
+        While more than `headroom` of the budget is left, requests go out
+        immediately.  Below that, the remaining budget is spread evenly over
+        the rest of the window, and once it is exhausted requests wait for the
+        window to reset and are spread over the next one.
+
+        :rtype: float
+        """
+        if now >= self.reset:
+            # Window is over; assume a full budget until told otherwise.
+            self.remaining = self.limit
+            self.reset = now + (self.window or 1.0)
+            self.next_slot = 0.0
+
+        if self.remaining <= 0:
+            # Queue behind the waiters already scheduled for the next window
+            # instead of releasing all of them at the reset.
+            slot = max(now, self.next_slot, self.reset)
+            self.next_slot = slot + (self.window or 1.0) / max(self.limit, 1)
+            return slot - now
+
+        if self.remaining > self.limit * headroom:
+            self.remaining -= 1
+            return 0.0
+
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + max(self.reset - slot, 0.0) / self.remaining
+        self.remaining -= 1
+        return slot - now
+
+
+class RateLimiter(object):
+    """Thread-safe per-endpoint scheduler fed by X-RateLimit-* headers.
+
+    A single RateLimiter may be shared by several clients using the same API
+    key so that they draw on one budget.
+    """
+
+    def __init__(self, headroom=0.5, clock=time.time, sleep=time.sleep,
+                 max_endpoints=1024):
+        """
+        :param headroom: fraction of an endpoint's budget that may be used in a
+            burst before requests are spaced out
+        :type headroom: float
+        :param max_endpoints: number of endpoints whose budget is tracked; the
+            least recently updated one is forgotten beyond that
+        :type max_endpoints: integer
+        :param clock: returns the current unix time
+        :type clock: callable
+        :param sleep: blocks for the given number of seconds
+        :type sleep: callable
+        """
+        self.headroom = headroom
+        self.clock = clock
+        self.sleep = sleep
+        self.max_endpoints = max_endpoints
+        self.buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint(url):
+        """The key rate limits are tracked under: the URL path without query.
+
+        :rtype: string
+        """
+        return urlsplit(url).path.rstrip('/')
+
+    def reserve(self, url):
+        """Reserve a slot for a request to `url`.
+
+        :return: seconds to wait before sending the request
+        :rtype: float
+        """
+        with self._lock:
+            bucket = self.buckets.get(self.endpoint(url))
+            if bucket is None:
+                return 0.0
+            return bucket.reserve(self.clock(), self.headroom)
+
+    def acquire(self, url):
+        """Block until a request to `url` may be sent."""
+        delay = self.reserve(url)
+        if delay > 0:
+            self.sleep(delay)
+
+    def update(self, url, headers, status_code=None):
+        """Record the rate limit headers returned for a request to `url`.
+
+        :param headers: response headers
+        :type headers: mapping with case-insensitive get, e.g. HTTPMessage
+        :param status_code: response status; a 429 empties the bucket
+        :type status_code: integer
+        """
+        if headers is None:
+            return
+        limit = _int_header(headers, 'X-RateLimit-Limit')
+        remaining = _int_header(headers, 'X-RateLimit-Remaining')
+        reset = _int_header(headers, 'X-RateLimit-Reset')
+        if limit is None or reset is None:
+            return
+        if remaining is None or status_code == 429:
+            remaining = 0
+        key = self.endpoint(url)
+        with self._lock:
+            bucket = self.buckets.pop(key, None)
+            if bucket is None:
+                bucket = TokenBucket(limit, remaining, reset)
+                while len(self.buckets) >= self.max_endpoints:
+                    self.buckets.popitem(last=False)
+            else:
+                bucket.update(limit, remaining, reset)
+            # Most recently updated last.
+            self.buckets[key] = bucket
@@ -0,0 +1,119 @@
+"""
+Retry policy for transient v3 API failures.
+
+Retries 429 and 5xx responses (and, optionally, connection errors) with capped
+exponential backoff and full jitter, so that many clients failing at the same
+moment do not retry in lock-step.  Retry-After and X-RateLimit-Reset headers
+are honored as a lower bound on the delay.
+"""
+
+import random
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+
+class RetryPolicy(object):
+    """Decides whether and when a failed request is retried."""
+
+    def __init__(self,
+                 max_attempts=4,
+                 base_delay=0.5,
+                 max_delay=30.0,
+                 jitter=True,
+                 retry_statuses=(429, 500, 502, 503, 504),
+                 retry_connection_errors=True,
+                 clock=time.time,
+                 sleep=time.sleep,
+                 rand=random.random):
+        """
+        :param max_attempts: total number of attempts, including the first one
+        :type max_attempts: integer
+        :param base_delay: delay before the first retry, in seconds; doubled on
+            every further attempt
+        :type base_delay: float
+        :param max_delay: upper bound of the backoff delay, in seconds
+        :type max_delay: float
+        :param jitter: randomize each backoff delay between 0 and its value
+        :type jitter: bool
+        :param retry_statuses: HTTP status codes that are retried
+        :type retry_statuses: iterable of integers
+        :param retry_connection_errors: retry requests that failed to get a
+            response at all (connection refused, reset, timed out)
+        :type retry_connection_errors: bool
+        :param clock: returns the current unix time
+        :type clock: callable
+        :param sleep: blocks for the given number of seconds
+        :type sleep: callable
+        :param rand: returns a float in [0, 1)
+        :type rand: callable
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.clock = clock
+        self.sleep = sleep
+        self.rand = rand
+
+    def backoff(self, attempt):
+        """Backoff delay after the given (1-based) failed attempt.
+
+        :rtype: float
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay *= self.rand()
+        return delay
+
+    def server_delay(self, headers):
+        """Delay requested by the server through Retry-After or, failing that,
+        X-RateLimit-Reset.
+
+        :rtype: float or None
+        """
+        if headers is None:
+            return None
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                parsed = parsedate_tz(retry_after)
+                if parsed is not None:
+                    return max(0.0, mktime_tz(parsed) - self.clock())
+        reset = headers.get('X-RateLimit-Reset')
+        remaining = headers.get('X-RateLimit-Remaining')
+        if reset is not None and remaining in (None, '0'):
+            try:
+                return max(0.0, float(reset) - self.clock())
+            except ValueError:
+                pass
+        return None
+
+    def delay_for(self, attempt, status=None, headers=None):
+        """Delay before retrying a request whose `attempt`-th try failed.
+
+        :param attempt: number of attempts made so far (1-based)
+        :type attempt: integer
+        :param status: response status, or None if no response was received
+        :type status: integer
+        :param headers: response headers
+        :type headers: mapping with case-insensitive get, e.g. HTTPMessage
+        :return: seconds to wait, or None if the request must not be retried
+        :rtype: float or None
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if status is None:
+            if not self.retry_connection_errors:
+                return None
+        elif status not in self.retry_statuses:
+            return None
+        delay = self.backoff(attempt)
+        if status is not None:
+            requested = self.server_delay(headers)
+            if requested is not None:
+                delay = max(delay, requested)
+        return delay
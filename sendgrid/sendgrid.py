@@ -16,7 +16,20 @@ This file provides the SendGrid API Client.
 import os
 import warnings
 
-import python_http_client
+from python_http_client.client import Response
+
+from .bulk import SplitResponse, send_many
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .hooks import Hooks, RequestEvent, clock
+from .metrics import REGISTRY, ClientMetrics
+from .pagination import paginate
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .transport import (ConnectionPool, TransportClient, URLError,
+                        error_for_status, gzip_body, mail_body,
+                        raise_for_status)
+from .version import __version__
 
 
 class SendGridAPIClient(object):
@@ -38,6 +51,20 @@ class SendGridAPIClient(object):
             api_key=None,
             impersonate_subuser=None,
             host='https://api.sendgrid.com',
+            pool_size=10,
+            pool_idle_timeout=60.0,
+            pool_max_lifetime=300.0,
+            rate_limiter=None,
+            retry=None,
+            compress_requests=False,
+            compress_threshold=1024,
+            cache=None,
+            transport=None,
+            on_request=None,
+            on_response=None,
+            on_error=None,
+            metrics=None,
+            circuit_breaker=None,
             **opts):  # TODO: remove **opts for 6.x release
         """
         Construct SendGrid v3 API object.
@@ -57,10 +84,64 @@ class SendGridAPIClient(object):
         :type impersonate_subuser: basestring
         :param host: base URL for API calls
         :type host: basestring
+        :param pool_size: number of persistent connections to host kept open
+            for reuse by send() and fluent calls
+        :type pool_size: integer
+        :param pool_idle_timeout: seconds after which an unused pooled
+            connection is closed
+        :type pool_idle_timeout: float
+        :param pool_max_lifetime: seconds after which a pooled connection is
+            retired and replaced by a new one
+        :type pool_max_lifetime: float
+        :param rate_limiter: schedule requests from the X-RateLimit-* response
+            headers so they are spaced out before the API starts rejecting
+            them. Pass True for the default RateLimiter, or a RateLimiter to
+            share one budget between clients. Off by default
+        :type rate_limiter: bool or sendgrid.rate_limit.RateLimiter
+        :param retry: retry policy for 429/5xx responses and connection errors,
+            applied to send() and fluent calls. Pass True for the default
+            RetryPolicy. Note that a retried mail/send request whose first
+            attempt actually reached SendGrid is delivered twice
+        :type retry: bool or sendgrid.retry.RetryPolicy
+        :param compress_requests: gzip-encode request bodies of at least
+            `compress_threshold` bytes and send them with Content-Encoding: gzip
+        :type compress_requests: bool
+        :param compress_threshold: smallest body size, in bytes, that is compressed
+        :type compress_threshold: integer
+        :param cache: cache GET responses of fluent calls, revalidating them
+            with If-None-Match once expired. Pass True for a default
+            ResponseCache, or a ResponseCache to set TTLs per endpoint. Any
+            other request made through this client drops the cached
+            responses of the resource it targets
+        :type cache: bool or sendgrid.cache.ResponseCache
+        :param transport: what requests are sent with, available as `pool`.
+            By default, a ConnectionPool to `host`. Pass "dryrun" to validate,
+            record and answer requests locally with a DryRunTransport, or any
+            object providing the request() and close() methods of
+            ConnectionPool
+        :type transport: string or object
+        :param on_request: called with a sendgrid.hooks.RequestEvent before
+            every attempt of a request made through send() or the fluent client
+        :type on_request: callable
+        :param on_response: called with a RequestEvent carrying the status,
+            headers and phase timings of every response received
+        :type on_response: callable
+        :param on_error: called with a RequestEvent carrying the exception of
+            every attempt that failed with a connection error or an error
+            status
+        :type on_error: callable
+        :param metrics: record requests, bytes sent, retries, 429s and
+            latencies in a metrics registry: True for the default
+            sendgrid.metrics.REGISTRY, or a sendgrid.metrics.Registry
+        :type metrics: bool or sendgrid.metrics.Registry
+        :param circuit_breaker: stop sending requests to an endpoint that
+            keeps failing, raising sendgrid.circuit_breaker.CircuitOpenError
+            instead until it recovers. Pass True for the default
+            CircuitBreaker. State changes are reported to the 'circuit' hooks
+        :type circuit_breaker: bool or sendgrid.circuit_breaker.CircuitBreaker
         :param opts: dispatcher for deprecated arguments. Added for backward-compatibility
             with `path` parameter. Should be removed during 6.x release
         """
-        from . import __version__
         if opts:
             warnings.warn(
                 'Unsupported argument(s) provided: {}'.format(list(opts.keys())),
@@ -70,10 +151,176 @@ class SendGridAPIClient(object):
         self.host = host
         self.useragent = 'sendgrid/{};python'.format(__version__)
         self.version = __version__
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool_max_lifetime = pool_max_lifetime
+        if rate_limiter is True:
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter or None
+        if retry is True:
+            retry = RetryPolicy()
+        self.retry = retry or None
+        self.compress_requests = compress_requests
+        self.compress_threshold = compress_threshold
+        if cache is True:
+            cache = ResponseCache()
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        self.transport = transport
+        self.hooks = Hooks(on_request=on_request,
+                           on_response=on_response,
+                           on_error=on_error)
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.listeners.append(
+                lambda change: self.hooks.fire('circuit', change))
+        if metrics is True:
+            metrics = REGISTRY
+        self.metrics = ClientMetrics(metrics) if metrics else None
+        if self.metrics is not None:
+            self.metrics.install(self)
+
+        self.client = self._build_client()
+
+    def _build_client(self):
+        if self.transport == 'dryrun':
+            from .dryrun import DryRunTransport
+            self.pool = DryRunTransport()
+        elif self.transport is not None:
+            self.pool = self.transport
+        else:
+            self.pool = ConnectionPool(self.host,
+                                       pool_size=self.pool_size,
+                                       idle_timeout=self.pool_idle_timeout,
+                                       max_lifetime=self.pool_max_lifetime)
+        return TransportClient(host=self.host,
+                               sender=self._request,
+                               request_headers=self._default_headers,
+                               version=3)
+
+    def _request(self, method, url, body=None, headers=None, timeout=None,
+                 timings=None):
+        if timings is None:
+            timings = {'start': clock()}
+        if self.cache is None:
+            return self._send(method, url, body, headers, timeout, timings)
+        if method != 'GET':
+            try:
+                return self._send(method, url, body, headers, timeout, timings)
+            finally:
+                self.cache.invalidate(url)
+
+        key = self.cache.key(url, headers)
+        entry = self.cache.lookup(key)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.record_hit()
+                return entry.response
+            if entry.etag is not None:
+                headers = dict(headers or {})
+                headers['If-None-Match'] = entry.etag
+        response = self._send(method, url, body, headers, timeout, timings)
+        if response.status == 304 and entry is not None:
+            self.cache.refresh(entry, key)
+            return entry.response
+        self.cache.record_miss()
+        if 200 <= response.status < 300:
+            self.cache.store(key, response)
+        return response
+
+    def _send(self, method, url, body, headers, timeout, timings):
+        if self.compress_requests:
+            headers = dict(headers or {})
+            body = gzip_body(body, headers, self.compress_threshold)
+        # Events are only built when someone is listening.
+        hooks = self.hooks if self.hooks else None
+        breaker = self.circuit_breaker
+        attempt = 1
+        while True:
+            if hooks is not None:
+                event = RequestEvent(method, url, len(body) if body else 0,
+                                     attempt, timings)
+                event.timings.pop('start', None)
+            if breaker is not None:
+                try:
+                    breaker.before(url)
+                except CircuitOpenError as error:
+                    if hooks is not None:
+                        event.circuit_state = breaker.state(url)
+                        event.error = error
+                        hooks.fire('error', event)
+                    raise
+                if hooks is not None:
+                    event.circuit_state = breaker.state(url)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            if hooks is not None:
+                hooks.fire('request', event)
+            try:
+                response = self.pool.request(method, url, body=body,
+                                             headers=headers, timeout=timeout)
+            except URLError as error:
+                if breaker is not None:
+                    breaker.record(url, None)
+                delay = self.retry and self.retry.delay_for(attempt)
+                if hooks is not None:
+                    event.timings['total'] = clock() - timings['start']
+                    event.error = error
+                    event.retrying = delay is not None
+                    hooks.fire('error', event)
+                if delay is None:
+                    raise
+            except Exception:
+                # Any other failure (socket timeout, SSL error, ...) still
+                # counts, and releases the probe slot of a half-open circuit.
+                if breaker is not None:
+                    breaker.record(url, None)
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record(url, response.status)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(url, response.headers,
+                                             response.status)
+                delay = None
+                if response.status >= 400 and self.retry is not None:
+                    delay = self.retry.delay_for(attempt, response.status,
+                                                 response.headers)
+                if hooks is not None:
+                    self._fire_response(hooks, event, url, response, timings,
+                                        delay is not None)
+                if delay is None:
+                    raise_for_status(url, response)
+                    return response
+            self.retry.sleep(delay)
+            attempt += 1
 
-        self.client = python_http_client.Client(host=self.host,
-                                                request_headers=self._default_headers,
-                                                version=3)
+    @staticmethod
+    def _fire_response(hooks, event, url, response, timings, retrying):
+        event.timings.update(response.timings)
+        event.timings['total'] = clock() - timings['start']
+        event.status_code = response.status
+        event.headers = response.headers
+        event.response_bytes = len(response.body) if response.body else 0
+        event.retrying = retrying
+        hooks.fire('response', event)
+        if response.status >= 400:
+            event.error = error_for_status(url, response)
+            hooks.fire('error', event)
+
+    def add_hook(self, event, callback):
+        """Register a lifecycle callback in addition to those given to the
+        constructor.
+
+        :param event: 'request', 'response' or 'error'
+        :type event: string
+        :param callback: called with a sendgrid.hooks.RequestEvent
+        :type callback: callable
+        """
+        self.hooks.add(event, callback)
 
     @property
     def _default_headers(self):
@@ -103,6 +350,105 @@ class SendGridAPIClient(object):
     def api_key(self, value):
         self.apikey = value
 
-    def send(self, message):
-        response = self.client.mail.send.post(request_body=message.get())
-        return response
+    def _post_mail(self, body, timings=None):
+        if timings is None:
+            timings = {'start': clock()}
+        build_start = clock()
+        headers = dict(self.client.request_headers)
+        headers.setdefault('Content-Type', 'application/json')
+        url = '{}/v3/mail/send'.format(self.host)
+        timings['build'] = clock() - build_start
+        return Response(self._request('POST', url, body=body, headers=headers,
+                                      timings=timings))
+
+    def send(self, message, split=False, concurrency=4):
+        """Send a Mail object through v3/mail/send.
+
+        The request is posted directly through the client's transport rather
+        than through client.mail.send.post(). A Mail's body is written
+        straight to bytes with Mail.to_json_bytes(), without building the
+        intermediate dict; other messages are JSON encoded from get(), or
+        taken as is when they are a dict.
+
+        With `split`, a Mail exceeding the per-request limits (1000
+        personalizations or recipients, maximum body size) is sent as several
+        requests sharing the same content, attachments and settings, and a
+        SplitResponse aggregating all of them is returned. Failed requests are
+        reported on it instead of being raised.
+
+        :param message: the message to send
+        :type message: Mail, object with a get() method, or dict
+        :param split: split oversized messages into several requests; only
+            supported for Mail objects
+        :type split: bool
+        :param concurrency: maximum number of split requests in flight
+        :type concurrency: integer
+        :rtype: python_http_client.client.Response or sendgrid.bulk.SplitResponse
+        """
+        if not split:
+            start = clock()
+            body = mail_body(message)
+            timings = {'start': start, 'serialize': clock() - start}
+            return self._post_mail(body, timings)
+        bodies = message.to_json_chunks()
+        return SplitResponse(list(send_many(self._post_mail, bodies,
+                                            concurrency=concurrency)))
+
+    def send_many(self, messages, concurrency=10, ordered=True):
+        """Send many Mail objects concurrently.
+
+        Results are yielded as a stream while the batch is in progress; a
+        failed send is reported on its result instead of stopping the batch.
+        For full throughput, pool_size should be at least `concurrency`.
+            for result in sg.send_many(mails, concurrency=20):
+                if not result.ok:
+                    log.warning('message %d failed: %s', result.index, result.error)
+
+        :param messages: messages to send
+        :type messages: iterable of Mail
+        :param concurrency: maximum number of sends in flight
+        :type concurrency: integer
+        :param ordered: yield results in input order instead of completion order
+        :type ordered: bool
+        :rtype: generator of sendgrid.bulk.SendResult
+        """
+        return send_many(self.send, messages, concurrency=concurrency,
+                         ordered=ordered)
+
+    def paginate(self, endpoint, page_size=500, prefetch=0, **kwargs):
+        """Iterate lazily over every item of a paginated list endpoint.
+            for bounce in sg.paginate(sg.client.suppression.bounces,
+                                      page_size=500, prefetch=2):
+                print(bounce['email'])
+
+        :param endpoint: fluent endpoint of this client
+        :type endpoint: python_http_client.Client
+        :param page_size: number of items requested per page
+        :type page_size: integer
+        :param prefetch: number of pages requested ahead, concurrently
+        :type prefetch: integer
+        :param kwargs: `style`, `query_params` and `items_key`, see
+            sendgrid.pagination.paginate
+        :rtype: generator
+        """
+        return paginate(endpoint, page_size=page_size, prefetch=prefetch,
+                        **kwargs)
+
+    def invalidate_cache(self, endpoint=None):
+        """Drop cached GET responses.
+
+        :param endpoint: fluent endpoint (e.g. sg.client.templates) or URL
+            whose cached responses are dropped, along with those of its
+            sub-resources and parent collections; everything is dropped when
+            not given
+        :type endpoint: python_http_client.Client or string
+        """
+        if self.cache is None:
+            return
+        if hasattr(endpoint, '_build_url'):
+            endpoint = endpoint._build_url(None)
+        self.cache.invalidate(endpoint)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
@@ -0,0 +1,388 @@
+"""
+HTTP transport used by the SendGrid API Client.
+
+python_http_client opens a new urllib connection (and does a new TLS handshake)
+for every call.  This module keeps a thread-safe pool of persistent
+connections to the API host instead and plugs it into the fluent client.
+"""
+
+import gzip
+import io
+import json
+import socket
+import threading
+import time
+
+import python_http_client
+from python_http_client.client import Response
+from python_http_client.exceptions import handle_error
+
+from .hooks import clock
+
+try:
+    # Python 3
+    import http.client as httplib
+    from urllib.error import HTTPError, URLError
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    import httplib
+    from urllib2 import HTTPError, URLError
+    from urlparse import urlsplit
+
+# Methods that can be resent without risking a duplicate side effect.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    # Python 2
+    _monotonic = time.time
+
+
+class RawResponse(object):
+    """A fully read HTTP response.
+
+    Provides the interface expected by python_http_client.client.Response
+    (getcode, read and info).  `timings` holds the connect and ttfb phase
+    durations measured by the transport, if any.
+    """
+
+    def __init__(self, status, reason, headers, body, timings=None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.timings = timings or {}
+
+    def getcode(self):
+        return self.status
+
+    def read(self):
+        return self.body
+
+    def info(self):
+        return self.headers
+
+
+def error_for_status(url, response):
+    """The python_http_client exception matching an error response, as
+    raised by python_http_client.Client for urllib errors.
+
+    :param url: requested URL, used in the error
+    :type url: string
+    :param response: the response to check
+    :type response: RawResponse
+    :return: None if the response is not an error
+    :rtype: python_http_client.exceptions.HTTPError
+    """
+    if response.status < 400:
+        return None
+    err = HTTPError(url, response.status, response.reason,
+                    response.headers, io.BytesIO(response.body))
+    exc = handle_error(err)
+    exc.__cause__ = None
+    return exc
+
+
+def raise_for_status(url, response):
+    """Raise the python_http_client exception matching an error response,
+    exactly like python_http_client.Client does for urllib errors.
+
+    :param url: requested URL, used in the error
+    :type url: string
+    :param response: the response to check
+    :type response: RawResponse
+    """
+    exc = error_for_status(url, response)
+    if exc is not None:
+        raise exc
+
+
+def mail_body(message):
+    """JSON-encode the body of a v3/mail/send request.
+
+    :param message: a Mail, or any object with a get() method returning the
+        request body, or the body itself as a dict
+    :type message: Mail, object or dict
+    :rtype: bytes
+    """
+    if hasattr(message, 'to_json_bytes'):
+        return message.to_json_bytes()
+    if not isinstance(message, dict):
+        message = message.get()
+    return json.dumps(message).encode('utf-8')
+
+
+def gzip_body(body, headers, threshold=1024, level=6):
+    """Gzip-encode a request body of at least `threshold` bytes.
+
+    Sets Content-Encoding on `headers` when the body is compressed.
+
+    :param body: encoded request body
+    :type body: bytes
+    :param headers: request headers, updated in place
+    :type headers: dict
+    :param threshold: smallest body size, in bytes, worth compressing
+    :type threshold: integer
+    :param level: zlib compression level (1-9)
+    :type level: integer
+    :return: the body to send
+    :rtype: bytes
+    """
+    if not body or len(body) < threshold:
+        return body
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=level, mtime=0) as f:
+        f.write(body)
+    headers['Content-Encoding'] = 'gzip'
+    return buf.getvalue()
+
+
+class _PooledConnection(object):
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = _monotonic()
+        self.last_used = self.created_at
+        # Whether the last request was written out in full.
+        self.request_sent = False
+
+    def close(self):
+        self.connection.close()
+
+
+class ConnectionPool(object):
+    """A thread-safe pool of persistent HTTP(S) connections to one host.
+
+    Up to `pool_size` idle connections are kept for reuse.  Requests made while
+    every pooled connection is busy open an extra connection, which is closed
+    again if the pool is already full when it is released.
+    """
+
+    _connection_errors = (httplib.HTTPException, socket.error)
+
+    def __init__(self, host, pool_size=10, idle_timeout=60.0,
+                 max_lifetime=300.0, timeout=None, ssl_context=None):
+        """
+        :param host: base URL of the API, e.g. https://api.sendgrid.com
+        :type host: string
+        :param pool_size: maximum number of idle connections kept open
+        :type pool_size: integer
+        :param idle_timeout: seconds after which an unused connection is discarded
+        :type idle_timeout: float
+        :param max_lifetime: seconds after which a connection is retired, even
+            if it is still in use, so DNS changes are eventually picked up
+        :type max_lifetime: float
+        :param timeout: default socket timeout in seconds
+        :type timeout: float
+        :param ssl_context: SSL context used for https hosts
+        :type ssl_context: ssl.SSLContext, optional
+        """
+        parts = urlsplit(host)
+        self.scheme = parts.scheme or 'https'
+        self.hostname = parts.hostname
+        self.port = parts.port
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _new_connection(self, timeout):
+        if self.scheme == 'https':
+            kwargs = {}
+            if self.ssl_context is not None:
+                kwargs['context'] = self.ssl_context
+            connection = httplib.HTTPSConnection(
+                self.hostname, self.port, timeout=timeout, **kwargs)
+        else:
+            connection = httplib.HTTPConnection(
+                self.hostname, self.port, timeout=timeout)
+        return _PooledConnection(connection)
+
+    def _is_expired(self, conn, now):
+        return (now - conn.last_used > self.idle_timeout or
+                now - conn.created_at > self.max_lifetime)
+
+    def _get(self):
+        now = _monotonic()
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if self._is_expired(conn, now):
+                    conn.close()
+                    continue
+                return conn
+        return None
+
+    def _put(self, conn):
+        now = _monotonic()
+        conn.last_used = now
+        if now - conn.created_at <= self.max_lifetime:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    @staticmethod
+    def _send(conn, method, target, body, headers, timeout):
+        connection = conn.connection
+        connection.timeout = timeout
+        start = connected = clock()
+        if connection.sock is None:
+            connection.connect()
+            connected = clock()
+        else:
+            connection.sock.settimeout(timeout)
+        conn.request_sent = False
+        connection.request(method, target, body=body, headers=headers)
+        conn.request_sent = True
+        response = connection.getresponse()
+        first_byte = clock()
+        data = response.read()
+        timings = {'connect': connected - start, 'ttfb': first_byte - connected}
+        return response, RawResponse(response.status, response.reason,
+                                     response.msg, data, timings)
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        """Send a request over a pooled connection.
+
+        :param method: HTTP verb
+        :type method: string
+        :param url: absolute URL or path (with query string) on the pool's host
+        :type url: string
+        :param body: encoded request body
+        :type body: bytes
+        :param headers: request headers
+        :type headers: dict
+        :param timeout: socket timeout in seconds
+        :type timeout: float
+        :rtype: RawResponse
+        """
+        parts = urlsplit(url)
+        target = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        headers = headers or {}
+        timeout = timeout or self.timeout
+
+        conn = self._get()
+        if conn is not None:
+            try:
+                response, raw = self._send(conn, method, target, body, headers,
+                                           timeout)
+            except socket.timeout as err:
+                conn.close()
+                raise URLError(err)
+            except self._connection_errors as err:
+                # The server closed an idle keep-alive connection before we
+                # used it; retry once on a fresh socket.  Once the request
+                # has been written the server may have processed it, so only
+                # idempotent requests are resent and the others are left to
+                # the retry policy.
+                conn.close()
+                if conn.request_sent and method not in IDEMPOTENT_METHODS:
+                    raise URLError(err)
+            except Exception:
+                conn.close()
+                raise
+            else:
+                self._release(conn, response)
+                return raw
+
+        conn = self._new_connection(timeout)
+        try:
+            response, raw = self._send(conn, method, target, body, headers,
+                                       timeout)
+        except self._connection_errors as err:
+            conn.close()
+            raise URLError(err)
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn, response)
+        return raw
+
+    def _release(self, conn, response):
+        if response.will_close:
+            conn.close()
+        else:
+            self._put(conn)
+
+    def close(self):
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class TransportClient(python_http_client.Client):
+    """python_http_client.Client that hands finished requests to a sender
+    callable instead of opening a new urllib connection for each call.
+
+    The sender is called as sender(method, url, body, headers, timeout,
+    timings), where `timings` holds the start time of the call ('start') and
+    the duration of the 'build' and 'serialize' phases, and must return a
+    RawResponse (or raise).
+    """
+
+    def __init__(self, host, sender, request_headers=None, version=None,
+                 url_path=None, append_slash=False, timeout=None):
+        super(TransportClient, self).__init__(host,
+                                              request_headers=request_headers,
+                                              version=version,
+                                              url_path=url_path,
+                                              append_slash=append_slash,
+                                              timeout=timeout)
+        self.sender = sender
+
+    def _build_client(self, name=None):
+        url_path = self._url_path + [name] if name else self._url_path
+        return TransportClient(host=self.host,
+                               sender=self.sender,
+                               version=self._version,
+                               request_headers=self.request_headers,
+                               url_path=url_path,
+                               append_slash=self.append_slash,
+                               timeout=self.timeout)
+
+    def _request(self, method, request_body=None, query_params=None,
+                 request_headers=None, timeout=None):
+        start = clock()
+        if request_headers:
+            self._update_headers(request_headers)
+        headers = dict(self.request_headers)
+        serialize_start = clock()
+        if request_body is None:
+            data = None
+        elif isinstance(request_body, bytes):
+            data = request_body
+        elif ('Content-Type' in headers and
+              headers['Content-Type'] != 'application/json'):
+            data = request_body.encode('utf-8')
+        else:
+            data = json.dumps(request_body).encode('utf-8')
+        serialized = clock()
+        if data and 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+        url = self._build_url(query_params)
+        timings = {'start': start,
+                   'serialize': serialized - serialize_start,
+                   'build': clock() - start - (serialized - serialize_start)}
+        return Response(self.sender(method, url, data, headers,
+                                    timeout or self.timeout, timings))
+
+    def __getattr__(self, name):
+        if name in self.methods:
+            method = name.upper()
+
+            def http_request(*_, **kwargs):
+                """Make the API call
+                :return: python_http_client.client.Response
+                """
+                return self._request(method, **kwargs)
+            return http_request
+        return super(TransportClient, self).__getattr__(name)
@@ -0,0 +1,3 @@
+# Kept in sync with VERSION.txt, so that the version is known without reading
+# a file at import time.
+__version__ = '5.4.1'
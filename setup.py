@@ -1,20 +1,16 @@
 import io
 import os
-from distutils.file_util import copy_file
 from setuptools import setup, find_packages
 
 
 def getRequires():
-    deps = ['python_http_client>=3.0']
+    deps = ['python_http_client>=3.1', 'futures; python_version < "3"']
     return deps
 
 
 dir_path = os.path.abspath(os.path.dirname(__file__))
 readme = io.open(os.path.join(dir_path, 'README.rst'), encoding='utf-8').read()
 version = io.open(os.path.join(dir_path, 'VERSION.txt'), encoding='utf-8').read().strip()
-copy_file(os.path.join(dir_path, 'VERSION.txt'),
-          os.path.join(dir_path, 'sendgrid', 'VERSION.txt'),
-          verbose=0)
 
 setup(
     name='sendgrid',
@@ -0,0 +1,40 @@
+"""Retry tests of AsyncSendGridAPIClient, imported by test_retry on Python
+3.5+ only: coroutine syntax does not parse on older interpreters."""
+import asyncio
+import unittest
+
+from sendgrid import AsyncSendGridAPIClient
+from sendgrid.retry import RetryPolicy
+
+from .local_server import LocalServer
+
+
+class AsyncUnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+
+    def test_async_client_retries(self):
+        policy = RetryPolicy(base_delay=0.001, jitter=False)
+        self.server.fail_next(500, 504)
+
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.server.host,
+                                              retry=policy) as sg:
+                return await sg.client.templates.get()
+
+        loop = asyncio.new_event_loop()
+        try:
+            response = loop.run_until_complete(go())
+        finally:
+            loop.close()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
@@ -0,0 +1,230 @@
+"""Tests of AsyncSendGridAPIClient, imported by test_async_sendgrid on
+Python 3.5+ only: coroutine syntax does not parse on older interpreters."""
+import asyncio
+import json
+import time
+import unittest
+
+from python_http_client.exceptions import BadRequestsError
+
+from sendgrid import AsyncSendGridAPIClient
+from sendgrid.async_sendgrid import AsyncConnectionPool
+from sendgrid.helpers.mail import Content, From, Mail, Personalization, To
+
+from .local_server import LocalServer
+
+
+class _BrokenConnection(object):
+    """An idle pooled connection whose next request fails with `error`."""
+
+    is_closed = False
+
+    def __init__(self, error):
+        self.error = error
+        self.last_used = time.monotonic()
+        self.closed = False
+        self.requests = []
+
+    async def request(self, method, target, headers, body):
+        self.requests.append((method, target))
+        raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+        cls.host = cls.server.host
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+
+    def run_async(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_fluent_get(self):
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                return await sg.client.suppression.bounces._('a@b.com').get(
+                    query_params={'limit': 1})
+
+        response = self.run_async(go())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.to_dict,
+                         {'path': '/v3/suppression/bounces/a@b.com?limit=1'})
+
+    def test_chunked_response(self):
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                return await sg.client.templates.get(
+                    request_headers={'X-Chunked': '1'})
+
+        response = self.run_async(go())
+        self.assertEqual(response.to_dict, {'path': '/v3/templates'})
+
+    def test_send(self):
+        mail = Mail(From('from@example.com'), 'subject',
+                    To('to@example.com'),
+                    Content('text/plain', 'hello'))
+
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                return await sg.send(mail)
+
+        self.run_async(go())
+        method, path, _, body = self.server.requests[0]
+        self.assertEqual((method, path), ('POST', '/v3/mail/send'))
+        self.assertEqual(json.loads(body.decode('utf-8')), mail.get())
+
+    def test_connections_are_pooled(self):
+        async def go():
+            async with AsyncSendGridAPIClient(
+                    apikey='KEY', host=self.host, max_connections=4) as sg:
+                return await asyncio.gather(
+                    *[sg.client.templates.get() for _ in range(50)])
+
+        responses = self.run_async(go())
+        self.assertEqual([r.status_code for r in responses], [200] * 50)
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_http_error(self):
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                await sg.client.templates.get(request_headers={'X-Mock': 400})
+
+        with self.assertRaises(BadRequestsError) as ctx:
+            self.run_async(go())
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_send_split(self):
+        mail = Mail(From('from@example.com'), 'subject', None,
+                    Content('text/plain', 'hello'))
+        for i in range(1500):
+            personalization = Personalization()
+            personalization.add_to(To('to{}@example.com'.format(i)))
+            mail.add_personalization(personalization, index=i)
+
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                return await sg.send(mail, split=True)
+
+        response = self.run_async(go())
+        self.assertTrue(response.ok)
+        self.assertEqual(len(self.server.requests), 2)
+        sizes = sorted(len(json.loads(body.decode('utf-8'))['personalizations'])
+                       for _, _, _, body in self.server.requests)
+        self.assertEqual(sizes, [500, 1000])
+
+    def _pool_with(self, conn):
+        pool = AsyncConnectionPool(self.host)
+        pool._idle.append(conn)
+        return pool
+
+    def test_idle_connection_closed_on_timeout(self):
+        conn = _BrokenConnection(asyncio.TimeoutError())
+        pool = self._pool_with(conn)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.run_async(pool.request('GET', '/v3/templates', {}))
+        self.assertTrue(conn.closed)
+        self.assertEqual(len(pool._idle), 0)
+
+    def test_stale_connection_resends_idempotent_request(self):
+        conn = _BrokenConnection(ConnectionResetError())
+        pool = self._pool_with(conn)
+
+        async def go():
+            try:
+                return await pool.request(
+                    'GET', '/v3/templates',
+                    {'Host': pool.host_header, 'Content-Length': '0'})
+            finally:
+                await pool.close()
+
+        self.assertEqual(self.run_async(go()).status, 200)
+        self.assertTrue(conn.closed)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_connection_does_not_resend_post(self):
+        conn = _BrokenConnection(ConnectionResetError())
+        pool = self._pool_with(conn)
+
+        with self.assertRaises(ConnectionResetError):
+            self.run_async(pool.request('POST', '/v3/mail/send', {}, b'{}'))
+        self.assertTrue(conn.closed)
+        self.assertEqual(self.server.requests, [])
+
+    def test_send_many(self):
+        mails = [Mail(From('from@example.com'), 'subject',
+                      To('to{}@example.com'.format(i)),
+                      Content('text/plain', 'hello')) for i in range(3)]
+        self.server.fail_next(200, 400)
+
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                results = []
+                async for result in sg.send_many(mails, concurrency=1):
+                    results.append(result)
+                return results
+
+        results = self.run_async(go())
+        self.assertEqual([r.index for r in results], [0, 1, 2])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIsInstance(results[1].error, BadRequestsError)
+
+    def test_send_many_pulls_messages_lazily(self):
+        pulled = []
+
+        def mails():
+            for i in range(20):
+                pulled.append(i)
+                yield Mail(From('from@example.com'), 'subject',
+                           To('to{}@example.com'.format(i)),
+                           Content('text/plain', 'hello'))
+
+        async def go():
+            async with AsyncSendGridAPIClient(apikey='KEY', host=self.host) as sg:
+                results = sg.send_many(mails(), concurrency=3, ordered=False)
+                first = await results.__anext__()
+                in_flight = len(pulled)
+                await results.aclose()
+                return first, in_flight
+
+        first, in_flight = self.run_async(go())
+        self.assertTrue(first.ok)
+        self.assertLessEqual(in_flight, 3)
+        self.assertLess(len(pulled), 20)
+
+    def test_send_many_rejects_zero_concurrency(self):
+        sg = AsyncSendGridAPIClient(apikey='KEY', host=self.host)
+        with self.assertRaises(ValueError):
+            sg.send_many([], concurrency=0)
+
+    def test_sync_only_options_rejected(self):
+        sg = AsyncSendGridAPIClient(apikey='KEY', host=self.host)
+        self.assertFalse(hasattr(sg, 'paginate'))
+        self.assertFalse(hasattr(sg, 'invalidate_cache'))
+        with self.assertRaises(TypeError):
+            AsyncSendGridAPIClient(apikey='KEY', host=self.host, cache=True)
+
+    def test_default_headers(self):
+        sg = AsyncSendGridAPIClient(apikey='KEY', host=self.host,
+                                    impersonate_subuser='sub')
+        self.assertEqual(sg.client.request_headers['Authorization'], 'Bearer KEY')
+        self.assertEqual(sg.client.request_headers['On-Behalf-Of'], 'sub')
+        sg.api_key = 'OTHER'
+        sg.reset_request_headers()
+        self.assertEqual(sg.client.request_headers['Authorization'],
+                         'Bearer OTHER')
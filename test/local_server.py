@@ -0,0 +1,117 @@
+"""A threaded HTTP/1.1 server and a fake clock used to exercise the clients."""
+import json
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    # Python2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # pooled connections are reset when the client closes them
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        # Python 2 lowercases header names; record them lowercased everywhere
+        headers = dict((name.lower(), value)
+                       for name, value in self.headers.items())
+        self.server.requests.append((self.command, self.path, headers, body))
+        with self.server.lock:
+            scripted = self.server.script.pop(0) if self.server.script else None
+        status = scripted or int(self.headers.get('X-Mock') or 200)
+        payload = json.dumps({'path': self.path}).encode('utf-8')
+        if status in (204, 304):
+            payload = b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in json.loads(self.headers.get('X-Mock-Headers') or '{}').items():
+            self.send_header(name, value)
+        if self.headers.get('X-Chunked'):
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in (payload[:5], payload[5:]):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = do_PATCH = do_PUT = _reply
+
+
+class LocalServer(object):
+    """Runs _Handler on a random local port in a background thread.
+
+    Every request is recorded as (method, path, headers, body), with the
+    header names lowercased; responses echo the path as JSON with the status
+    taken from the X-Mock request header and extra response headers taken
+    from the JSON X-Mock-Headers request header.
+    """
+
+    def __init__(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.lock = threading.Lock()
+        self.reset()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.host = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def reset(self):
+        self.server.connections = 0
+        self.server.requests = []
+        self.server.script = []
+
+    def fail_next(self, *statuses):
+        """Answer the next requests with the given statuses, in order."""
+        self.server.script.extend(statuses)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeClock(object):
+    """Stands in for time.time/time.sleep; sleeping advances the clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
@@ -2,6 +2,7 @@ import os
 import unittest
 
 from sendgrid.helpers.inbound.config import Config
+from sendgrid.helpers.inbound import app as app_module
 from sendgrid.helpers.inbound.app import app
 
 
@@ -20,3 +21,23 @@ class UnitTests(unittest.TestCase):
         if self.config.debug_mode:
             port = int(os.environ.get("PORT", self.config.port))
             self.assertEqual(port, self.config.port)
+
+    def test_metrics(self):
+        app_module.enable_metrics()
+        data = {'from': 'test@example.com', 'subject': 'Test'}
+        self.tester.post(self.config.endpoint, data=data)
+        response = self.tester.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('sendgrid_inbound_requests_total{status="200"}', text)
+        self.assertIn('sendgrid_inbound_processing_seconds_count', text)
+        self.assertIn('sendgrid_inbound_request_bytes_bucket{le="+Inf"}', text)
+
+    def test_metrics_are_opt_in(self):
+        self.assertFalse(self.config.metrics)
+        enabled, app_module.inbound_metrics = app_module.inbound_metrics, None
+        try:
+            self.assertEqual(self.tester.get('/metrics').status_code, 404)
+        finally:
+            app_module.inbound_metrics = enabled
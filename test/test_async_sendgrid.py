@@ -0,0 +1,9 @@
+import sys
+import unittest
+
+if sys.version_info >= (3, 5):
+    from .async_sendgrid_cases import UnitTests  # noqa: F401
+else:
+    @unittest.skip('AsyncSendGridAPIClient requires Python 3.5')
+    class UnitTests(unittest.TestCase):
+        pass
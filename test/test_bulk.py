@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.bulk import SplitResponse, send_many
+from sendgrid.helpers.mail import Content, From, Mail, Personalization, To
+
+from .local_server import LocalServer
+
+
+class UnitTests(unittest.TestCase):
+
+    def test_ordered_results_with_failures(self):
+        def send(message):
+            if message % 3 == 0:
+                raise ValueError(message)
+            time.sleep(0.001 * (10 - message))
+            return message * 2
+
+        results = list(send_many(send, range(10), concurrency=4))
+        self.assertEqual([r.index for r in results], list(range(10)))
+        self.assertEqual([r.ok for r in results],
+                         [i % 3 != 0 for i in range(10)])
+        self.assertEqual(results[1].response, 2)
+        self.assertIsInstance(results[3].error, ValueError)
+
+    def test_unordered_results(self):
+        def send(message):
+            time.sleep(0.02 if message == 0 else 0)
+            return message
+
+        results = list(send_many(send, range(6), concurrency=6, ordered=False))
+        self.assertEqual(sorted(r.index for r in results), list(range(6)))
+        self.assertEqual(results[-1].index, 0)
+
+    def test_bounded_concurrency_and_lazy_input(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0, 'pulled': 0}
+
+        def messages():
+            for i in range(50):
+                state['pulled'] += 1
+                yield i
+
+        def send(message):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.001)
+            with lock:
+                state['active'] -= 1
+
+        results = send_many(send, messages(), concurrency=3)
+        next(results)
+        self.assertLess(state['pulled'], 50)
+        self.assertEqual(len(list(results)), 49)
+        self.assertLessEqual(state['peak'], 3)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            list(send_many(lambda m: m, [1], concurrency=0))
+
+    def test_empty_split_response(self):
+        response = SplitResponse([])
+        self.assertTrue(response.ok)
+        self.assertIsNone(response.status_code)
+        self.assertEqual(len(response), 0)
+
+    def test_client_send_many(self):
+        server = LocalServer()
+        sg = SendGridAPIClient(apikey='KEY', host=server.host)
+        mails = [Mail(From('from@example.com'), 'subject',
+                      To('to{}@example.com'.format(i)),
+                      Content('text/plain', 'hello')) for i in range(20)]
+        try:
+            results = list(sg.send_many(mails, concurrency=5))
+        finally:
+            sg.close()
+            server.stop()
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([r.message for r in results], mails)
+        self.assertEqual(len(server.requests), 20)
+
+    def test_client_send_split(self):
+        server = LocalServer()
+        sg = SendGridAPIClient(apikey='KEY', host=server.host)
+        mail = Mail(From('from@example.com'), 'subject', None,
+                    Content('text/plain', 'hello'))
+        for i in range(2500):
+            personalization = Personalization()
+            personalization.add_to(To('to{}@example.com'.format(i)))
+            mail.add_personalization(personalization, index=i)
+        try:
+            response = sg.send(mail, split=True)
+            server.reset()
+            server.fail_next(400)
+            partial = sg.send(mail, split=True, concurrency=1)
+        finally:
+            sg.close()
+            server.stop()
+        self.assertTrue(response.ok)
+        self.assertEqual(len(response), 3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.responses), 3)
+        self.assertFalse(partial.ok)
+        self.assertEqual(len(partial.errors), 1)
+        self.assertEqual(partial.status_code, 400)
+        self.assertEqual(len(server.requests), 3)
@@ -0,0 +1,165 @@
+import json
+import threading
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.cache import ResponseCache
+from sendgrid.transport import RawResponse
+
+from .local_server import FakeClock, LocalServer
+
+
+def _response(etag=None):
+    headers = {'ETag': etag} if etag else {}
+    return RawResponse(200, 'OK', headers, b'{}')
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.clock = FakeClock()
+
+    def _client(self, **kwargs):
+        cache = ResponseCache(clock=self.clock, **kwargs)
+        return SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                                 host=self.server.host, cache=cache)
+
+    def test_ttl_for(self):
+        cache = ResponseCache(ttl=60, ttls={'/v3/templates': 300,
+                                            '/v3/templates/abc/': 0})
+        self.assertEqual(cache.ttl_for('https://h/v3/templates'), 300)
+        self.assertEqual(cache.ttl_for('https://h/v3/templates/x?a=1'), 300)
+        self.assertEqual(cache.ttl_for('https://h/v3/templates/abc'), 0)
+        self.assertEqual(cache.ttl_for('https://h/v3/templates_other'), 60)
+        self.assertEqual(cache.ttl_for('https://h/v3/categories'), 60)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        keys = [cache.key('https://h/v3/{}'.format(i), {}) for i in range(3)]
+        cache.store(keys[0], _response())
+        cache.store(keys[1], _response())
+        cache.lookup(keys[0])
+        cache.store(keys[2], _response())
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.lookup(keys[1]))
+        self.assertIsNotNone(cache.lookup(keys[0]))
+
+    def test_zero_ttl_only_kept_with_etag(self):
+        cache = ResponseCache(ttl=0)
+        key = cache.key('https://h/v3/asm/groups', {})
+        cache.store(key, _response())
+        self.assertEqual(len(cache), 0)
+        cache.store(key, _response(etag='"v1"'))
+        self.assertFalse(cache.is_fresh(cache.lookup(key)))
+
+    def test_key_includes_credentials(self):
+        url = 'https://h/v3/templates'
+        self.assertNotEqual(
+            ResponseCache.key(url, {'Authorization': 'Bearer a'}),
+            ResponseCache.key(url, {'Authorization': 'Bearer b'}))
+        self.assertNotEqual(
+            ResponseCache.key(url, {'Authorization': 'Bearer a'}),
+            ResponseCache.key(url, {'Authorization': 'Bearer a',
+                                    'On-behalf-of': 'subuser'}))
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        for path in ('/v3/templates', '/v3/templates/abc',
+                     '/v3/templates/abc/versions', '/v3/categories'):
+            cache.store(cache.key('https://h' + path, {}), _response())
+        cache.invalidate('https://h/v3/templates/abc')
+        self.assertEqual([key[0] for key in cache._entries],
+                         ['https://h/v3/categories'])
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_counters_are_thread_safe(self):
+        cache = ResponseCache()
+
+        def worker():
+            for _ in range(1000):
+                cache.record_hit()
+                cache.record_miss()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual((cache.hits, cache.misses), (4000, 4000))
+
+    def test_fresh_responses_are_served_from_cache(self):
+        sg = self._client(ttl=60)
+        first = sg.client.templates.get(query_params={'page_size': 10})
+        second = sg.client.templates.get(query_params={'page_size': 10})
+        sg.client.templates.get(query_params={'page_size': 20})
+        self.assertEqual(second.to_dict, first.to_dict)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual((sg.cache.hits, sg.cache.misses), (1, 2))
+
+        self.clock.now += 61
+        sg.client.templates.get(query_params={'page_size': 10})
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertNotIn('if-none-match', self.server.requests[-1][2])
+
+    def test_etag_revalidation(self):
+        sg = self._client(ttl=60)
+        headers = {'X-Mock-Headers': json.dumps({'ETag': '"v1"'})}
+        first = sg.client.categories.get(request_headers=headers)
+        self.clock.now += 61
+        self.server.fail_next(304)
+        second = sg.client.categories.get()
+        self.assertEqual(self.server.requests[-1][2]['if-none-match'], '"v1"')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.to_dict, first.to_dict)
+        self.assertEqual(sg.cache.revalidations, 1)
+
+        # The revalidated entry is fresh again.
+        sg.client.categories.get()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_writes_invalidate(self):
+        sg = self._client(ttl=60)
+        sg.client.templates.get()
+        sg.client.templates._('abc').get()
+        sg.client.templates._('abc').patch(request_body={'name': 'new'})
+        sg.client.templates.get()
+        sg.client.templates._('abc').get()
+        self.assertEqual([request[0] for request in self.server.requests],
+                         ['GET', 'GET', 'PATCH', 'GET', 'GET'])
+
+    def test_errors_are_not_cached(self):
+        sg = self._client(ttl=60)
+        self.server.fail_next(404)
+        with self.assertRaises(Exception):
+            sg.client.templates.get()
+        sg.client.templates.get()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_invalidate_cache(self):
+        sg = self._client(ttl=60)
+        sg.client.templates.get()
+        sg.client.categories.get()
+        sg.invalidate_cache(sg.client.templates)
+        self.assertEqual(len(sg.cache), 1)
+        sg.invalidate_cache()
+        self.assertEqual(len(sg.cache), 0)
+
+    def test_disabled_by_default(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        self.assertIsNone(sg.cache)
+        sg.client.templates.get()
+        sg.client.templates.get()
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertIsInstance(
+            SendGridAPIClient(apikey='SENDGRID_API_KEY', cache=True).cache,
+            ResponseCache)
@@ -0,0 +1,164 @@
+import socket
+import unittest
+
+from python_http_client.exceptions import ServiceUnavailableError
+
+from sendgrid import SendGridAPIClient
+from sendgrid.circuit_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker,
+                                      CircuitOpenError)
+from sendgrid.metrics import Registry
+
+from .local_server import FakeClock, LocalServer
+
+URL = 'https://api.sendgrid.com/v3/mail/send'
+
+
+class TimingOutTransport(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        self.calls += 1
+        raise socket.timeout('timed out')
+
+    def close(self):
+        pass
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.clock = FakeClock()
+
+    def _breaker(self, **kwargs):
+        kwargs.setdefault('failure_threshold', 3)
+        kwargs.setdefault('recovery_timeout', 10)
+        return CircuitBreaker(clock=self.clock, **kwargs)
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = self._breaker()
+        for status in (500, None, 200, 503, 502):
+            breaker.before(URL)
+            breaker.record(URL, status)
+        self.assertEqual(breaker.state(URL), CLOSED)
+        breaker.record(URL, 504)
+        self.assertEqual(breaker.state(URL), OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.before(URL)
+        self.assertEqual(context.exception.scope, '/v3/mail/send')
+        self.assertEqual(context.exception.retry_at, 1010)
+
+    def test_client_errors_are_not_failures(self):
+        breaker = self._breaker()
+        for status in (400, 404, 429, 429, 429):
+            breaker.record(URL, status)
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+    def test_half_open(self):
+        breaker = self._breaker(half_open_max_calls=1)
+        for _ in range(3):
+            breaker.record(URL, 500)
+        self.clock.now += 10
+        breaker.before(URL)
+        self.assertEqual(breaker.state(URL), HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before(URL)
+        breaker.record(URL, 500)
+        self.assertEqual(breaker.state(URL), OPEN)
+
+        self.clock.now += 10
+        breaker.before(URL)
+        breaker.record(URL, 202)
+        self.assertEqual(breaker.state(URL), CLOSED)
+        breaker.before(URL)
+
+    def test_scope(self):
+        breaker = self._breaker()
+        for _ in range(3):
+            breaker.record('https://h/v3/templates/abc1', 500)
+        self.assertEqual(breaker.state('https://h/v3/templates/xyz2'), OPEN)
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+        breaker = self._breaker(per_endpoint=False)
+        for _ in range(3):
+            breaker.record('https://h/v3/templates/abc1', 500)
+        self.assertEqual(breaker.state(URL), OPEN)
+        breaker.reset()
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+    def test_listeners(self):
+        breaker = self._breaker()
+        changes = []
+        breaker.listeners.append(changes.append)
+        for _ in range(3):
+            breaker.record(URL, 500)
+        self.clock.now += 10
+        breaker.before(URL)
+        breaker.record(URL, 200)
+        self.assertEqual([(c.previous, c.state) for c in changes],
+                         [(CLOSED, OPEN), (OPEN, HALF_OPEN),
+                          (HALF_OPEN, CLOSED)])
+        self.assertEqual(changes[0].failures, 3)
+
+    def test_client_fails_fast(self):
+        changes, errors = [], []
+        registry = Registry()
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host,
+                               circuit_breaker=self._breaker(),
+                               on_error=errors.append, metrics=registry)
+        sg.add_hook('circuit', changes.append)
+        self.server.fail_next(503, 503, 503)
+        for _ in range(3):
+            with self.assertRaises(ServiceUnavailableError):
+                sg.client.templates.get()
+        with self.assertRaises(CircuitOpenError):
+            sg.client.templates.get()
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual([change.state for change in changes], [OPEN])
+        self.assertIsInstance(errors[-1].error, CircuitOpenError)
+        self.assertEqual(errors[-1].circuit_state, OPEN)
+        self.assertEqual(registry.get('sendgrid_circuit_transitions_total')
+                         .value(endpoint='/v3/templates', state=OPEN), 1)
+
+        # Other endpoints are unaffected.
+        self.assertEqual(sg.client.categories.get().status_code, 200)
+
+        sg.circuit_breaker.clock.now += 10
+        self.assertEqual(sg.client.templates.get().status_code, 200)
+        self.assertEqual([change.state for change in changes],
+                         [OPEN, HALF_OPEN, CLOSED])
+
+    def test_unexpected_errors_release_the_probe(self):
+        transport = TimingOutTransport()
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               circuit_breaker=self._breaker(),
+                               transport=transport)
+        for _ in range(3):
+            with self.assertRaises(socket.timeout):
+                sg.client.templates.get()
+        self.assertEqual(sg.circuit_breaker.state('/v3/templates'), OPEN)
+
+        sg.circuit_breaker.clock.now += 10
+        with self.assertRaises(socket.timeout):
+            sg.client.templates.get()
+        self.assertEqual(sg.circuit_breaker.state('/v3/templates'), OPEN)
+        sg.circuit_breaker.clock.now += 10
+        with self.assertRaises(socket.timeout):
+            sg.client.templates.get()
+        self.assertEqual(transport.calls, 5)
+
+    def test_disabled_by_default(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY')
+        self.assertIsNone(sg.circuit_breaker)
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', circuit_breaker=True)
+        self.assertIsInstance(sg.circuit_breaker, CircuitBreaker)
@@ -0,0 +1,55 @@
+import gzip
+import io
+import json
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Content, From, Mail, To
+from sendgrid.transport import gzip_body
+
+from .local_server import LocalServer
+
+
+def gunzip(data):
+    # gzip.decompress() is Python 3 only
+    with gzip.GzipFile(fileobj=io.BytesIO(data), mode='rb') as f:
+        return f.read()
+
+
+class UnitTests(unittest.TestCase):
+
+    def test_small_bodies_are_not_compressed(self):
+        headers = {}
+        self.assertEqual(gzip_body(b'{}', headers, threshold=10), b'{}')
+        self.assertEqual(headers, {})
+        self.assertIsNone(gzip_body(None, headers))
+
+    def test_large_bodies_are_compressed(self):
+        headers = {}
+        body = b'{"value": "' + b'a' * 5000 + b'"}'
+        compressed = gzip_body(body, headers, threshold=1024)
+        self.assertEqual(headers, {'Content-Encoding': 'gzip'})
+        self.assertLess(len(compressed), len(body))
+        self.assertEqual(gunzip(compressed), body)
+
+    def test_client_sends_compressed_mail(self):
+        server = LocalServer()
+        sg = SendGridAPIClient(apikey='KEY', host=server.host,
+                               compress_requests=True, compress_threshold=100)
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'),
+                    Content('text/html', '<p>hello</p>' * 200))
+        try:
+            sg.send(mail)
+            sg.client.templates.get()
+        finally:
+            sg.close()
+            server.stop()
+        _, _, headers, body = server.requests[0]
+        self.assertEqual(headers['content-encoding'], 'gzip')
+        self.assertEqual(json.loads(gunzip(body).decode('utf-8')),
+                         mail.get())
+        self.assertNotIn('content-encoding', server.requests[1][2])
+
+    def test_compression_is_opt_in(self):
+        sg = SendGridAPIClient(apikey='KEY')
+        self.assertFalse(sg.compress_requests)
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from python_http_client.exceptions import BadRequestsError
+
+from sendgrid import SendGridAPIClient
+from sendgrid.dryrun import DryRunTransport, validate_mail_payload
+from sendgrid.helpers.mail import Content, From, Mail, Personalization, To
+
+
+def _mail(recipients=1):
+    mail = Mail(From('from@example.com'), 'Subject', To('to0@example.com'),
+                Content('text/plain', 'Hello'))
+    for i in range(1, recipients):
+        personalization = Personalization()
+        personalization.add_to(To('to{}@example.com'.format(i)))
+        mail.add_personalization(personalization)
+    return mail
+
+
+class UnitTests(unittest.TestCase):
+
+    def test_send_is_recorded_and_accepted(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        self.assertIsInstance(sg.pool, DryRunTransport)
+        response = sg.send(_mail())
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.headers['X-Message-Id'])
+        record = sg.pool.records[0]
+        self.assertEqual(record['method'], 'POST')
+        self.assertTrue(record['url'].endswith('/v3/mail/send'))
+        self.assertEqual(record['body'], _mail().get())
+        self.assertNotIn('Authorization', record['headers'])
+
+    def test_fluent_calls(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        self.assertEqual(sg.client.templates.get().to_dict, {})
+        response = sg.client.asm.groups.post(request_body={'name': 'news'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(sg.pool.records[1]['body'], {'name': 'news'})
+        self.assertEqual(sg.pool.count, 2)
+
+    def test_invalid_mail_is_rejected(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        with self.assertRaises(BadRequestsError) as context:
+            sg.client.mail.send.post(request_body={'subject': 'x'})
+        errors = json.loads(context.exception.body.decode('utf-8'))['errors']
+        self.assertEqual(sorted(error['field'] for error in errors),
+                         ['content', 'from.email', 'personalizations'])
+        self.assertEqual(sg.pool.records[0]['status'], 400)
+
+    def test_validate_mail_payload(self):
+        self.assertEqual(validate_mail_payload(_mail().get()), [])
+        payload = _mail().get()
+        del payload['subject']
+        self.assertEqual([error['field']
+                          for error in validate_mail_payload(payload)],
+                         ['subject'])
+        payload['template_id'] = 'd-123'
+        del payload['content']
+        self.assertEqual(validate_mail_payload(payload), [])
+        payload = _mail(1001).get()
+        self.assertEqual([error['field']
+                          for error in validate_mail_payload(payload)],
+                         ['personalizations', 'personalizations'])
+        payload = _mail().get()
+        payload['content'][0]['value'] = 'SG.abc123.def456'
+        self.assertEqual([error['field']
+                          for error in validate_mail_payload(payload)],
+                         ['content'])
+
+    def test_malformed_mail_payload(self):
+        payload = _mail().get()
+        payload['personalizations'].append('to@example.com')
+        payload['personalizations'][0]['cc'] = {'email': 'cc@example.com'}
+        payload['personalizations'][0]['to'].append(['to@example.com'])
+        payload['content'].append('hello')
+        self.assertEqual([error['field']
+                          for error in validate_mail_payload(payload)],
+                         ['personalizations.0.to', 'personalizations.0.cc',
+                          'personalizations.1', 'content.1'])
+        payload = _mail().get()
+        payload['personalizations'] = 'to@example.com'
+        payload['content'] = {'type': 'text/plain', 'value': 'hello'}
+        self.assertEqual([error['field']
+                          for error in validate_mail_payload(payload)],
+                         ['personalizations', 'content'])
+
+    def test_validation_can_be_disabled(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               transport=DryRunTransport(validate=False))
+        response = sg.client.mail.send.post(request_body={})
+        self.assertEqual(response.status_code, 202)
+
+    def test_compressed_bodies_are_decoded(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun',
+                               compress_requests=True, compress_threshold=0)
+        sg.send(_mail())
+        self.assertEqual(sg.pool.records[0]['headers']['Content-Encoding'],
+                         'gzip')
+        self.assertEqual(sg.pool.records[0]['body'], _mail().get())
+
+    def test_ndjson_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'requests.ndjson')
+        transport = DryRunTransport(record=path)
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport=transport)
+        for _ in range(3):
+            sg.send(_mail())
+        sg.close()
+        self.assertIsNone(transport.records)
+        with io.open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2]['body'], _mail().get())
+
+    def test_no_recording(self):
+        transport = DryRunTransport(record=False)
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport=transport)
+        sg.send(_mail())
+        self.assertIsNone(transport.records)
+        self.assertEqual(transport.count, 1)
+
+    def test_split_send(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        response = sg.send(_mail(2500), split=True)
+        self.assertTrue(response.ok)
+        self.assertEqual(sorted(len(record['body']['personalizations'])
+                                for record in sg.pool.records),
+                         [500, 1000, 1000])
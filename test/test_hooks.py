@@ -0,0 +1,141 @@
+import json
+import logging
+import unittest
+
+from python_http_client.exceptions import NotFoundError
+
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Content, From, Mail, To
+from sendgrid.hooks import Hooks, RequestEvent
+from sendgrid.retry import RetryPolicy
+
+from .local_server import LocalServer
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.events = []
+
+    def _client(self, host=None, **kwargs):
+        def record(kind):
+            return lambda event: self.events.append(
+                (kind, event.attempt, event.status_code, dict(event.timings)))
+
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               host=host or self.server.host,
+                               on_request=record('request'),
+                               on_response=record('response'),
+                               on_error=record('error'),
+                               **kwargs)
+        self.addCleanup(sg.close)
+        return sg
+
+    def test_send_events_and_timings(self):
+        sg = self._client()
+        mail = Mail(From('from@example.com'), 'Subject', To('to@example.com'),
+                    Content('text/plain', 'Hello'))
+        sg.send(mail)
+        self.assertEqual([event[:3] for event in self.events],
+                         [('request', 1, None), ('response', 1, 200)])
+        self.assertEqual(sorted(self.events[0][3]), ['build', 'serialize'])
+        timings = self.events[1][3]
+        self.assertEqual(sorted(timings),
+                         ['build', 'connect', 'serialize', 'total', 'ttfb'])
+        self.assertTrue(all(value >= 0 for value in timings.values()))
+        self.assertGreaterEqual(timings['total'],
+                                timings['connect'] + timings['ttfb'])
+
+    def test_connection_reuse_has_no_connect_time(self):
+        sg = self._client()
+        sg.client.templates.get()
+        sg.client.templates.get()
+        self.assertEqual(self.events[3][3]['connect'], 0)
+
+    def test_event_details(self):
+        seen = []
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               host=self.server.host,
+                               on_response=seen.append)
+        headers = {'X-Mock-Headers': json.dumps({
+            'X-RateLimit-Limit': '600', 'X-RateLimit-Remaining': '599',
+            'X-RateLimit-Reset': '1500000000'})}
+        sg.client.asm.groups.post(request_body={'name': 'news'},
+                                  query_params={'a': 1},
+                                  request_headers=headers)
+        event = seen[0]
+        self.assertEqual(event.method, 'POST')
+        self.assertEqual(event.path, '/v3/asm/groups')
+        self.assertEqual(event.request_bytes, len(b'{"name": "news"}'))
+        self.assertEqual(event.response_bytes,
+                         len(self.server.requests[0][1]) + len(b'{"path": ""}'))
+        self.assertEqual(event.rate_limit, {'limit': 600, 'remaining': 599,
+                                            'reset': 1500000000})
+
+    def test_error_status(self):
+        sg = self._client()
+        self.server.fail_next(404)
+        with self.assertRaises(NotFoundError):
+            sg.client.templates.get()
+        self.assertEqual([event[:3] for event in self.events],
+                         [('request', 1, None), ('response', 1, 404),
+                          ('error', 1, 404)])
+
+    def test_retries_are_reported_per_attempt(self):
+        errors = []
+        retry = RetryPolicy(base_delay=0, sleep=lambda _: None)
+        sg = self._client(retry=retry)
+        sg.add_hook('error', errors.append)
+        self.server.fail_next(503)
+        sg.client.templates.get()
+        self.assertEqual([event[:3] for event in self.events],
+                         [('request', 1, None), ('response', 1, 503),
+                          ('error', 1, 503), ('request', 2, None),
+                          ('response', 2, 200)])
+        self.assertTrue(errors[0].retrying)
+        self.assertEqual(errors[0].error.status_code, 503)
+
+    def test_connection_error(self):
+        sg = self._client(host='http://127.0.0.1:1')
+        with self.assertRaises(Exception):
+            sg.client.templates.get()
+        self.assertEqual([event[:3] for event in self.events],
+                         [('request', 1, None), ('error', 1, None)])
+        self.assertIn('total', self.events[1][3])
+
+    def test_failing_hook_does_not_break_request(self):
+        def broken(event):
+            raise RuntimeError('broken hook')
+
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               host=self.server.host, on_request=broken)
+        logging.getLogger('sendgrid.hooks').disabled = True
+        self.addCleanup(setattr, logging.getLogger('sendgrid.hooks'),
+                        'disabled', False)
+        self.assertEqual(sg.client.templates.get().status_code, 200)
+
+    def test_hooks(self):
+        hooks = Hooks()
+        self.assertFalse(hooks)
+        callback = lambda event: None
+        hooks.add('response', callback)
+        self.assertTrue(hooks)
+        hooks.remove('response', callback)
+        self.assertFalse(hooks)
+        with self.assertRaises(ValueError):
+            hooks.add('retry', callback)
+
+    def test_request_event(self):
+        event = RequestEvent('GET', 'https://api.sendgrid.com/v3/templates?a=1',
+                             0)
+        self.assertEqual(event.path, '/v3/templates')
+        self.assertEqual(event.rate_limit, {})
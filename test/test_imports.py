@@ -0,0 +1,91 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+import sendgrid
+from sendgrid.version import __version__
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(statement):
+    """Modules loaded by running `statement` in a fresh interpreter."""
+    probe = ('import sys\nbefore = set(sys.modules)\n{}\n'
+             'print("\\n".join(sorted(set(sys.modules) - before)))'
+             ).format(statement)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.check_output([sys.executable, '-c', probe], env=env,
+                                     cwd=ROOT)
+    return set(output.decode('utf-8').split())
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'PEP 562 requires Python 3.7')
+class UnitTests(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        modules = loaded_modules('import sendgrid')
+        self.assertNotIn('sendgrid.sendgrid', modules)
+        self.assertNotIn('sendgrid.helpers.mail', modules)
+        self.assertNotIn('asyncio', modules)
+        self.assertNotIn('python_http_client', modules)
+
+    def test_helpers_import_only_what_is_used(self):
+        modules = loaded_modules('from sendgrid.helpers.mail import To')
+        self.assertIn('sendgrid.helpers.mail.to_email', modules)
+        self.assertNotIn('sendgrid.helpers.mail.mail', modules)
+        self.assertNotIn('sendgrid.helpers.mail.attachment', modules)
+
+    def test_client_does_not_import_optional_features(self):
+        modules = loaded_modules('from sendgrid import SendGridAPIClient')
+        self.assertNotIn('sendgrid.dryrun', modules)
+        self.assertNotIn('concurrent.futures', modules)
+        self.assertNotIn('asyncio', modules)
+
+    def test_lazy_attributes(self):
+        from sendgrid.sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail.email import Email
+        self.assertIs(sendgrid.SendGridAPIClient, SendGridAPIClient)
+        self.assertIs(sendgrid.Email, Email)
+        self.assertIn('SendGridAPIClient', dir(sendgrid))
+        with self.assertRaises(AttributeError):
+            sendgrid.NotAClass
+
+    def test_submodules_stay_available(self):
+        modules = loaded_modules(
+            'import sendgrid\n'
+            'assert sendgrid.helpers.mail.Mail.__name__ == "Mail"\n'
+            'assert sendgrid.sendgrid.SendGridAPIClient\n'
+            'assert sendgrid.dir_path.endswith("sendgrid")')
+        self.assertIn('sendgrid.helpers.mail.mail', modules)
+        self.assertIn('helpers', dir(sendgrid))
+
+    def test_helpers_submodules_are_available(self):
+        modules = loaded_modules(
+            'import sendgrid.helpers.mail as mail\n'
+            'assert mail.email.Email.__name__ == "Email"\n'
+            'assert mail.mail.Mail.__name__ == "Mail"')
+        self.assertNotIn('sendgrid.helpers.mail.attachment', modules)
+        import sendgrid.helpers.mail
+        self.assertIn('personalization', dir(sendgrid.helpers.mail))
+        with self.assertRaises(AttributeError):
+            sendgrid.helpers.mail.not_a_module
+
+    def test_star_import(self):
+        namespace = {}
+        exec('from sendgrid.helpers.mail import *', namespace)
+        for name in ('Mail', 'Personalization', 'To', 'SendGridException',
+                     'ValidateApiKey'):
+            self.assertIn(name, namespace)
+        self.assertNotIn('importlib', namespace)
+
+    def test_version_matches_version_txt(self):
+        with io.open(os.path.join(ROOT, 'VERSION.txt'),
+                     encoding='utf-8') as f:
+            self.assertEqual(__version__, f.read().strip())
+        self.assertEqual(sendgrid.__version__, __version__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,23 +16,28 @@ from sendgrid.helpers.mail import (
     BccSettings,
     BypassListManagement,
     Category,
+    Cc,
     ClickTracking,
     Content,
     CustomArg,
     Email,
     FooterSettings,
+    From,
     Ganalytics,
     Header,
+    HtmlContent,
     Mail,
     MailSettings,
     OpenTracking,
     Personalization,
+    RecipientTable,
     SandBoxMode,
     Section,
     SendGridException,
     SpamCheck,
     SubscriptionTracking,
     Substitution,
+    To,
     TrackingSettings,
     ValidateApiKey
 )
@@ -262,27 +267,27 @@ class UnitTests(unittest.TestCase):
                 "personalizations": [
                     {
                         "substitutions": {
-                            "-github-": "https://example.com/test1", 
-                            "-name-": "Example Name Substitution 1", 
+                            "-github-": "https://example.com/test0", 
+                            "-name-": "Example Name Substitution 0", 
                             "-time-": "2019-01-01 00:00:00"
                         }, 
                         "to": [
                             {
-                                "email": "test+to1@example.com", 
-                                "name": "Example Name 1"
+                                "email": "test+to0@example.com", 
+                                "name": "Example Name 0"
                             }
                         ]
                     }, 
                     {
                         "substitutions": {
-                            "-github-": "https://example.com/test0", 
-                            "-name-": "Example Name Substitution 0", 
+                            "-github-": "https://example.com/test1", 
+                            "-name-": "Example Name Substitution 1", 
                             "-time-": "2019-01-01 00:00:00"
                         }, 
                         "to": [
                             {
-                                "email": "test+to0@example.com", 
-                                "name": "Example Name 0"
+                                "email": "test+to1@example.com", 
+                                "name": "Example Name 1"
                             }
                         ]
                     }
@@ -761,6 +766,313 @@ class UnitTests(unittest.TestCase):
                 }
             }''')
         )
+        self.assertEqual(
+            json.loads(message.to_json_bytes().decode('utf-8')),
+            message.get())
+
+    def test_personalization_to_json_bytes(self):
+        personalization = Personalization()
+        self.assertEqual(personalization.to_json_bytes(), b'{}')
+        personalization.add_to(Email('test@example.com', 'Name'))
+        personalization.add_cc(Email('cc@example.com'))
+        personalization.add_substitution(Substitution('-name-', u'Ren\xe9e'))
+        personalization.add_substitution(Substitution('-city-', 'Denver'))
+        personalization.add_header(Header('X-Test', 'test'))
+        personalization.subject = 'Hi -name-'
+        personalization.send_at = 1461775051
+        self.assertEqual(
+            json.loads(personalization.to_json_bytes().decode('utf-8')),
+            personalization.get())
+
+    def test_to_json_chunks(self):
+        mail = Mail(Email('from@example.com'), 'subject')
+        mail.add_content(Content('text/plain', 'shared content'))
+        for i in range(25):
+            personalization = Personalization()
+            personalization.add_to(Email('to{}@example.com'.format(i)))
+            personalization.add_cc(Email('cc{}@example.com'.format(i)))
+            mail.add_personalization(personalization, index=i)
+
+        full = mail.get()
+        shared = dict(full)
+        del shared['personalizations']
+
+        by_count = [json.loads(c.decode('utf-8'))
+                    for c in mail.to_json_chunks(max_personalizations=10)]
+        self.assertEqual([len(c['personalizations']) for c in by_count],
+                         [10, 10, 5])
+        by_recipients = [json.loads(c.decode('utf-8'))
+                         for c in mail.to_json_chunks(max_recipients=7)]
+        self.assertEqual([len(c['personalizations']) for c in by_recipients],
+                         [3] * 8 + [1])
+        for chunks in (by_count, by_recipients):
+            self.assertEqual(
+                [p for c in chunks for p in c.pop('personalizations')],
+                full['personalizations'])
+            for chunk in chunks:
+                self.assertEqual(chunk, shared)
+
+        max_bytes = 400
+        by_size = list(mail.to_json_chunks(max_bytes=max_bytes))
+        self.assertGreater(len(by_size), 1)
+        for chunk in by_size:
+            self.assertLessEqual(len(chunk), max_bytes)
+
+    def test_to_json_chunks_within_limits(self):
+        mail = Mail(Email('from@example.com'), 'subject')
+        mail.add_content(Content('text/plain', 'shared content'))
+        self.assertEqual(list(mail.to_json_chunks()), [mail.to_json_bytes()])
+        personalization = Personalization()
+        personalization.add_to(Email('to@example.com'))
+        mail.add_personalization(personalization)
+        self.assertEqual(list(mail.to_json_chunks()), [mail.to_json_bytes()])
+
+    def test_add_personalizations_keeps_order(self):
+        mail = Mail(From('from@example.com'), 'subject')
+        first = Personalization()
+        first.add_to(To('first@example.com'))
+        mail.add_personalization(first)
+        personalizations = []
+        for i in range(3):
+            personalization = Personalization()
+            personalization.add_to(To('to{}@example.com'.format(i)))
+            personalizations.append(personalization)
+        mail.add_personalizations(iter(personalizations))
+        self.assertEqual(mail.personalizations, [first] + personalizations)
+
+    def test_extend_recipients(self):
+        mail = Mail(From('from@example.com'), 'subject')
+        mail.extend_recipients(
+            [u'to0@example.com', To('to1@example.com', 'Name 1'),
+             Cc('cc@example.com')],
+            global_substitutions=Substitution('-time-', 'noon'))
+        self.assertEqual(mail.get()['personalizations'], [
+            {'to': [{'email': 'to0@example.com'}],
+             'substitutions': {'-time-': 'noon'}},
+            {'to': [{'email': 'to1@example.com', 'name': 'Name 1'}],
+             'substitutions': {'-time-': 'noon'}},
+            {'cc': [{'email': 'cc@example.com'}],
+             'substitutions': {'-time-': 'noon'}},
+        ])
+
+    def test_global_substitutions(self):
+        mail = Mail(From('from@example.com'), 'subject')
+        mail.extend_recipients(['to0@example.com', 'to1@example.com'])
+        mail.add_substitution(Substitution('-time-', 'noon'))
+        mail.add_global_substitution([Substitution('-day-', 'Monday'),
+                                      Substitution('-name-', 'customer')])
+        mail.add_substitution(Substitution('-name-', 'Alice', p=1))
+        for personalization in mail.personalizations:
+            self.assertEqual(len(personalization.substitutions),
+                             1 if personalization is mail.personalizations[1]
+                             else 0)
+        self.assertEqual(len(mail.global_substitutions), 3)
+
+        self.assertEqual(
+            [p['substitutions'] for p in mail.get()['personalizations']],
+            [{'-time-': 'noon', '-day-': 'Monday', '-name-': 'customer'},
+             {'-time-': 'noon', '-day-': 'Monday', '-name-': 'Alice'}])
+        self.assertEqual(
+            json.loads(mail.to_json_bytes().decode('utf-8')), mail.get())
+        chunks = [json.loads(c.decode('utf-8'))
+                  for c in mail.to_json_chunks(max_personalizations=1)]
+        self.assertEqual([p for c in chunks for p in c['personalizations']],
+                         mail.get()['personalizations'])
+
+    def test_global_substitutions_apply_to_later_personalizations(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to0@example.com'))
+        mail.add_substitution(Substitution('-time-', 'noon'))
+        personalization = Personalization()
+        personalization.add_to(To('to1@example.com'))
+        personalization.add_substitution(Substitution('-time-', 'midnight'))
+        mail.add_personalization(personalization)
+        personalization = Personalization()
+        personalization.add_to(To('to2@example.com'))
+        mail.add_personalization(personalization)
+
+        self.assertEqual(
+            [p['substitutions'] for p in mail.get()['personalizations']],
+            [{'-time-': 'noon'}, {'-time-': 'midnight'}, {'-time-': 'noon'}])
+
+    def test_serialized_parts_are_reused_until_changed(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'))
+        mail.add_content(Content('text/html', '<p>' + 'x' * 10000 + '</p>'))
+        tracking_settings = TrackingSettings()
+        tracking_settings.click_tracking = ClickTracking(True, True)
+        mail.tracking_settings = tracking_settings
+        shared = mail._shared_json()
+        self.assertIs(mail._shared_json(), shared)
+
+        # Changing the recipients does not touch the shared part.
+        mail.personalizations[0].add_to(To('other@example.com'))
+        self.assertIs(mail._shared_json(), shared)
+
+        def body():
+            self.assertEqual(
+                json.loads(mail.to_json_bytes().decode('utf-8')), mail.get())
+            return mail.get()
+
+        mail.contents[0].value = '<p>changed</p>'
+        self.assertEqual(body()['content'][0]['value'], '<p>changed</p>')
+        tracking_settings.click_tracking.enable_text = False
+        self.assertFalse(body()['tracking_settings']['click_tracking'][
+            'enable_text'])
+        mail.from_email.email = 'changed@example.com'
+        self.assertEqual(body()['from']['email'], 'changed@example.com')
+        mail.contents.append(Content('text/plain', 'appended'))
+        self.assertEqual(len(body()['content']), 2)
+        mail.add_category(Category('category'))
+        self.assertEqual(body()['categories'], ['category'])
+
+    def test_clone(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'),
+                    html_content=HtmlContent('<p>content</p>'))
+        mail.add_category(Category('orders'))
+        shared = mail._shared_json()
+        clone = mail.clone()
+        self.assertEqual(clone.get(), mail.get())
+        self.assertIs(clone.contents[0], mail.contents[0])
+        self.assertIs(clone._shared_json(), shared)
+
+        clone.personalizations[0].add_to(To('other@example.com'))
+        clone.add_personalization(Personalization())
+        clone.add_category(Category('other'))
+        clone.subject = 'other subject'
+        self.assertEqual(mail.get()['personalizations'],
+                         [{'to': [{'email': 'to@example.com'}]}])
+        self.assertEqual(mail.get()['categories'], ['orders'])
+        self.assertEqual(mail.get()['subject'], 'subject')
+        self.assertEqual(len(clone.get()['personalizations'][1]['to']), 2)
+        self.assertEqual(clone.get()['categories'], ['other', 'orders'])
+
+    def test_derive(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'),
+                    html_content=HtmlContent('<p>content</p>'))
+        derived = mail.derive(to_emails=To('other@example.com', 'Other'),
+                              subject='other subject')
+        self.assertEqual(derived.get()['personalizations'],
+                         [{'to': [{'email': 'other@example.com',
+                                   'name': 'Other'}]}])
+        self.assertEqual(derived.get()['subject'], 'other subject')
+        self.assertEqual(derived.get()['content'], mail.get()['content'])
+        self.assertEqual(mail.get()['personalizations'],
+                         [{'to': [{'email': 'to@example.com'}]}])
+
+        personalization = Personalization()
+        personalization.add_to(To('third@example.com'))
+        derived = mail.derive(personalizations=[personalization])
+        self.assertEqual(derived.personalizations, [personalization])
+        with self.assertRaises(TypeError):
+            mail.derive(no_such_field=1)
+
+    def test_helpers_have_no_instance_dict(self):
+        import sendgrid.helpers.mail as helpers
+        for name in helpers.__all__:
+            cls = getattr(helpers, name)
+            if name in ('Mail', 'ValidateApiKey') or issubclass(cls, Exception):
+                continue
+            self.assertFalse(hasattr(cls.__new__(cls), '__dict__'), name)
+
+        personalization = Personalization()
+        self.assertEqual(personalization.get(), {})
+        personalization.ccs.append({'email': 'cc@example.com'})
+        personalization.substitutions = [{'-a-': 'b'}]
+        self.assertEqual(personalization.get(),
+                         {'cc': [{'email': 'cc@example.com'}],
+                          'substitutions': {'-a-': 'b'}})
+
+    def test_recipient_table(self):
+        table = RecipientTable(substitution_keys=['-name-', '-order-'])
+        table.append('to0@example.com', 'Name 0', ['Name 0', '100'])
+        table.append('to1@example.com', substitutions={'-order-': '101'})
+        table.extend([('to2@example.com',)])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.get(), [
+            {'to': [{'email': 'to0@example.com', 'name': 'Name 0'}],
+             'substitutions': {'-name-': 'Name 0', '-order-': '100'}},
+            {'to': [{'email': 'to1@example.com'}],
+             'substitutions': {'-order-': '101'}},
+            {'to': [{'email': 'to2@example.com'}]},
+        ])
+        with self.assertRaises(ValueError):
+            table.append('to@example.com', substitutions=['too few'])
+        with self.assertRaises(ValueError):
+            table.append('to@example.com', substitutions={'-city-': 'Denver'})
+
+    def test_mail_with_recipient_table(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'))
+        mail.add_global_substitution(Substitution('-time-', 'noon'))
+        table = RecipientTable(substitution_keys=['-time-'])
+        mail.add_recipient_table(table)
+        table.append('row0@example.com')
+        table.append('row1@example.com', substitutions=['midnight'])
+
+        self.assertEqual(mail.get()['personalizations'], [
+            {'to': [{'email': 'to@example.com'}],
+             'substitutions': {'-time-': 'noon'}},
+            {'to': [{'email': 'row0@example.com'}],
+             'substitutions': {'-time-': 'noon'}},
+            {'to': [{'email': 'row1@example.com'}],
+             'substitutions': {'-time-': 'midnight'}},
+        ])
+        self.assertEqual(
+            json.loads(mail.to_json_bytes().decode('utf-8')), mail.get())
+        chunks = [json.loads(c.decode('utf-8'))
+                  for c in mail.to_json_chunks(max_personalizations=2)]
+        self.assertEqual([len(c['personalizations']) for c in chunks], [2, 1])
+
+        derived = mail.derive(to_emails=To('other@example.com'))
+        self.assertEqual(len(derived.get()['personalizations']), 1)
+        self.assertEqual(len(mail.clone().get()['personalizations']), 3)
+
+    def test_mail_from_columns(self):
+        mail = Mail.from_columns(
+            [u'to0@example.com', 'to1@example.com'], ['Name 0', None],
+            substitutions={'-order-': [100, None],
+                           '-city-': [u'Z\xfcrich', None]},
+            from_email=From('from@example.com'), subject='Order -order-')
+
+        self.assertEqual(mail.get()['subject'], 'Order -order-')
+        self.assertEqual(mail.get()['personalizations'], [
+            {'to': [{'email': 'to0@example.com', 'name': 'Name 0'}],
+             'substitutions': {'-order-': '100', '-city-': u'Z\xfcrich'}},
+            {'to': [{'email': 'to1@example.com'}]},
+        ])
+
+        with self.assertRaises(ValueError) as raised:
+            Mail.from_columns(['to@example.com', 'to', None, 'a b@example.com'])
+        self.assertIn('3 invalid email addresses', str(raised.exception))
+        self.assertEqual(
+            len(Mail.from_columns(['to'], validate=False).get()[
+                'personalizations']), 1)
+        with self.assertRaises(ValueError):
+            Mail.from_columns(['to@example.com'], names=['a', 'b'])
+
+    def test_recipient_table_from_frame(self):
+        class ArrowColumn(object):
+            def __init__(self, values):
+                self.values = values
+
+            def to_pylist(self):
+                return list(self.values)
+
+        frame = {
+            'email': ArrowColumn(['to0@example.com', 'to1@example.com']),
+            'order': ArrowColumn([100, 101]),
+        }
+        table = RecipientTable.from_frame(
+            frame, substitutions={'-order-': 'order'})
+
+        self.assertEqual(table.substitution_keys, ('-order-',))
+        self.assertEqual(table.get(), [
+            {'to': [{'email': 'to0@example.com'}],
+             'substitutions': {'-order-': '100'}},
+            {'to': [{'email': 'to1@example.com'}],
+             'substitutions': {'-order-': '101'}},
+        ])
+
+    def test_empty_mail_to_json_bytes(self):
+        self.assertEqual(Mail().to_json_bytes(), b'{}')
 
     def test_unicode_values_in_substitutions_helper(self):
         return
@@ -0,0 +1,116 @@
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.metrics import (Counter, Histogram, Registry, REGISTRY,
+                              endpoint_label)
+from sendgrid.retry import RetryPolicy
+
+from .local_server import LocalServer
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+
+    def test_counter(self):
+        counter = Counter('jobs_total', 'Jobs.', ('kind',))
+        counter.inc(kind='a')
+        counter.inc(2, kind='a')
+        counter.inc(kind='b"\n')
+        self.assertEqual(counter.value(kind='a'), 3)
+        self.assertEqual(counter.expose(), [
+            '# HELP jobs_total Jobs.',
+            '# TYPE jobs_total counter',
+            'jobs_total{kind="a"} 3',
+            'jobs_total{kind="b\\"\\n"} 1',
+        ])
+        with self.assertRaises(ValueError):
+            counter.inc(other='a')
+
+    def test_histogram(self):
+        histogram = Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 3):
+            histogram.observe(value)
+        self.assertEqual(histogram.count(), 4)
+        self.assertEqual(histogram.expose()[2:], [
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            'latency_seconds_sum 4.05',
+            'latency_seconds_count 4',
+        ])
+
+    def test_registry(self):
+        registry = Registry()
+        counter = registry.counter('a_total', 'A.')
+        self.assertIs(registry.counter('a_total', 'A.'), counter)
+        with self.assertRaises(ValueError):
+            registry.histogram('a_total', 'A.')
+        counter.inc()
+        registry.histogram('b_seconds', 'B.', buckets=(1,)).observe(0.5)
+        text = registry.expose()
+        self.assertTrue(text.startswith('# HELP a_total A.\n'))
+        self.assertIn('\na_total 1\n', text)
+        self.assertIn('\nb_seconds_count 1\n', text)
+        registry.clear()
+        self.assertEqual(counter.value(), 0)
+
+    def test_endpoint_label(self):
+        self.assertEqual(endpoint_label('/v3/mail/send'), '/v3/mail/send')
+        self.assertEqual(endpoint_label('/v3/templates/3f2a9c/versions/'),
+                         '/v3/templates/{id}/versions')
+        self.assertEqual(endpoint_label('/v3/suppression/bounces/a@b.com'),
+                         '/v3/suppression/bounces/{id}')
+
+    def test_client_metrics(self):
+        registry = Registry()
+        retry = RetryPolicy(base_delay=0, sleep=lambda _: None)
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host,
+                               metrics=registry, retry=retry)
+        self.addCleanup(sg.close)
+        self.server.fail_next(429)
+        sg.client.templates._('abc123').get()
+        sg.client.asm.groups.post(request_body={'name': 'news'})
+
+        requests = registry.get('sendgrid_requests_total')
+        self.assertEqual(requests.value(endpoint='/v3/templates/{id}',
+                                        method='GET', status=429), 1)
+        self.assertEqual(requests.value(endpoint='/v3/templates/{id}',
+                                        method='GET', status=200), 1)
+        self.assertEqual(registry.get('sendgrid_retries_total').value(
+            endpoint='/v3/templates/{id}', method='GET'), 1)
+        self.assertEqual(registry.get('sendgrid_rate_limited_total').value(
+            endpoint='/v3/templates/{id}'), 1)
+        self.assertEqual(registry.get('sendgrid_request_bytes_total').value(
+            endpoint='/v3/asm/groups', method='POST'), 16)
+        self.assertEqual(registry.get('sendgrid_request_duration_seconds')
+                         .count(endpoint='/v3/asm/groups', method='POST'), 1)
+
+    def test_connection_errors(self):
+        registry = Registry()
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY',
+                               host='http://127.0.0.1:1', metrics=registry)
+        with self.assertRaises(Exception) as ctx:
+            sg.client.templates.get()
+        # socket.error on Python 2, ConnectionRefusedError on Python 3
+        error = getattr(ctx.exception, 'reason', ctx.exception)
+        self.assertEqual(registry.get('sendgrid_request_errors_total').value(
+            endpoint='/v3/templates', method='GET',
+            error=type(error).__name__), 1)
+
+    def test_disabled_by_default(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        self.assertIsNone(sg.metrics)
+        self.assertFalse(sg.hooks)
+        self.assertIsNotNone(
+            SendGridAPIClient(apikey='SENDGRID_API_KEY', metrics=True).metrics)
+        self.assertIsNotNone(REGISTRY.get('sendgrid_requests_total'))
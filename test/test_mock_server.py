@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+import unittest
+
+from python_http_client.exceptions import (BadRequestsError,
+                                           ServiceUnavailableError,
+                                           TooManyRequestsError,
+                                           UnauthorizedError)
+
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Content, From, Mail, To
+from sendgrid.mock_server import MockConfig, MockSendGridServer
+from sendgrid.retry import RetryPolicy
+
+
+class UnitTests(unittest.TestCase):
+
+    def _server(self, **config):
+        server = MockSendGridServer(('127.0.0.1', 0), MockConfig(**config))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def _client(self, server, **kwargs):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=server.url,
+                               **kwargs)
+        self.addCleanup(sg.close)
+        return sg
+
+    def test_default_statuses(self):
+        sg = self._client(self._server())
+        self.assertEqual(sg.client.templates.get().status_code, 200)
+        response = sg.client.asm.groups.post(request_body={'name': 'news'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.to_dict, {'name': 'news'})
+        response = sg.client.asm.groups._(1).delete()
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.body, b'')
+
+    def test_mail_send(self):
+        server = self._server()
+        sg = self._client(server)
+        mail = Mail(From('from@example.com'), 'Subject', To('to@example.com'),
+                    Content('text/plain', 'Hello'))
+        response = sg.send(mail)
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.headers['X-Message-Id'])
+        with self.assertRaises(BadRequestsError):
+            sg.client.mail.send.post(request_body={})
+        self.assertEqual(server.stats['requests'], 2)
+        self.assertEqual(server.stats[400], 1)
+
+    def test_x_mock_header(self):
+        sg = self._client(self._server())
+        response = sg.client.templates.get(request_headers={'X-Mock': 204})
+        self.assertEqual(response.status_code, 204)
+        with self.assertRaises(ServiceUnavailableError):
+            sg.client.templates.get(request_headers={'X-Mock': 503})
+
+    def test_auth_required(self):
+        server = self._server()
+        sg = self._client(server)
+        with self.assertRaises(UnauthorizedError):
+            sg.client.templates.get(request_headers={'Authorization': 'nope'})
+
+    def test_latency(self):
+        sg = self._client(self._server(latency=0.05))
+        start = time.time()
+        sg.client.templates.get()
+        self.assertGreaterEqual(time.time() - start, 0.05)
+
+    def test_error_injection(self):
+        server = self._server(error_rate=0.5, seed=1)
+        sg = self._client(server)
+        failures = 0
+        for _ in range(40):
+            try:
+                sg.client.templates.get()
+            except Exception:
+                failures += 1
+        self.assertTrue(5 < failures < 35)
+        self.assertEqual(server.stats[500] + server.stats[503], failures)
+
+    def test_error_injection_with_retries(self):
+        server = self._server(error_rate=0.3, seed=2)
+        retry = RetryPolicy(max_attempts=10, base_delay=0, sleep=lambda _: None)
+        sg = self._client(server, retry=retry)
+        for _ in range(20):
+            self.assertEqual(sg.client.templates.get().status_code, 200)
+        self.assertGreater(server.stats['requests'], 20)
+
+    def test_rate_limit(self):
+        sg = self._client(self._server(rate_limit=3, window=60),
+                          rate_limiter=False)
+        for remaining in (2, 1, 0):
+            response = sg.client.templates.get()
+            self.assertEqual(response.headers['X-RateLimit-Limit'], '3')
+            self.assertEqual(response.headers['X-RateLimit-Remaining'],
+                             str(remaining))
+        with self.assertRaises(TooManyRequestsError):
+            sg.client.templates.get()
+        # Limits are tracked per endpoint.
+        self.assertEqual(sg.client.categories.get().status_code, 200)
+
+    def test_throttle_injection(self):
+        sg = self._client(self._server(throttle_rate=1.0))
+        with self.assertRaises(TooManyRequestsError) as context:
+            sg.client.templates.get()
+        self.assertEqual(json.loads(context.exception.body.decode('utf-8')),
+                         {'errors': [{'message': 'too many requests',
+                                      'field': None, 'help': None}]})
+
+    def test_concurrent_clients(self):
+        server = self._server(latency=0.02)
+        sg = self._client(server, pool_size=50)
+        mail = Mail(From('from@example.com'), 'Subject', To('to@example.com'),
+                    Content('text/plain', 'Hello'))
+        start = time.time()
+        results = list(sg.send_many([mail] * 100, concurrency=50))
+        self.assertTrue(all(result.ok for result in results))
+        # 100 requests at 20ms each, 50 at a time.
+        self.assertLess(time.time() - start, 1.0)
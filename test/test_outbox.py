@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.dryrun import DryRunTransport
+from sendgrid.helpers.mail import Content, From, Mail, To
+from sendgrid.outbox import Outbox
+
+from .local_server import LocalServer
+
+
+def _mail(i=0):
+    return Mail(From('from@example.com'), 'Subject {}'.format(i),
+                To('to{}@example.com'.format(i)),
+                Content('text/plain', 'Hello'))
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'outbox.db')
+
+    def _outbox(self, client, **kwargs):
+        kwargs.setdefault('poll_interval', 0.01)
+        kwargs.setdefault('base_delay', 0)
+        outbox = Outbox(client, self.path, **kwargs)
+        self.addCleanup(outbox.close)
+        return outbox
+
+    def test_enqueue_and_drain(self):
+        transport = DryRunTransport()
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport=transport)
+        outbox = self._outbox(sg, workers=4, batch_size=10)
+        for i in range(100):
+            outbox.enqueue(_mail(i))
+        self.assertEqual(outbox.pending(), 100)
+        outbox.start()
+        self.assertTrue(outbox.join(timeout=10))
+        outbox.stop()
+        self.assertEqual(outbox.sent, 100)
+        self.assertEqual(sorted(record['body']['subject']
+                                for record in transport.records),
+                         sorted('Subject {}'.format(i) for i in range(100)))
+
+    def test_enqueue_many(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        outbox = self._outbox(sg)
+        self.assertEqual(outbox.enqueue_many(_mail(i) for i in range(20)), 20)
+        self.assertEqual(outbox.enqueue_many([_mail().to_json_bytes()]), 1)
+        self.assertEqual(outbox.pending(), 21)
+
+    def test_messages_survive_restart(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        outbox = Outbox(sg, self.path)
+        outbox.enqueue(_mail(1))
+        outbox.enqueue(_mail(2))
+        # A worker claims a batch, then the process dies before sending it.
+        self.assertEqual(len(outbox._claim()[1]), 2)
+        outbox.close()
+
+        transport = DryRunTransport()
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport=transport)
+        outbox = self._outbox(sg)
+        self.assertEqual(outbox.pending(), 2)
+        self.assertEqual(outbox.process_batch(), 2)
+        self.assertEqual(outbox.pending(), 0)
+        self.assertEqual(len(transport.records), 2)
+
+    def test_transient_failures_are_retried(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        outbox = self._outbox(sg)
+        outbox.enqueue(_mail())
+        self.server.fail_next(503, 429)
+        outbox.process_batch()
+        outbox.process_batch()
+        self.assertEqual(outbox.pending(), 1)
+        outbox.process_batch()
+        self.assertEqual(outbox.pending(), 0)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(outbox.dead_letters(), [])
+
+    def test_retry_delay(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        outbox = self._outbox(sg, base_delay=60)
+        outbox.enqueue(_mail())
+        self.server.fail_next(500)
+        outbox.process_batch()
+        self.assertEqual(outbox.process_batch(), 0)
+        self.assertEqual(outbox.pending(), 1)
+
+    def test_permanent_failures_are_dead_lettered(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        outbox = self._outbox(sg)
+        outbox.enqueue(_mail())
+        self.server.fail_next(400)
+        outbox.process_batch()
+        self.assertEqual(outbox.pending(), 0)
+        dead, = outbox.dead_letters()
+        self.assertEqual((dead.status, dead.attempts), (400, 1))
+        self.assertEqual(dead.body, _mail().to_json_bytes())
+
+        self.assertEqual(outbox.requeue_dead_letters(), 1)
+        self.assertEqual(outbox.dead_letters(), [])
+        outbox.process_batch()
+        self.assertEqual(outbox.pending(), 0)
+
+    def test_max_attempts(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', host=self.server.host)
+        outbox = self._outbox(sg, max_attempts=2)
+        outbox.enqueue(_mail())
+        self.server.fail_next(500, 500)
+        outbox.process_batch()
+        outbox.process_batch()
+        dead, = outbox.dead_letters()
+        self.assertEqual((dead.status, dead.attempts), (500, 2))
+
+    def test_batch_outlasting_its_lease(self):
+        outbox = None
+
+        class SlowClient(object):
+            bodies = []
+            stolen = []
+
+            def _post_mail(self, body):
+                self.bodies.append(body)
+                time.sleep(0.12)
+                if len(self.bodies) == 2:
+                    # Another worker looks for expired leases.
+                    self.stolen.extend(outbox._claim()[1])
+
+        client = SlowClient()
+        outbox = self._outbox(client, lease=0.2)
+        for i in range(3):
+            outbox.enqueue(_mail(i))
+        self.assertEqual(outbox.process_batch(), 3)
+        # The batch took longer than the lease, but it was renewed before
+        # every send, so no message was handed to the other worker.
+        self.assertEqual(client.stolen, [])
+        self.assertEqual(len(client.bodies), 3)
+        self.assertEqual(outbox.pending(), 0)
+
+    def test_lost_lease_is_not_sent_again(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        outbox = self._outbox(sg, lease=0)
+        outbox.enqueue(_mail())
+        leased_until, rows = outbox._claim()
+        time.sleep(0.01)
+        # The lease expired and another worker claimed the message.
+        self.assertEqual(len(outbox._claim()[1]), 1)
+        self.assertEqual(outbox._renew([rows[0][0]], leased_until)[1], set())
+
+    def test_enqueue_is_fast(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY', transport='dryrun')
+        outbox = self._outbox(sg)
+        body = _mail().to_json_bytes()
+        start = time.time()
+        for _ in range(1000):
+            outbox.enqueue(body)
+        # Well under a millisecond per message, without touching the network.
+        self.assertLess(time.time() - start, 1.0)
@@ -0,0 +1,153 @@
+import threading
+import time
+import unittest
+
+from sendgrid import SendGridAPIClient
+from sendgrid.pagination import guess_style, page_items, paginate
+
+
+class _Page(object):
+
+    def __init__(self, body):
+        self.to_dict = body
+
+
+class FakeEndpoint(object):
+    """Serves `total` numbered items the way a list endpoint would."""
+
+    def __init__(self, total, style='offset', url_path=('suppression', 'bounces'),
+                 delay=0, max_page_size=None):
+        self.total = total
+        self.max_page_size = max_page_size
+        self.style = style
+        self._url_path = list(url_path)
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, query_params=None):
+        with self.lock:
+            self.calls.append(dict(query_params))
+        time.sleep(self.delay)
+        if self.style == 'offset':
+            start, size = query_params['offset'], query_params['limit']
+        elif self.style == 'page':
+            size = query_params['page_size']
+            start = (query_params['page'] - 1) * size
+        else:
+            size = query_params['page_size']
+            start = int(query_params.get('page_token', 0))
+        if self.max_page_size is not None and size > self.max_page_size:
+            if self.style == 'page':
+                start = start // size * self.max_page_size
+            size = self.max_page_size
+        items = [{'id': i} for i in range(start, min(start + size, self.total))]
+        if self.style == 'offset':
+            return _Page(items)
+        if self.style == 'page':
+            return _Page({'recipients': items, 'recipient_count': self.total})
+        metadata = {'count': self.total}
+        if start + size < self.total:
+            metadata['next'] = ('https://api.sendgrid.com/v3/templates'
+                                '?page_size={}&page_token={}'.format(size, start + size))
+        return _Page({'result': items, '_metadata': metadata})
+
+
+class UnitTests(unittest.TestCase):
+
+    def test_offset_pagination(self):
+        endpoint = FakeEndpoint(1203)
+        items = list(paginate(endpoint, page_size=500,
+                              query_params={'start_time': 1}))
+        self.assertEqual([item['id'] for item in items], list(range(1203)))
+        self.assertEqual(endpoint.calls, [
+            {'start_time': 1, 'offset': 0, 'limit': 500},
+            {'start_time': 1, 'offset': 500, 'limit': 500},
+            {'start_time': 1, 'offset': 1000, 'limit': 500},
+            {'start_time': 1, 'offset': 1203, 'limit': 500},
+        ])
+
+    def test_exact_multiple_fetches_one_empty_page(self):
+        endpoint = FakeEndpoint(20)
+        self.assertEqual(len(list(paginate(endpoint, page_size=10))), 20)
+        self.assertEqual(len(endpoint.calls), 3)
+
+    def test_page_pagination(self):
+        endpoint = FakeEndpoint(25, style='page',
+                                url_path=('contactdb', 'recipients'))
+        items = list(paginate(endpoint, page_size=10))
+        self.assertEqual([item['id'] for item in items], list(range(25)))
+        self.assertEqual([call['page'] for call in endpoint.calls],
+                         [1, 2, 3, 4])
+
+    def test_capped_page_size(self):
+        for style, url_path in (('offset', ('suppression', 'bounces')),
+                                ('page', ('contactdb', 'recipients'))):
+            for prefetch in (0, 2):
+                endpoint = FakeEndpoint(250, style=style, url_path=url_path,
+                                        max_page_size=100)
+                items = list(paginate(endpoint, page_size=500,
+                                      prefetch=prefetch))
+                self.assertEqual([item['id'] for item in items],
+                                 list(range(250)))
+
+    def test_token_pagination(self):
+        endpoint = FakeEndpoint(25, style='token', url_path=('templates',))
+        items = list(paginate(endpoint, page_size=10, prefetch=3))
+        self.assertEqual([item['id'] for item in items], list(range(25)))
+        self.assertEqual([call.get('page_token') for call in endpoint.calls],
+                         [None, '10', '20'])
+
+    def test_lazy(self):
+        endpoint = FakeEndpoint(10000)
+        items = paginate(endpoint, page_size=100)
+        self.assertEqual(endpoint.calls, [])
+        for _ in range(150):
+            next(items)
+        self.assertEqual(len(endpoint.calls), 2)
+
+    def test_prefetch(self):
+        endpoint = FakeEndpoint(1000, delay=0.02)
+        start = time.time()
+        items = list(paginate(endpoint, page_size=100, prefetch=4))
+        elapsed = time.time() - start
+        self.assertEqual([item['id'] for item in items], list(range(1000)))
+        # 11 pages at 20ms each, but 5 in flight at a time.
+        self.assertLess(elapsed, 0.2)
+
+    def test_prefetch_stops_early(self):
+        endpoint = FakeEndpoint(10000)
+        items = paginate(endpoint, page_size=100, prefetch=2)
+        next(items)
+        items.close()
+        self.assertLessEqual(len(endpoint.calls), 3)
+
+    def test_guess_style(self):
+        self.assertEqual(guess_style(FakeEndpoint(0)), 'offset')
+        self.assertEqual(
+            guess_style(FakeEndpoint(0, url_path=('contactdb', 'recipients'))),
+            'page')
+        self.assertEqual(guess_style(FakeEndpoint(0, url_path=('templates',))),
+                         'token')
+
+    def test_page_items(self):
+        self.assertEqual(page_items([1, 2]), [1, 2])
+        self.assertEqual(page_items(None), [])
+        self.assertEqual(page_items({'recipients': [1], 'count': 1}), [1])
+        self.assertEqual(page_items({'a': [1], 'b': [2]}, items_key='b'), [2])
+        with self.assertRaises(ValueError):
+            page_items({'a': [1], 'b': [2]})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            paginate(FakeEndpoint(0), page_size=0)
+        with self.assertRaises(ValueError):
+            paginate(FakeEndpoint(0), prefetch=-1)
+        with self.assertRaises(ValueError):
+            paginate(FakeEndpoint(0), style='cursor')
+
+    def test_client_paginate(self):
+        sg = SendGridAPIClient(apikey='SENDGRID_API_KEY')
+        endpoint = FakeEndpoint(3)
+        self.assertEqual(len(list(sg.paginate(endpoint, page_size=2))), 3)
+        self.assertEqual(guess_style(sg.client.contactdb.recipients), 'page')
@@ -0,0 +1,105 @@
+import json
+import unittest
+
+from python_http_client.exceptions import TooManyRequestsError
+
+from sendgrid import SendGridAPIClient
+from sendgrid.rate_limit import RateLimiter
+
+from .local_server import FakeClock, LocalServer
+
+
+def rate_headers(limit, remaining, reset):
+    return {'X-RateLimit-Limit': str(limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(reset)}
+
+
+class UnitTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+        self.url = 'https://api.sendgrid.com/v3/mail/send'
+
+    def test_unknown_endpoint_is_not_delayed(self):
+        self.assertEqual(self.limiter.reserve(self.url), 0.0)
+
+    def test_burst_within_headroom(self):
+        self.limiter.update(self.url, rate_headers(100, 90, 1060))
+        for _ in range(40):
+            self.assertEqual(self.limiter.reserve(self.url), 0.0)
+
+    def test_paced_below_headroom(self):
+        self.limiter.update(self.url, rate_headers(100, 10, 1010))
+        delays = [self.limiter.reserve(self.url) for _ in range(3)]
+        self.assertEqual(delays, [0.0, 1.0, 2.0])
+
+    def test_exhausted_waits_for_reset(self):
+        self.limiter.update(self.url, rate_headers(100, 0, 1030))
+        self.limiter.acquire(self.url)
+        self.assertEqual(self.clock.sleeps, [30.0])
+        # the window has reset, so the budget is available again
+        self.assertEqual(self.limiter.reserve(self.url), 0.0)
+
+    def test_waiters_on_exhausted_bucket_are_spread(self):
+        self.limiter.update(self.url, rate_headers(10, 0, 1030))
+        delays = [self.limiter.reserve(self.url) for _ in range(3)]
+        for delay, expected in zip(delays, [30.0, 30.1, 30.2]):
+            self.assertAlmostEqual(delay, expected)
+
+    def test_window_is_learned_from_reset_times(self):
+        self.limiter.update(self.url, rate_headers(5, 3, 1010))
+        self.limiter.update(self.url, rate_headers(5, 0, 1020))
+        delays = [self.limiter.reserve(self.url) for _ in range(3)]
+        self.assertEqual(delays, [20.0, 22.0, 24.0])
+
+    def test_429_empties_bucket(self):
+        self.limiter.update(self.url, rate_headers(100, 50, 1005), status_code=429)
+        self.assertEqual(self.limiter.reserve(self.url), 5.0)
+
+    def test_endpoints_are_independent(self):
+        self.limiter.update(self.url, rate_headers(100, 0, 1030))
+        other = 'https://api.sendgrid.com/v3/templates?page_size=10'
+        self.assertEqual(self.limiter.reserve(other), 0.0)
+        self.assertEqual(RateLimiter.endpoint(other), '/v3/templates')
+
+    def test_out_of_order_responses_keep_smallest_budget(self):
+        self.limiter.update(self.url, rate_headers(100, 5, 1060))
+        self.limiter.update(self.url, rate_headers(100, 20, 1060))
+        self.assertEqual(self.limiter.buckets['/v3/mail/send'].remaining, 5)
+
+    def test_missing_headers_are_ignored(self):
+        self.limiter.update(self.url, {})
+        self.assertEqual(self.limiter.buckets, {})
+
+    def test_client_reads_rate_limit_headers(self):
+        server = LocalServer()
+        sg = SendGridAPIClient(apikey='KEY', host=server.host,
+                               rate_limiter=self.limiter)
+        mock_headers = json.dumps(rate_headers(600, 0, 1012))
+        try:
+            with self.assertRaises(TooManyRequestsError):
+                sg.client.templates.get(request_headers={
+                    'X-Mock': 429, 'X-Mock-Headers': mock_headers})
+            sg.reset_request_headers()
+            sg.client.templates.get()
+        finally:
+            sg.close()
+            server.stop()
+        self.assertEqual(self.clock.sleeps, [12.0])
+
+    def test_endpoints_are_bounded(self):
+        limiter = RateLimiter(clock=self.clock, max_endpoints=2)
+        for path in ('a', 'b', 'a', 'c'):
+            limiter.update('https://api.sendgrid.com/v3/' + path,
+                           rate_headers(100, 50, 1060))
+        self.assertEqual(list(limiter.buckets), ['/v3/a', '/v3/c'])
+
+    def test_client_rate_limiter_is_opt_in(self):
+        self.assertIsNone(SendGridAPIClient(apikey='KEY').rate_limiter)
+        self.assertIsNone(
+            SendGridAPIClient(apikey='KEY', rate_limiter=False).rate_limiter)
+        self.assertIsInstance(
+            SendGridAPIClient(apikey='KEY', rate_limiter=True).rate_limiter,
+            RateLimiter)
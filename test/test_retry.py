@@ -0,0 +1,119 @@
+import json
+import sys
+import unittest
+
+from python_http_client.exceptions import (BadRequestsError,
+                                           ServiceUnavailableError)
+
+from sendgrid import SendGridAPIClient
+from sendgrid.retry import RetryPolicy
+
+from .local_server import LocalServer
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.sleeps = []
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1.0,
+                                  max_delay=3.0, jitter=False,
+                                  clock=lambda: 1000.0,
+                                  sleep=self.sleeps.append)
+
+    def test_exponential_backoff_is_capped(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0,
+                             jitter=False)
+        self.assertEqual([policy.backoff(n) for n in range(1, 5)],
+                         [1.0, 2.0, 4.0, 5.0])
+
+    def test_jitter(self):
+        policy = RetryPolicy(base_delay=4.0, rand=lambda: 0.25)
+        self.assertEqual(policy.backoff(1), 1.0)
+
+    def test_delay_for(self):
+        self.assertEqual(self.policy.delay_for(1, 503), 1.0)
+        self.assertEqual(self.policy.delay_for(2, 429), 2.0)
+        self.assertIsNone(self.policy.delay_for(3, 503))
+        self.assertIsNone(self.policy.delay_for(1, 400))
+        self.assertEqual(self.policy.delay_for(1), 1.0)
+        self.policy.retry_connection_errors = False
+        self.assertIsNone(self.policy.delay_for(1))
+
+    def test_retry_after(self):
+        self.assertEqual(
+            self.policy.delay_for(1, 429, {'Retry-After': '7'}), 7.0)
+        self.assertEqual(
+            self.policy.delay_for(1, 503, {'Retry-After': 'Thu, 01 Jan 1970 00:16:50 GMT'}),
+            10.0)
+
+    def test_rate_limit_reset(self):
+        headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '1012'}
+        self.assertEqual(self.policy.delay_for(1, 429, headers), 12.0)
+        headers['X-RateLimit-Remaining'] = '10'
+        self.assertEqual(self.policy.delay_for(1, 429, headers), 1.0)
+
+    def test_client_retries_transient_errors(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host,
+                               retry=self.policy)
+        self.server.fail_next(502, 503)
+        try:
+            response = sg.client.templates.get()
+        finally:
+            sg.close()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+
+    def test_client_gives_up(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host,
+                               retry=self.policy)
+        self.server.fail_next(503, 503, 503, 503)
+        try:
+            with self.assertRaises(ServiceUnavailableError):
+                sg.client.templates.get()
+        finally:
+            sg.close()
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_client_does_not_retry_client_errors(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host,
+                               retry=self.policy)
+        try:
+            with self.assertRaises(BadRequestsError):
+                sg.client.templates.get(request_headers={'X-Mock': 400})
+        finally:
+            sg.close()
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_client_honors_retry_after(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host,
+                               retry=self.policy, rate_limiter=False)
+        self.server.fail_next(429)
+        try:
+            sg.client.templates.get(request_headers={
+                'X-Mock-Headers': json.dumps({'Retry-After': '2.5'})})
+        finally:
+            sg.close()
+        self.assertEqual(self.sleeps, [2.5])
+
+    def test_client_without_policy_raises(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host)
+        self.server.fail_next(503)
+        try:
+            with self.assertRaises(ServiceUnavailableError):
+                sg.client.templates.get()
+        finally:
+            sg.close()
+
+
+if sys.version_info >= (3, 5):
+    from .async_retry_cases import AsyncUnitTests  # noqa: F401
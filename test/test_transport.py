@@ -0,0 +1,142 @@
+import json
+import threading
+import unittest
+
+from python_http_client.exceptions import NotFoundError
+
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Content, From, Mail, To
+from sendgrid.transport import ConnectionPool, URLError, httplib
+
+from .local_server import LocalServer
+
+
+class _StaleConnection(object):
+    """A pooled connection the server dropped after reading the request."""
+
+    timeout = None
+
+    class sock(object):
+        @staticmethod
+        def settimeout(timeout):
+            pass
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, target, body=None, headers=None):
+        self.requests.append((method, target))
+
+    def getresponse(self):
+        raise httplib.BadStatusLine('')
+
+    def close(self):
+        pass
+
+
+class UnitTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.reset()
+        self.sg = SendGridAPIClient(apikey='KEY', host=self.server.host)
+
+    def tearDown(self):
+        self.sg.close()
+
+    def test_fluent_calls_reuse_connection(self):
+        for _ in range(5):
+            response = self.sg.client.templates._('abc').get(
+                query_params={'limit': 2})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.to_dict, {'path': '/v3/templates/abc?limit=2'})
+        self.assertEqual(self.server.connections, 1)
+
+    def test_send_uses_pool(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'),
+                    Content('text/plain', 'hello'))
+        self.sg.send(mail)
+        self.sg.send(mail)
+        self.assertEqual(self.server.connections, 1)
+        method, path, headers, body = self.server.requests[0]
+        self.assertEqual((method, path), ('POST', '/v3/mail/send'))
+        self.assertEqual(headers['authorization'], 'Bearer KEY')
+        self.assertEqual(json.loads(body.decode('utf-8')), mail.get())
+
+    def test_send_accepts_dicts_and_legacy_messages(self):
+        mail = Mail(From('from@example.com'), 'subject', To('to@example.com'),
+                    Content('text/plain', 'hello'))
+
+        class Legacy(object):
+            def get(self):
+                return mail.get()
+
+        self.sg.send(mail.get())
+        self.sg.send(Legacy())
+        for _, _, headers, body in self.server.requests:
+            self.assertEqual(headers['content-type'], 'application/json')
+            self.assertEqual(json.loads(body.decode('utf-8')), mail.get())
+
+    def test_http_error(self):
+        with self.assertRaises(NotFoundError) as ctx:
+            self.sg.client.templates.get(request_headers={'X-Mock': 404})
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_threaded_pool_size(self):
+        sg = SendGridAPIClient(apikey='KEY', host=self.server.host, pool_size=3)
+
+        def worker():
+            for _ in range(10):
+                sg.client.templates.get()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.server.requests), 30)
+        self.assertLessEqual(self.server.connections, 3)
+        self.assertLessEqual(len(sg.pool._idle), 3)
+        sg.close()
+        self.assertEqual(sg.pool._idle, [])
+
+    def test_max_lifetime(self):
+        pool = ConnectionPool(self.server.host, max_lifetime=0)
+        pool.request('GET', '/v3/templates')
+        pool.request('GET', '/v3/templates')
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(pool._idle, [])
+
+    def test_idle_timeout(self):
+        pool = ConnectionPool(self.server.host, idle_timeout=-1)
+        pool.request('GET', '/v3/templates')
+        pool.request('GET', '/v3/templates')
+        self.assertEqual(self.server.connections, 2)
+
+    def _pool_with_stale_connection(self):
+        pool = ConnectionPool(self.server.host)
+        stale = _StaleConnection()
+        pool._put(pool._new_connection(None))
+        pool._idle[0].connection = stale
+        return pool, stale
+
+    def test_stale_connection_resends_idempotent_request(self):
+        pool, stale = self._pool_with_stale_connection()
+        response = pool.request('GET', '/v3/templates')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(stale.requests, [('GET', '/v3/templates')])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_connection_does_not_resend_post(self):
+        pool, stale = self._pool_with_stale_connection()
+        with self.assertRaises(URLError):
+            pool.request('POST', '/v3/mail/send', body=b'{}')
+        self.assertEqual(stale.requests, [('POST', '/v3/mail/send')])
+        self.assertEqual(self.server.requests, [])